@@ -193,8 +193,8 @@ router.get('/:account_number/transactions', async (req, res) => {
     const { account_number } = req.params;
 
     // Verify account ownership
-    const accounts = await serviceLayer.getAccountsByCustomer(customer_id, true);
-    const accountExists = accounts.some(acc => acc.account_number === account_number);
+    const [account] = await serviceLayer.lookupAccounts([account_number]);
+    const accountExists = Boolean(account) && account.is_active && account.m_customer_id === customer_id;
 
     if (!accountExists) {
       return res.status(403).json({
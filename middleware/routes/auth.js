@@ -97,29 +97,25 @@ router.post('/login',
 
       const { username, pin } = req.body;
 
-      // Get customer from service layer
-      const customer = await serviceLayer.getCustomerByUsername(username);
-
-      // Check if account is locked
-      const lockStatus = await serviceLayer.checkLocked(customer.id);
-      if (lockStatus.is_locked) {
-        return res.status(403).json({
-          error: 'Account Locked',
-          message: 'Your account has been locked due to multiple failed login attempts. Please contact customer service.'
-        });
-      }
-
-      // Verify PIN
-      const isValidPin = await bcrypt.compare(pin, customer.customer_pin);
-
-      if (!isValidPin) {
-        // Record failed login
-        await serviceLayer.recordFailedLogin(customer.id);
-
-        return res.status(401).json({
-          error: 'Invalid Credentials',
-          message: 'Invalid username or PIN'
-        });
+      // Verify credentials in the service layer (lock check, PIN verification
+      // and failed-attempt accounting happen there in one call)
+      let customer;
+      try {
+        customer = await serviceLayer.login(username, pin);
+      } catch (error) {
+        if (error.status === 403) {
+          return res.status(403).json({
+            error: 'Account Locked',
+            message: 'Your account has been locked due to multiple failed login attempts. Please contact customer service.'
+          });
+        }
+        if (error.status === 401) {
+          return res.status(401).json({
+            error: 'Invalid Credentials',
+            message: 'Invalid username or PIN'
+          });
+        }
+        throw error;
       }
 
       // Generate JWT token
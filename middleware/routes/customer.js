@@ -44,6 +44,60 @@ router.get('/profile', async (req, res) => {
   }
 });
 
+// ===== Get Dashboard =====
+
+router.get('/dashboard', async (req, res) => {
+  try {
+    const customer_id = req.user.customer_id;
+    const { recent = 5 } = req.query;
+
+    // Profile, accounts, total balance and recent transactions in one call
+    const dashboard = await serviceLayer.getCustomerDashboard(customer_id, parseInt(recent));
+    const { customer } = dashboard;
+
+    res.json({
+      status: 'success',
+      customer: {
+        id: customer.id,
+        name: customer.customer_name,
+        username: customer.customer_username,
+        email: customer.customer_email,
+        phone: customer.customer_phone,
+        cif_number: customer.cif_number,
+        last_login: customer.last_login
+      },
+      total_balance: dashboard.total_balance,
+      accounts: dashboard.accounts.map(acc => ({
+        id: acc.id,
+        account_number: acc.account_number,
+        account_name: acc.account_name,
+        account_type: acc.account_type,
+        currency: acc.currency_code,
+        balance: acc.available_balance
+      })),
+      recent_transactions: dashboard.recent_transactions.map(txn => ({
+        id: txn.id,
+        type: txn.transaction_type,
+        amount: txn.transaction_amount,
+        from_account: txn.from_account_number,
+        from_name: txn.from_account_name,
+        to_account: txn.to_account_number,
+        to_name: txn.to_account_name,
+        status: txn.status,
+        description: txn.description,
+        date: txn.transaction_date
+      }))
+    });
+
+  } catch (error) {
+    console.error('Get dashboard error:', error);
+    res.status(error.status || 500).json({
+      error: 'Failed to Get Dashboard',
+      message: error.message || 'Unable to retrieve dashboard'
+    });
+  }
+});
+
 // ===== Update Profile =====
 
 router.put('/profile',
@@ -58,45 +58,35 @@ router.post('/transfer',
 
       // No PIN verification needed - auto-approved for demo
 
-      // 2. Verify source account ownership
-      const sourceAccount = await serviceLayer.getAccountByNumber(from_account);
-      if (sourceAccount.m_customer_id !== customer_id) {
-        return res.status(403).json({
-          error: 'Forbidden',
-          message: 'You do not own the source account'
-        });
-      }
-
-      // 3. Verify destination account exists
-      const destAccount = await serviceLayer.getAccountByNumber(to_account);
-      const destNickname = resolveDemoNickname(to_account) || destAccount?.account_name;
-
-      // 4. Check balance
-      const balance = await serviceLayer.getAccountBalance(from_account);
-      const availableBalance = balance.available_balance || balance['available_balance'] || 0;
-      if (availableBalance < amount) {
-        return res.status(400).json({
-          error: 'Insufficient Balance',
-          message: `Your balance is Rp ${availableBalance.toLocaleString('id-ID')}. Cannot transfer Rp ${amount.toLocaleString('id-ID')}`
+      // 2. Ownership check, balance check, debit, credit and transaction
+      //    insert run atomically in the service layer (single round trip)
+      let result;
+      try {
+        result = await serviceLayer.transfer({
+          m_customer_id: customer_id,
+          from_account_number: from_account,
+          to_account_number: to_account,
+          amount: amount,
+          description: description
         });
+      } catch (error) {
+        if (error.status === 403) {
+          return res.status(403).json({
+            error: 'Forbidden',
+            message: 'You do not own the source account'
+          });
+        }
+        if (error.status === 400 && error.message === 'Saldo tidak mencukupi') {
+          return res.status(400).json({
+            error: 'Insufficient Balance',
+            message: `Cannot transfer Rp ${Number(amount).toLocaleString('id-ID')}: insufficient balance`
+          });
+        }
+        throw error;
       }
 
-      // 5. Debit source account
-      await serviceLayer.debitAccount(from_account, amount);
-
-      // 6. Credit destination account
-      await serviceLayer.creditAccount(to_account, amount);
-
-      // 7. Record transaction
-      const transaction = await serviceLayer.createTransaction({
-        m_customer_id: customer_id,
-        transaction_type: 'TR',
-        transaction_amount: amount,
-        from_account_number: from_account,
-        to_account_number: to_account,
-        status: 'SUCCESS',
-        description: description
-      });
+      const transaction = result.transaction;
+      const destNickname = resolveDemoNickname(to_account) || result.to_account.account_name;
 
       // Realtime: notify client(s) in this customer room
       const io = req.app.get('io');
@@ -122,9 +112,6 @@ router.post('/transfer',
         });
       }
 
-      // 8. Get new balance
-      const newBalance = await serviceLayer.getAccountBalance(from_account);
-
       res.json({
         status: 'success',
         message: 'Transfer successful',
@@ -137,7 +124,7 @@ router.post('/transfer',
           to_name: destNickname,
           description: description,
           date: transaction.transaction_date || transaction.created_at,
-          new_balance: newBalance.available_balance || newBalance['available_balance'] || 0
+          new_balance: result.from_account.available_balance
         }
       });
 
@@ -189,8 +176,8 @@ router.post('/withdraw',
         });
       }
 
-      // 2. Check balance
-      const balance = await serviceLayer.getAccountBalance(account_number);
+      // 2. Check balance (primary: must reflect this customer's latest writes)
+      const balance = await serviceLayer.getAccountBalance(account_number, { primary: true });
       const availableBalance = balance.available_balance || balance['available_balance'] || 0;
       if (availableBalance < amount) {
         return res.status(400).json({
@@ -199,18 +186,14 @@ router.post('/withdraw',
         });
       }
 
-      // 3. Debit account
-      await serviceLayer.debitAccount(account_number, amount);
-
-      // 4. Record transaction
-      const transaction = await serviceLayer.createTransaction({
+      // 3. Debit account + record transaction (single commit in service layer)
+      const result = await serviceLayer.withdraw({
         m_customer_id: customer_id,
-        transaction_type: 'WD',
-        transaction_amount: amount,
-        from_account_number: account_number,
-        status: 'SUCCESS',
+        account_number,
+        amount,
         description: 'Tarik Tunai'
       });
+      const transaction = result.transaction;
 
       // Realtime: notify client(s) in this customer room
       const io = req.app.get('io');
@@ -232,8 +215,8 @@ router.post('/withdraw',
         });
       }
 
-      // 5. Get new balance
-      const newBalance = await serviceLayer.getAccountBalance(account_number);
+      // 4. New balance (returned by the withdraw call)
+      const newBalance = result.account;
 
       res.json({
         status: 'success',
@@ -296,18 +279,14 @@ router.post('/deposit',
         });
       }
 
-      // 2. Credit account
-      await serviceLayer.creditAccount(account_number, amount);
-
-      // 3. Record transaction
-      const transaction = await serviceLayer.createTransaction({
+      // 2. Credit account + record transaction (single commit in service layer)
+      const result = await serviceLayer.deposit({
         m_customer_id: customer_id,
-        transaction_type: 'DP',
-        transaction_amount: amount,
-        to_account_number: account_number,
-        status: 'SUCCESS',
+        account_number,
+        amount,
         description: 'Setor Tunai'
       });
+      const transaction = result.transaction;
 
       // Realtime: notify client(s) in this customer room
       const io = req.app.get('io');
@@ -329,8 +308,8 @@ router.post('/deposit',
         });
       }
 
-      // 4. Get new balance
-      const newBalance = await serviceLayer.getAccountBalance(account_number);
+      // 3. New balance (returned by the deposit call)
+      const newBalance = result.account;
 
       res.json({
         status: 'success',
@@ -362,60 +341,51 @@ router.get('/history', async (req, res) => {
     const customer_id = req.user.customer_id;
     const { skip = 0, limit = 50 } = req.query;
 
-    // Get transactions from service layer
+    // Get transactions from service layer (account names joined server-side)
     const transactions = await serviceLayer.getTransactionsByCustomer(
       customer_id,
       parseInt(skip),
-      parseInt(limit)
+      parseInt(limit),
+      'counterparty'
     );
 
-    const safeGetCounterpartyName = async (accountNumber) => {
-      if (!accountNumber) return null;
-      const demo = resolveDemoNickname(accountNumber);
-      if (demo) return demo;
-      try {
-        const acc = await serviceLayer.getAccountByNumber(accountNumber);
-        return acc?.account_name ?? null;
-      } catch (_) {
-        return null;
-      }
-    };
-
     // Format response (enriched with names for nicer UI)
-    const formattedTransactions = await Promise.all(
-      transactions.map(async (txn) => {
-        const code = txn.transaction_type;
-
-        const from_account = txn.from_account_number;
-        const to_account = txn.to_account_number;
-
-        const counterparty_account =
-          code === 'TR' ? to_account :
-          code === 'DP' ? to_account :
-          code === 'WD' ? from_account :
-          null;
-
-        const counterparty_name = await safeGetCounterpartyName(counterparty_account);
-
-        return {
-          id: txn.id,
-          type: code === 'TR' ? 'Transfer' : code === 'WD' ? 'Withdrawal' : 'Deposit',
-          amount: txn.transaction_amount,
-          from_account,
-          to_account,
-
-          // Optional enrichment
-          from_name: code === 'WD' ? counterparty_name : null,
-          to_name: code === 'TR' || code === 'DP' ? counterparty_name : null,
-          counterparty_account,
-          counterparty_name,
-
-          status: txn.status,
-          description: txn.description,
-          date: txn.transaction_date || txn.created_at
-        };
-      })
-    );
+    const formattedTransactions = transactions.map((txn) => {
+      const code = txn.transaction_type;
+
+      const from_account = txn.from_account_number;
+      const to_account = txn.to_account_number;
+
+      const counterparty_account =
+        code === 'TR' ? to_account :
+        code === 'DP' ? to_account :
+        code === 'WD' ? from_account :
+        null;
+
+      const counterparty_name = counterparty_account
+        ? resolveDemoNickname(counterparty_account) ||
+          (counterparty_account === to_account ? txn.to_account_name : txn.from_account_name) ||
+          null
+        : null;
+
+      return {
+        id: txn.id,
+        type: code === 'TR' ? 'Transfer' : code === 'WD' ? 'Withdrawal' : 'Deposit',
+        amount: txn.transaction_amount,
+        from_account,
+        to_account,
+
+        // Optional enrichment
+        from_name: code === 'WD' ? counterparty_name : null,
+        to_name: code === 'TR' || code === 'DP' ? counterparty_name : null,
+        counterparty_account,
+        counterparty_name,
+
+        status: txn.status,
+        description: txn.description,
+        date: txn.transaction_date || txn.created_at
+      };
+    });
 
     res.json({
       status: 'success',
@@ -21,9 +21,24 @@ class ServiceLayerClient {
 
   // ===== Customer Operations =====
 
-  async getCustomerByUsername(username) {
+  // Reads go to a read replica when the service layer has them configured.
+  // { primary: true } forces the primary (read-your-writes after a write).
+  readConfig({ primary = false } = {}) {
+    return primary ? { headers: { 'X-Read-Consistency': 'primary' } } : {};
+  }
+
+  async login(username, pin) {
+    try {
+      const response = await this.client.post('/service/customer/login', { username, pin });
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error);
+    }
+  }
+
+  async getCustomerByUsername(username, options) {
     try {
-      const response = await this.client.get(`/service/customer/username/${username}`);
+      const response = await this.client.get(`/service/customer/username/${username}`, this.readConfig(options));
       return response.data;
     } catch (error) {
       throw this.handleError(error);
@@ -39,6 +54,17 @@ class ServiceLayerClient {
     }
   }
 
+  async getCustomerDashboard(customerId, recent = 5) {
+    try {
+      const response = await this.client.get(`/service/customer/${customerId}/dashboard`, {
+        params: { recent }
+      });
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error);
+    }
+  }
+
   async registerCustomer(customerData) {
     try {
       const response = await this.client.post('/service/customer', customerData);
@@ -66,9 +92,9 @@ class ServiceLayerClient {
     }
   }
 
-  async checkLocked(customerId) {
+  async checkLocked(customerId, options) {
     try {
-      const response = await this.client.get(`/service/customer/${customerId}/check-locked`);
+      const response = await this.client.get(`/service/customer/${customerId}/check-locked`, this.readConfig(options));
       return response.data;
     } catch (error) {
       throw this.handleError(error);
@@ -115,9 +141,20 @@ class ServiceLayerClient {
     }
   }
 
-  async getAccountBalance(accountNumber) {
+  async lookupAccounts(accountNumbers) {
     try {
-      const response = await this.client.get(`/service/account/${accountNumber}/balance`);
+      const response = await this.client.post('/service/account/lookup', {
+        account_numbers: accountNumbers
+      });
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error);
+    }
+  }
+
+  async getAccountBalance(accountNumber, options) {
+    try {
+      const response = await this.client.get(`/service/account/${accountNumber}/balance`, this.readConfig(options));
       return response.data;
     } catch (error) {
       throw this.handleError(error);
@@ -157,10 +194,37 @@ class ServiceLayerClient {
     }
   }
 
-  async getTransactionsByCustomer(customerId, skip = 0, limit = 100) {
+  async transfer(transferData) {
+    try {
+      const response = await this.client.post('/service/transaction/transfer', transferData);
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error);
+    }
+  }
+
+  async withdraw(withdrawData) {
+    try {
+      const response = await this.client.post('/service/transaction/withdraw', withdrawData);
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error);
+    }
+  }
+
+  async deposit(depositData) {
+    try {
+      const response = await this.client.post('/service/transaction/deposit', depositData);
+      return response.data;
+    } catch (error) {
+      throw this.handleError(error);
+    }
+  }
+
+  async getTransactionsByCustomer(customerId, skip = 0, limit = 100, expand) {
     try {
       const response = await this.client.get(`/service/transaction/customer/${customerId}`, {
-        params: { skip, limit }
+        params: { skip, limit, expand }
       });
       return response.data;
     } catch (error) {
@@ -0,0 +1,212 @@
+"""
+Benchmark query mutasi rekening: OR filter (plan lama) vs UNION ALL dua
+index range scan (TransactionRepository.get_by_account_number)
+
+Jalankan dari folder service:
+    python -m benchmarks.account_mutation_plans --rows 5000000
+    python -m benchmarks.account_mutation_plans --database-url postgresql://... --rows 5000000
+
+Dataset di-seed sekali (dilewati jika tabel sudah berisi >= --rows transaksi).
+Hasil (median latency per plan dan kedalaman halaman) dicetak sebagai JSON
+"""
+from sqlalchemy import create_engine, insert, func, select, or_
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta
+from typing import Callable, List
+import argparse
+import json
+import random
+import statistics
+import time
+from db.database import Base
+from db.models import Customer, Transaction
+from repository.transaction_repository import TransactionRepository
+
+SEED_CHUNK_SIZE = 50000
+
+
+def legacy_get_by_account_number(db, account_number: str, skip: int, limit: int):
+    """Plan lama: satu query dengan OR lalu ORDER BY + OFFSET/LIMIT"""
+    return db.query(Transaction).filter(
+        or_(Transaction.from_account_number == account_number,
+            Transaction.to_account_number == account_number)
+    ).order_by(
+        Transaction.transaction_date.desc(), Transaction.id.desc()
+    ).offset(skip).limit(limit).all()
+
+
+def account_number_for(index: int) -> str:
+    return f"9{index:09d}"
+
+
+def seed(engine, rows: int, accounts: int, hot_accounts: int, hot_share: float,
+         customers: int = 1000, seed_value: int = 42) -> None:
+    """
+    Seed tabel customer dan transaction
+    Sebagian transaksi (hot_share) melibatkan hot account agar mutasinya besar
+    
+    Args:
+        engine: SQLAlchemy engine
+        rows: Jumlah transaksi
+        accounts: Jumlah rekening berbeda
+        hot_accounts: Jumlah rekening "hot"
+        hot_share: Porsi transaksi yang melibatkan hot account
+        customers: Jumlah customer
+        seed_value: Seed random agar dataset reproducible
+    """
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(Transaction)).scalar()
+    if existing >= rows:
+        return
+    
+    rng = random.Random(seed_value)
+    indexes = list(Transaction.__table__.indexes)
+    with engine.begin() as conn:
+        for index in indexes:
+            index.drop(bind=conn, checkfirst=True)
+        
+        if not conn.execute(select(func.count()).select_from(Customer)).scalar():
+            conn.execute(insert(Customer), [
+                {
+                    "customer_name": f"Bench {i}",
+                    "customer_username": f"bench{i}",
+                    "customer_pin": "x",
+                    "customer_email": f"bench{i}@example.com",
+                    "customer_phone": "0800",
+                    "cif_number": f"BENCH{i}",
+                }
+                for i in range(1, customers + 1)
+            ])
+    
+    start = datetime.now() - timedelta(days=3 * 365)
+    span_seconds = 3 * 365 * 24 * 3600
+    remaining = rows - existing
+    while remaining > 0:
+        batch = []
+        for _ in range(min(SEED_CHUNK_SIZE, remaining)):
+            source = rng.randrange(accounts)
+            destination = rng.randrange(accounts)
+            if rng.random() < hot_share:
+                hot = rng.randrange(hot_accounts)
+                if rng.random() < 0.5:
+                    source = hot
+                else:
+                    destination = hot
+            transaction_date = start + timedelta(seconds=rng.randrange(span_seconds))
+            batch.append({
+                "m_customer_id": rng.randint(1, customers),
+                "transaction_type": "TR",
+                "transaction_amount": rng.randint(1, 1000) * 1000,
+                "from_account_number": account_number_for(source),
+                "to_account_number": account_number_for(destination),
+                "status": "SUCCESS",
+                "description": None,
+                "transaction_date": transaction_date,
+                "created_at": transaction_date,
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Transaction), batch)
+        remaining -= len(batch)
+    
+    with engine.begin() as conn:
+        for index in indexes:
+            index.create(bind=conn, checkfirst=True)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE t_transaction")
+    else:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+
+
+def measure(session_factory, run: Callable, repeat: int) -> dict:
+    """
+    Jalankan query berulang kali dan hitung latency
+    
+    Returns:
+        Dict median/min/max latency (ms) dan jumlah row
+    """
+    timings = []
+    row_count = 0
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            row_count = len(run(db))
+            timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            db.close()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "rows": row_count,
+    }
+
+
+def run_benchmark(database_url: str, rows: int, accounts: int, hot_accounts: int,
+                  hot_share: float, pages: List[int], limit: int, repeat: int) -> dict:
+    """
+    Seed dataset lalu bandingkan kedua plan untuk setiap hot account dan kedalaman halaman
+    
+    Returns:
+        Dict hasil benchmark (siap di-dump sebagai JSON)
+    """
+    engine = create_engine(database_url)
+    seed(engine, rows, accounts, hot_accounts, hot_share)
+    session_factory = sessionmaker(bind=engine)
+    
+    results = []
+    for hot in range(hot_accounts):
+        account_number = account_number_for(hot)
+        for skip in pages:
+            results.append({
+                "account_number": account_number,
+                "skip": skip,
+                "limit": limit,
+                "or_plan": measure(
+                    session_factory,
+                    lambda db: legacy_get_by_account_number(db, account_number, skip, limit),
+                    repeat
+                ),
+                "union_all_plan": measure(
+                    session_factory,
+                    lambda db: TransactionRepository.get_by_account_number(db, account_number, skip, limit),
+                    repeat
+                ),
+            })
+    
+    with engine.connect() as conn:
+        total_rows = conn.execute(select(func.count()).select_from(Transaction)).scalar()
+    return {
+        "database": engine.dialect.name,
+        "transactions": total_rows,
+        "accounts": accounts,
+        "hot_accounts": hot_accounts,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OR vs UNION ALL untuk mutasi rekening")
+    parser.add_argument("--database-url", default="sqlite:///./bench_mutation.db")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--hot-accounts", type=int, default=3)
+    parser.add_argument("--hot-share", type=float, default=0.05)
+    parser.add_argument("--pages", default="0,1000,10000",
+                        help="Daftar offset (skip) yang diukur, dipisah koma")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    report = run_benchmark(
+        args.database_url, args.rows, args.accounts, args.hot_accounts,
+        args.hot_share, [int(p) for p in args.pages.split(",")], args.limit, args.repeat
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""
+Load test service layer: seed database lalu jalankan campuran skenario
+realistis terhadap aplikasi FastAPI asli
+
+Jalankan dari folder service:
+    python -m benchmarks.load_test --customers 1000 --iterations 5000
+    python -m benchmarks.load_test --mode uvicorn --concurrency 32 --output run.json
+    python -m benchmarks.load_test --database-url postgresql://... --mix balance_inquiry=70,transfer=30
+
+Mode:
+    inprocess: httpx.AsyncClient + ASGITransport (tanpa network, mengukur app + DB)
+    uvicorn:   app dijalankan sebagai proses uvicorn terpisah, request via HTTP
+
+Hasil (p50/p95/p99, throughput dan error per skenario) dicetak sebagai JSON
+sehingga hasil run antar commit bisa di-diff
+
+Catatan: DATABASE_URL harus di-set sebelum module db.database di-import,
+karena itu import module aplikasi dilakukan di dalam fungsi
+"""
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+
+SEED_CHUNK_SIZE = 20000
+SEED_BALANCE = 1_000_000_000
+
+DEFAULT_MIX = {
+    "login_lookup": 20,
+    "balance_inquiry": 35,
+    "transfer": 15,
+    "history_paging": 20,
+    "date_range_statement": 10,
+}
+
+
+def username_for(customer_id: int) -> str:
+    return f"load{customer_id}"
+
+
+def account_number_for(customer_id: int, index: int) -> str:
+    return f"7{customer_id:07d}{index:02d}"
+
+
+def seed(customers: int, accounts_per_customer: int, transactions_per_account: int,
+         seed_value: int = 42) -> None:
+    """
+    Seed customer, account dan transaction (dilewati jika data sudah ada)
+    Memakai engine aplikasi (db.database), jadi DATABASE_URL harus sudah di-set
+
+    Args:
+        customers: Jumlah customer
+        accounts_per_customer: Jumlah rekening per customer
+        transactions_per_account: Jumlah transaksi per rekening
+        seed_value: Seed random agar dataset reproducible
+    """
+    from sqlalchemy import func, insert, select
+    from db.database import engine, init_db
+    from db.models import Customer, PortfolioAccount, Transaction
+
+    init_db()
+    with engine.connect() as conn:
+        existing = conn.execute(
+            select(func.count()).select_from(Customer).where(Customer.customer_username.like("load%"))
+        ).scalar()
+    if existing >= customers:
+        return
+
+    rng = random.Random(seed_value)
+    with engine.begin() as conn:
+        for start in range(1, customers + 1, SEED_CHUNK_SIZE):
+            conn.execute(insert(Customer), [
+                {
+                    "customer_name": f"Load Customer {i}",
+                    "customer_username": username_for(i),
+                    "customer_pin": "x",
+                    "customer_email": f"load{i}@example.com",
+                    "customer_phone": "0800",
+                    "cif_number": f"LOAD{i}",
+                }
+                for i in range(start, min(start + SEED_CHUNK_SIZE, customers + 1))
+            ])
+        customer_ids = dict(conn.execute(
+            select(Customer.customer_username, Customer.id).where(Customer.customer_username.like("load%"))
+        ).all())
+
+    accounts = []
+    with engine.begin() as conn:
+        batch = []
+        for i in range(1, customers + 1):
+            for index in range(accounts_per_customer):
+                account_number = account_number_for(i, index)
+                accounts.append((customer_ids[username_for(i)], account_number))
+                batch.append({
+                    "m_customer_id": customer_ids[username_for(i)],
+                    "account_number": account_number,
+                    "account_name": f"Load Customer {i}",
+                    "account_type": "SAV",
+                    "clear_balance": SEED_BALANCE,
+                    "available_balance": SEED_BALANCE,
+                })
+                if len(batch) >= SEED_CHUNK_SIZE:
+                    conn.execute(insert(PortfolioAccount), batch)
+                    batch = []
+        if batch:
+            conn.execute(insert(PortfolioAccount), batch)
+
+    start_date = datetime.now() - timedelta(days=365)
+    span_seconds = 365 * 24 * 3600
+    batch = []
+    for customer_id, account_number in accounts:
+        for _ in range(transactions_per_account):
+            _, counterparty = accounts[rng.randrange(len(accounts))]
+            transaction_date = start_date + timedelta(seconds=rng.randrange(span_seconds))
+            batch.append({
+                "m_customer_id": customer_id,
+                "transaction_type": "TR",
+                "transaction_amount": rng.randint(1, 1000) * 1000,
+                "from_account_number": account_number,
+                "to_account_number": counterparty,
+                "status": "SUCCESS",
+                "description": None,
+                "transaction_date": transaction_date,
+                "created_at": transaction_date,
+            })
+            if len(batch) >= SEED_CHUNK_SIZE:
+                with engine.begin() as conn:
+                    conn.execute(insert(Transaction), batch)
+                batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(insert(Transaction), batch)
+
+
+# ===== Skenario =====
+# Setiap skenario menerima (client, rng, context) dan menjalankan satu
+# interaksi user (bisa lebih dari satu request). Response non-2xx = error
+
+class ScenarioError(Exception):
+    pass
+
+
+def _check(response: httpx.Response) -> httpx.Response:
+    if response.status_code >= 300:
+        raise ScenarioError(f"{response.request.method} {response.request.url.path} -> {response.status_code}")
+    return response
+
+
+def _pick_customer(rng: random.Random, context: dict) -> int:
+    return rng.randint(1, context["customers"])
+
+
+async def login_lookup(client: httpx.AsyncClient, rng: random.Random, context: dict) -> None:
+    """Lookup customer by username lalu cek status lock (alur login middleware)"""
+    customer = _check(await client.get(
+        f"/service/customer/username/{username_for(_pick_customer(rng, context))}"
+    )).json()
+    _check(await client.get(f"/service/customer/{customer['id']}/check-locked"))
+
+
+async def balance_inquiry(client: httpx.AsyncClient, rng: random.Random, context: dict) -> None:
+    """Cek saldo satu rekening"""
+    account_number = account_number_for(
+        _pick_customer(rng, context), rng.randrange(context["accounts_per_customer"])
+    )
+    _check(await client.get(f"/service/account/{account_number}/balance"))
+
+
+async def transfer(client: httpx.AsyncClient, rng: random.Random, context: dict) -> None:
+    """Cek saldo rekening sumber, transfer, lalu cek saldo lagi"""
+    source_customer = _pick_customer(rng, context)
+    source = account_number_for(source_customer, 0)
+    destination = account_number_for(_pick_customer(rng, context), 0)
+    if destination == source:
+        destination = account_number_for(source_customer % context["customers"] + 1, 0)
+
+    customer = _check(await client.get(f"/service/customer/username/{username_for(source_customer)}")).json()
+    _check(await client.get(f"/service/account/{source}/check-balance", params={"amount": 1000}))
+    _check(await client.post("/service/transaction/transfer", json={
+        "m_customer_id": customer["id"],
+        "from_account_number": source,
+        "to_account_number": destination,
+        "amount": 1000,
+        "description": "load test",
+    }))
+    _check(await client.get(f"/service/account/{source}/balance"))
+
+
+async def history_paging(client: httpx.AsyncClient, rng: random.Random, context: dict) -> None:
+    """Riwayat transaksi rekening: halaman pertama + beberapa halaman via cursor"""
+    account_number = account_number_for(
+        _pick_customer(rng, context), rng.randrange(context["accounts_per_customer"])
+    )
+    params = {"limit": context["page_size"]}
+    for _ in range(context["history_pages"]):
+        response = _check(await client.get(f"/service/transaction/account/{account_number}", params=params))
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": context["page_size"], "cursor": next_cursor}
+
+
+async def date_range_statement(client: httpx.AsyncClient, rng: random.Random, context: dict) -> None:
+    """Statement transaksi customer untuk rentang 30 hari"""
+    end_date = datetime.now() - timedelta(days=rng.randrange(335))
+    start_date = end_date - timedelta(days=30)
+    customer = _check(await client.get(
+        f"/service/customer/username/{username_for(_pick_customer(rng, context))}"
+    )).json()
+    _check(await client.get(f"/service/transaction/customer/{customer['id']}/by-date", params={
+        "start_date": start_date.isoformat(timespec="seconds"),
+        "end_date": end_date.isoformat(timespec="seconds"),
+    }))
+
+
+SCENARIOS: Dict[str, Callable[[httpx.AsyncClient, random.Random, dict], Awaitable[None]]] = {
+    "login_lookup": login_lookup,
+    "balance_inquiry": balance_inquiry,
+    "transfer": transfer,
+    "history_paging": history_paging,
+    "date_range_statement": date_range_statement,
+}
+
+
+# ===== Runner =====
+
+def summarize(timings: List[float], errors: int, elapsed: float) -> dict:
+    """
+    Hitung statistik latency satu skenario
+
+    Returns:
+        Dict count, errors, throughput (per detik), mean/p50/p95/p99/max (ms)
+    """
+    if not timings:
+        return {"count": 0, "errors": errors}
+    if len(timings) > 1:
+        percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+        p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+    else:
+        p50 = p95 = p99 = timings[0]
+    return {
+        "count": len(timings),
+        "errors": errors,
+        "throughput_per_sec": round(len(timings) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+async def run_mix(client: httpx.AsyncClient, mix: Dict[str, int], iterations: int,
+                  concurrency: int, context: dict, seed_value: int = 7) -> dict:
+    """
+    Jalankan skenario sesuai bobot mix dengan sejumlah worker konkuren
+
+    Args:
+        client: httpx.AsyncClient (ASGI transport atau HTTP)
+        mix: Bobot per nama skenario
+        iterations: Total iterasi skenario
+        concurrency: Jumlah worker konkuren
+        context: Parameter dataset (customers, accounts_per_customer, ...)
+        seed_value: Seed random urutan skenario
+
+    Returns:
+        Dict hasil per skenario + total
+    """
+    rng = random.Random(seed_value)
+    names = list(mix)
+    plan = rng.choices(names, weights=[mix[name] for name in names], k=iterations)
+    timings = {name: [] for name in names}
+    errors = {name: 0 for name in names}
+    error_samples = []
+    queue = iter(enumerate(plan))
+
+    async def worker(worker_id: int):
+        worker_rng = random.Random(seed_value * 1000 + worker_id)
+        for _, name in queue:
+            started = time.perf_counter()
+            try:
+                await SCENARIOS[name](client, worker_rng, context)
+                timings[name].append((time.perf_counter() - started) * 1000)
+            except (ScenarioError, httpx.HTTPError) as exc:
+                errors[name] += 1
+                if len(error_samples) < 10:
+                    error_samples.append(f"{name}: {exc}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_timings = [t for name in names for t in timings[name]]
+    return {
+        "elapsed_sec": round(elapsed, 3),
+        "scenarios": {name: summarize(timings[name], errors[name], elapsed) for name in names},
+        "total": summarize(all_timings, sum(errors.values()), elapsed),
+        "error_samples": error_samples,
+    }
+
+
+async def run_inprocess(mix: Dict[str, int], iterations: int, concurrency: int,
+                        warmup: int, context: dict) -> dict:
+    """Jalankan mix terhadap app in-process (httpx ASGITransport)"""
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        if warmup:
+            await run_mix(client, mix, warmup, concurrency, context, seed_value=1)
+        return await run_mix(client, mix, iterations, concurrency, context)
+
+
+async def run_uvicorn(mix: Dict[str, int], iterations: int, concurrency: int, warmup: int,
+                      context: dict, port: int, workers: int) -> dict:
+    """Jalankan app sebagai proses uvicorn terpisah lalu jalankan mix via HTTP"""
+    service_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=service_dir,
+        env=dict(os.environ),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline or process.poll() is not None:
+                    raise RuntimeError("uvicorn tidak siap dalam 30 detik")
+                await asyncio.sleep(0.2)
+
+            if warmup:
+                await run_mix(client, mix, warmup, concurrency, context, seed_value=1)
+            return await run_mix(client, mix, iterations, concurrency, context)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse 'balance_inquiry=70,transfer=30' menjadi dict bobot"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Skenario tidak dikenal: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test service layer Mobile Banking")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench_load.db"))
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--accounts-per-customer", type=int, default=2)
+    parser.add_argument("--transactions-per-account", type=int, default=50)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Bobot skenario, mis. balance_inquiry=70,transfer=30 "
+                             f"(tersedia: {', '.join(SCENARIOS)})")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--history-pages", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--workers", type=int, default=1, help="Jumlah worker uvicorn (mode uvicorn)")
+    parser.add_argument("--output", help="Tulis hasil JSON ke file (default stdout)")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    seed(args.customers, args.accounts_per_customer, args.transactions_per_account)
+
+    context = {
+        "customers": args.customers,
+        "accounts_per_customer": args.accounts_per_customer,
+        "page_size": args.page_size,
+        "history_pages": args.history_pages,
+    }
+    if args.mode == "inprocess":
+        result = asyncio.run(run_inprocess(args.mix, args.iterations, args.concurrency, args.warmup, context))
+    else:
+        result = asyncio.run(run_uvicorn(
+            args.mix, args.iterations, args.concurrency, args.warmup, context, args.port, args.workers
+        ))
+
+    report = {
+        "commit": git_commit(),
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "database": args.database_url.split(":", 1)[0],
+        "dataset": {
+            "customers": args.customers,
+            "accounts_per_customer": args.accounts_per_customer,
+            "transactions_per_account": args.transactions_per_account,
+        },
+        "mix": args.mix,
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        **result,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
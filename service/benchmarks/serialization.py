@@ -0,0 +1,194 @@
+"""
+Microbenchmark serialization: converter ORM -> dict di service layer
+(_account_to_dict, _transaction_to_dict, _customer_to_dict), validasi
+response_model controller dan encoder row -> JSON endpoint riwayat transaksi,
+untuk 1, 100 dan 10.000 row
+
+Jalankan dari folder service:
+    python -m benchmarks.serialization                    # bandingkan dengan baseline
+    python -m benchmarks.serialization --update-baseline  # simpan hasil sebagai baseline baru
+    python -m benchmarks.serialization --threshold 1.0 --json
+
+Exit code 1 jika ada case yang lebih lambat dari baseline * (1 + threshold),
+sehingga bisa dipakai sebagai gate sebelum deploy. Baseline bergantung pada
+mesin; perbarui baseline di mesin CI yang sama saat hardware berubah
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, List, Tuple
+import argparse
+import json
+import os
+import sys
+import timeit
+from pydantic import TypeAdapter
+from db.models import Customer, PortfolioAccount, Transaction
+from services.account_service import AccountService
+from services.customer_service import CustomerService
+from services.transaction_service import TransactionService
+from repository.transaction_repository import TRANSACTION_ROW_FIELDS
+from utils.serialization import rows_to_json
+from controllers.account_controller import AccountResponse
+from controllers.customer_controller import CustomerResponse
+from controllers.transaction_controller import TransactionResponse
+
+ROW_COUNTS = (1, 100, 10000)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "serialization.json")
+NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_accounts(count: int) -> List[PortfolioAccount]:
+    return [
+        PortfolioAccount(
+            id=i, m_customer_id=i, account_number=f"{1000000000 + i}", account_name=f"Account {i}",
+            account_type="SAV", currency_code="IDR", clear_balance=Decimal("1500000.50"),
+            available_balance=Decimal("1500000.50"), is_active=True, created_at=NOW, updated_at=NOW
+        )
+        for i in range(count)
+    ]
+
+
+def make_transactions(count: int) -> List[Transaction]:
+    return [
+        Transaction(
+            id=i, m_customer_id=1, transaction_type="TR", transaction_amount=Decimal("250000.00"),
+            from_account_number="1000000001", to_account_number="1000000002", status="SUCCESS",
+            description="Transfer", transaction_date=NOW - timedelta(minutes=i), created_at=NOW
+        )
+        for i in range(count)
+    ]
+
+
+def make_customers(count: int) -> List[Customer]:
+    return [
+        Customer(
+            id=i, customer_name=f"Customer {i}", customer_username=f"user{i}", customer_pin="x",
+            customer_email=f"user{i}@example.com", customer_phone="0800", cif_number=f"CIF{i}",
+            failed_login_attempts=0, is_locked=False, last_login=NOW, created_at=NOW, updated_at=NOW
+        )
+        for i in range(count)
+    ]
+
+
+def build_cases() -> Dict[str, Callable[[], object]]:
+    """
+    Susun semua case benchmark
+
+    Returns:
+        Dict nama case -> fungsi tanpa argumen yang dijalankan berulang
+    """
+    account_service = AccountService()
+    transaction_service = TransactionService()
+    customer_service = CustomerService()
+    subjects = [
+        ("account", make_accounts, account_service._account_to_dict, AccountResponse),
+        ("transaction", make_transactions, transaction_service._transaction_to_dict, TransactionResponse),
+        ("customer", make_customers, customer_service._customer_to_dict, CustomerResponse),
+    ]
+
+    cases = {}
+    for name, factory, to_dict, response_model in subjects:
+        adapter = TypeAdapter(List[response_model])
+        for count in ROW_COUNTS:
+            rows = factory(count)
+            dicts = [to_dict(row) for row in rows]
+            cases[f"{name}_to_dict[{count}]"] = (
+                lambda rows=rows, to_dict=to_dict: [to_dict(row) for row in rows]
+            )
+            # Validasi + dump response_model seperti yang dilakukan FastAPI
+            cases[f"{name}_response_model[{count}]"] = (
+                lambda dicts=dicts, adapter=adapter: adapter.dump_python(adapter.validate_python(dicts), mode="json")
+            )
+
+    # Jalur cepat endpoint riwayat transaksi: tuple kolom -> JSON bytes
+    for count in ROW_COUNTS:
+        rows = [
+            tuple(getattr(transaction, field) for field in TRANSACTION_ROW_FIELDS)
+            for transaction in make_transactions(count)
+        ]
+        cases[f"transaction_rows_to_json[{count}]"] = lambda rows=rows: rows_to_json(TRANSACTION_ROW_FIELDS, rows)
+    return cases
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """
+    Ukur waktu per pemanggilan (detik), diambil nilai terbaik dari beberapa repeat
+
+    Args:
+        func: Fungsi yang diukur
+        repeat: Jumlah pengulangan pengukuran
+
+    Returns:
+        Waktu per pemanggilan dalam detik
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[Tuple[str, float]]:
+    """
+    Bandingkan hasil dengan baseline
+
+    Returns:
+        List of (nama case, rasio terhadap baseline) yang melewati threshold
+    """
+    regressions = []
+    for name, seconds in results.items():
+        expected = baseline.get(name)
+        if expected and seconds > expected * (1 + threshold):
+            regressions.append((name, seconds / expected))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark serialization helper")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="Toleransi perlambatan terhadap baseline (0.5 = 50%%)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Cetak hasil sebagai JSON")
+    args = parser.parse_args()
+
+    cases = build_cases()
+    results = {name: measure(func, args.repeat) for name, func in cases.items()}
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({name: round(seconds, 9) for name, seconds in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline disimpan: {args.baseline}")
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        # Ukur ulang case yang gagal untuk menyaring noise (mis. CPU sedang sibuk)
+        for name, _ in regressions:
+            results[name] = min(results[name], measure(cases[name], args.repeat * 2))
+        regressions = compare(results, baseline, args.threshold)
+
+    if args.json:
+        print(json.dumps({
+            "results": results,
+            "baseline": baseline,
+            "threshold": args.threshold,
+            "regressions": [name for name, _ in regressions],
+        }, indent=2))
+    else:
+        for name, seconds in results.items():
+            expected = baseline.get(name)
+            ratio = f"{seconds / expected:6.2f}x" if expected else "     -"
+            print(f"{name:36s} {seconds * 1e6:12.2f} us  {ratio}")
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x baseline (threshold {1 + args.threshold:.2f}x)")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
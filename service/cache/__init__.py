@@ -0,0 +1,3 @@
+"""
+Init file for cache package
+"""
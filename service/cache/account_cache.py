@@ -0,0 +1,225 @@
+"""
+Account Cache - Read-through cache untuk lookup account
+Default: in-process LRU dengan TTL. Backend lain (mis. Redis) cukup
+mengimplementasikan interface AccountCache
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+import os
+import threading
+import time
+
+
+class AccountCache(ABC):
+    """
+    Interface cache account (key = account number, value = dict account)
+
+    generation() diambil sebelum DB read; set() dengan generation yang lebih
+    lama dari invalidate() terakhir key tersebut diabaikan, sehingga hasil DB
+    read yang dimulai sebelum sebuah write tidak menimpa invalidation dari
+    write tersebut
+    """
+
+    enabled = True
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        """Ambil dict account dari cache, None jika miss"""
+
+    @abstractmethod
+    def set(self, key: str, value: dict, generation: Optional[int] = None) -> None:
+        """Simpan dict account; diabaikan jika generation sudah basi"""
+
+    @abstractmethod
+    def invalidate(self, key: str) -> None:
+        """Hapus entry dan batalkan set() dari load yang sedang berjalan"""
+
+    @abstractmethod
+    def generation(self, key: str) -> int:
+        """Generation saat ini, diambil sebelum membaca database"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Hapus semua entry"""
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Statistik cache (untuk endpoint metrics/debug)"""
+
+    def get_or_load(self, key: str, loader: Callable[[], Optional[dict]],
+                    store: bool = True) -> Optional[dict]:
+        """
+        Read-through: ambil dari cache, jika miss panggil loader lalu simpan
+        
+        Args:
+            key: Account number
+            loader: Fungsi yang membaca account dari database
+            store: False jika hasil loader boleh basi (mis. dibaca dari read
+                   replica yang tertinggal) sehingga tidak disimpan ke cache
+        
+        Returns:
+            Dict account atau None jika tidak ditemukan (None tidak di-cache)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        
+        generation = self.generation(key)
+        value = loader()
+        if value is not None and store:
+            self.set(key, value, generation)
+        return value
+
+
+class NullAccountCache(AccountCache):
+    """Cache nonaktif - semua lookup langsung ke database"""
+
+    enabled = False
+
+    def get(self, key: str) -> Optional[dict]:
+        return None
+
+    def set(self, key: str, value: dict, generation: Optional[int] = None) -> None:
+        pass
+
+    def invalidate(self, key: str) -> None:
+        pass
+
+    def generation(self, key: str) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+class InMemoryAccountCache(AccountCache):
+    """
+    In-process LRU cache dengan TTL (thread-safe)
+
+    Generation adalah counter global yang naik setiap invalidate(). Generation
+    invalidate terakhir disimpan di entry key tersebut (invalidate meninggalkan
+    tombstone), sehingga ikut dibatasi max_size LRU. Generation entry yang
+    di-evict/expired digabung ke _generation_floor: set() dari load yang
+    dimulai sebelumnya ditolak (paling buruk hanya cache miss berikutnya)
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 5.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # key -> (dict account atau None untuk tombstone, expires_at, generation)
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._generation_floor = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is None:
+                self._misses += 1
+                return None
+        
+            value, expires_at, generation = entry
+            if expires_at <= time.monotonic():
+                self._drop(key, generation)
+                self._misses += 1
+                return None
+        
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return dict(value)
+
+    def set(self, key: str, value: dict, generation: Optional[int] = None) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            last_invalidation = entry[2] if entry is not None else self._generation_floor
+            if generation is not None and generation < last_invalidation:
+                return
+        
+            self._put(key, dict(value), entry[2] if entry is not None else 0)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None:
+                self._invalidations += 1
+            self._put(key, None, self._generation)
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._generation_floor = self._generation
+
+    def _put(self, key: str, value: Optional[dict], generation: int) -> None:
+        """Simpan entry/tombstone lalu evict entry terlama jika melebihi max_size (lock sudah dipegang)"""
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds, generation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            _, (evicted_value, _, evicted_generation) = self._entries.popitem(last=False)
+            self._generation_floor = max(self._generation_floor, evicted_generation)
+            if evicted_value is not None:
+                self._evictions += 1
+
+    def _drop(self, key: str, generation: int) -> None:
+        """Hapus entry expired; generation-nya digabung ke floor (lock sudah dipegang)"""
+        del self._entries[key]
+        self._generation_floor = max(self._generation_floor, generation)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations
+            }
+
+
+_account_cache: Optional[AccountCache] = None
+_account_cache_lock = threading.Lock()
+
+
+def get_account_cache() -> AccountCache:
+    """
+    Get instance cache account (singleton per proses)
+    Dikonfigurasi via env:
+        ACCOUNT_CACHE_BACKEND: memory (default) atau none
+        ACCOUNT_CACHE_MAX_SIZE: jumlah maksimal entry (default 10000)
+        ACCOUNT_CACHE_TTL_SECONDS: TTL entry dalam detik (default 5)
+
+    Catatan: invalidation hanya berlaku di proses yang sama. Jika service
+    dijalankan dengan banyak worker, TTL membatasi staleness antar worker
+    """
+    global _account_cache
+    if _account_cache is None:
+        with _account_cache_lock:
+            if _account_cache is None:
+                backend = os.getenv("ACCOUNT_CACHE_BACKEND", "memory").lower()
+                if backend == "none":
+                    _account_cache = NullAccountCache()
+                else:
+                    _account_cache = InMemoryAccountCache(
+                        max_size=int(os.getenv("ACCOUNT_CACHE_MAX_SIZE", "10000")),
+                        ttl_seconds=float(os.getenv("ACCOUNT_CACHE_TTL_SECONDS", "5"))
+                    )
+    return _account_cache
@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional, List
-from db.database import get_db
+from db.write_queue import run_write
+from db.database import get_db, get_read_db
 from services.account_service import AccountService
 
 router = APIRouter(prefix="/service/account", tags=["Account Service"])
@@ -52,6 +53,11 @@ class AccountResponse(BaseModel):
     updated_at: Optional[str]
 
 
+class AccountLookupRequest(BaseModel):
+    """Request model untuk bulk lookup account"""
+    account_numbers: List[str]
+
+
 # ===== API Endpoints =====
 
 @router.post("", response_model=AccountResponse, status_code=201)
@@ -77,12 +83,32 @@ def create_portfolio_account(account: AccountCreate, db: Session = Depends(get_d
         Account object yang baru dibuat
     """
     account_data = account.dict()
-    result = account_service.create_account(db, account_data)
+    result = run_write(db, lambda session: account_service.create_account(session, account_data))
     return result
 
 
+@router.post("/lookup", response_model=List[AccountResponse])
+def lookup_accounts(lookup: AccountLookupRequest, db: Session = Depends(get_read_db)):
+    """
+    Bulk lookup account berdasarkan daftar nomor rekening
+    Semua nomor diambil dengan satu query IN (menggantikan GET
+    /number/{account_number} berulang per nomor)
+    
+    Endpoint: POST /service/account/lookup
+    
+    Request Body:
+    {
+        "account_numbers": ["1234567890", "9876543210"]
+    }
+    
+    Returns:
+        List account yang ditemukan (nomor yang tidak ada diabaikan)
+    """
+    return account_service.lookup_accounts(db, lookup.account_numbers)
+
+
 @router.get("/customer/{customer_id}", response_model=List[AccountResponse])
-def get_accounts_by_customer(customer_id: int, active_only: bool = True, db: Session = Depends(get_db)):
+def get_accounts_by_customer(customer_id: int, active_only: bool = True, db: Session = Depends(get_read_db)):
     """
     Get semua account milik customer
     Digunakan untuk cek saldo di middleware
@@ -96,8 +122,22 @@ def get_accounts_by_customer(customer_id: int, active_only: bool = True, db: Ses
     return result
 
 
+@router.get("/cache/stats")
+def get_account_cache_stats():
+    """
+    Statistik read-through cache account (hit/miss, size, evictions)
+    Digunakan untuk sizing cache
+    
+    Endpoint: GET /service/account/cache/stats
+    
+    Returns:
+        Dict statistik cache
+    """
+    return account_service.cache.stats()
+
+
 @router.get("/number/{account_number}", response_model=AccountResponse)
-def get_account_by_number(account_number: str, db: Session = Depends(get_db)):
+def get_account_by_number(account_number: str, db: Session = Depends(get_read_db)):
     """
     Get account berdasarkan account number
     
@@ -111,7 +151,7 @@ def get_account_by_number(account_number: str, db: Session = Depends(get_db)):
 
 
 @router.get("/{account_id}", response_model=AccountResponse)
-def get_account_by_id(account_id: int, db: Session = Depends(get_db)):
+def get_account_by_id(account_id: int, db: Session = Depends(get_read_db)):
     """
     Get account berdasarkan ID
     
@@ -125,7 +165,7 @@ def get_account_by_id(account_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{account_number}/balance")
-def get_account_balance(account_number: str, db: Session = Depends(get_db)):
+def get_account_balance(account_number: str, db: Session = Depends(get_read_db)):
     """
     Get balance account by account number
     
@@ -137,11 +177,8 @@ def get_account_balance(account_number: str, db: Session = Depends(get_db)):
         "available_balance": 1000000
     }
     """
-    account = account_service.get_account_by_number(db, account_number)
-    return {
-        "clear_balance": account['clear_balance'],
-        "available_balance": account['available_balance']
-    }
+    result = account_service.get_balance(db, account_number)
+    return result
 
 
 @router.put("/{account_number}/balance", response_model=AccountResponse)
@@ -162,9 +199,9 @@ def update_account_balance(account_number: str, balance: AccountBalanceUpdate, d
     Returns:
         Account object yang telah diupdate
     """
-    result = account_service.update_balance(
-        db, account_number, balance.clear_balance, balance.available_balance
-    )
+    result = run_write(db, lambda session: account_service.update_balance(
+        session, account_number, balance.clear_balance, balance.available_balance
+    ))
     return result
 
 
@@ -183,7 +220,7 @@ def debit_account(account_number: str, amount: float, db: Session = Depends(get_
     Returns:
         Account object yang telah diupdate
     """
-    result = account_service.debit_account(db, account_number, amount)
+    result = run_write(db, lambda session: account_service.debit_account(session, account_number, amount))
     return result
 
 
@@ -202,12 +239,12 @@ def credit_account(account_number: str, amount: float, db: Session = Depends(get
     Returns:
         Account object yang telah diupdate
     """
-    result = account_service.credit_account(db, account_number, amount)
+    result = run_write(db, lambda session: account_service.credit_account(session, account_number, amount))
     return result
 
 
 @router.get("/{account_number}/check-balance")
-def check_balance_sufficient(account_number: str, amount: float, db: Session = Depends(get_db)):
+def check_balance_sufficient(account_number: str, amount: float, db: Session = Depends(get_read_db)):
     """
     Check apakah balance mencukupi untuk transaksi
     
@@ -240,7 +277,7 @@ def update_account(account_id: int, account: AccountUpdate, db: Session = Depend
     """
     # Filter hanya field yang diisi
     update_data = {k: v for k, v in account.dict().items() if v is not None}
-    result = account_service.update_account(db, account_id, update_data)
+    result = run_write(db, lambda session: account_service.update_account(session, account_id, update_data))
     return result
 
 
@@ -254,5 +291,5 @@ def deactivate_account(account_number: str, db: Session = Depends(get_db)):
     Returns:
         Account object yang telah di-deactivate
     """
-    result = account_service.deactivate_account(db, account_number)
+    result = run_write(db, lambda session: account_service.deactivate_account(session, account_number))
     return result
@@ -0,0 +1,96 @@
+"""
+Async Account Controller - REST API Endpoints (async) untuk Account read operations
+Di-include oleh main.py hanya jika DATABASE_MODE=async; route di sini
+didaftarkan sebelum account_controller sehingga menggantikan versi sync
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from db.database import get_async_db
+from services.async_account_service import AsyncAccountService
+from controllers.account_controller import AccountResponse
+
+router = APIRouter(prefix="/service/account", tags=["Account Service"])
+account_service = AsyncAccountService()
+
+
+# ===== API Endpoints =====
+
+@router.get("/customer/{customer_id}", response_model=List[AccountResponse])
+async def get_accounts_by_customer(customer_id: int, active_only: bool = True,
+                                   db: AsyncSession = Depends(get_async_db)):
+    """
+    Get semua account milik customer (async)
+    
+    Endpoint: GET /service/account/customer/{customer_id}?active_only=true
+    
+    Returns:
+        List of account objects
+    """
+    result = await account_service.get_accounts_by_customer_async(db, customer_id, active_only)
+    return result
+
+
+@router.get("/number/{account_number}", response_model=AccountResponse)
+async def get_account_by_number(account_number: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get account berdasarkan account number (async)
+    
+    Endpoint: GET /service/account/number/{account_number}
+    
+    Returns:
+        Account object
+    """
+    result = await account_service.get_account_by_number_async(db, account_number)
+    return result
+
+
+@router.get("/{account_id}", response_model=AccountResponse)
+async def get_account_by_id(account_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get account berdasarkan ID (async)
+    
+    Endpoint: GET /service/account/{account_id}
+    
+    Returns:
+        Account object
+    """
+    result = await account_service.get_account_by_id_async(db, account_id)
+    return result
+
+
+@router.get("/{account_number}/balance")
+async def get_account_balance(account_number: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get balance account by account number (async)
+    
+    Endpoint: GET /service/account/{account_number}/balance
+    
+    Returns:
+    {
+        "clear_balance": 1000000,
+        "available_balance": 1000000
+    }
+    """
+    account = await account_service.get_account_by_number_async(db, account_number)
+    return {
+        "clear_balance": account['clear_balance'],
+        "available_balance": account['available_balance']
+    }
+
+
+@router.get("/{account_number}/check-balance")
+async def check_balance_sufficient(account_number: str, amount: float,
+                                   db: AsyncSession = Depends(get_async_db)):
+    """
+    Check apakah balance mencukupi untuk transaksi (async)
+    
+    Endpoint: GET /service/account/{account_number}/check-balance?amount=100000
+    
+    Returns:
+        {
+            "sufficient": true/false
+        }
+    """
+    is_sufficient = await account_service.check_balance_sufficient_async(db, account_number, amount)
+    return {"sufficient": is_sufficient}
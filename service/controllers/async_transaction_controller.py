@@ -0,0 +1,81 @@
+"""
+Async Transaction Controller - REST API Endpoints (async) untuk Transaction read operations
+Di-include oleh main.py hanya jika DATABASE_MODE=async; route di sini
+didaftarkan sebelum transaction_controller sehingga menggantikan versi sync
+"""
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+from db.database import get_async_db
+from services.async_transaction_service import AsyncTransactionService
+from controllers.transaction_controller import TransactionResponse
+from utils.serialization import JSONBytesResponse
+
+router = APIRouter(prefix="/service/transaction", tags=["Transaction Service"])
+transaction_service = AsyncTransactionService()
+
+
+# ===== API Endpoints =====
+
+@router.get("/customer/{customer_id}", response_model=List[TransactionResponse])
+async def get_transactions_by_customer(customer_id: int, skip: int = 0,
+                                       limit: int = 100, cursor: Optional[str] = None,
+                                       expand: Optional[str] = None,
+                                       db: AsyncSession = Depends(get_async_db)):
+    """
+    Get semua transaction milik customer (async)
+    
+    Endpoint: GET /service/transaction/customer/{customer_id}?skip=0&limit=100
+              GET /service/transaction/customer/{customer_id}?limit=100&cursor=...
+              GET /service/transaction/customer/{customer_id}?expand=counterparty
+    
+    Returns:
+        List of transaction objects (sorted by date desc)
+    """
+    content, next_cursor = await transaction_service.get_transaction_page_by_customer_async(
+        db, customer_id, skip, limit, cursor, transaction_service.parse_expand(expand)
+    )
+    return _page_response(content, next_cursor)
+
+
+@router.get("/account/{account_number}", response_model=List[TransactionResponse])
+async def get_transactions_by_account(account_number: str, skip: int = 0,
+                                      limit: int = 100, cursor: Optional[str] = None,
+                                      expand: Optional[str] = None,
+                                      db: AsyncSession = Depends(get_async_db)):
+    """
+    Get semua transaction dari/ke account tertentu (async)
+    
+    Endpoint: GET /service/transaction/account/{account_number}?skip=0&limit=100
+              GET /service/transaction/account/{account_number}?limit=100&cursor=...
+              GET /service/transaction/account/{account_number}?expand=counterparty
+    
+    Returns:
+        List of transaction objects (sorted by date desc)
+    """
+    content, next_cursor = await transaction_service.get_transaction_page_by_account_async(
+        db, account_number, skip, limit, cursor, transaction_service.parse_expand(expand)
+    )
+    return _page_response(content, next_cursor)
+
+
+@router.get("/{transaction_id}", response_model=TransactionResponse)
+async def get_transaction_by_id(transaction_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get transaction berdasarkan ID (async)
+    
+    Endpoint: GET /service/transaction/{transaction_id}
+    
+    Returns:
+        Transaction object
+    """
+    result = await transaction_service.get_transaction_by_id_async(db, transaction_id)
+    return result
+
+
+def _page_response(content: bytes, next_cursor: Optional[str]) -> JSONBytesResponse:
+    """Response halaman riwayat (JSON bytes) + header X-Next-Cursor jika masih ada halaman berikutnya"""
+    response = JSONBytesResponse(content)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
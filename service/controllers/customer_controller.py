@@ -5,11 +5,18 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List
-from db.database import get_db
+from db.write_queue import run_write
+from db.database import get_db, get_read_db
 from services.customer_service import CustomerService
+from services.dashboard_service import DashboardService
+from controllers.account_controller import AccountResponse
+from controllers.transaction_controller import TransactionResponse
+from utils.logger import get_logger
 
 router = APIRouter(prefix="/service/customer", tags=["Customer Service"])
 customer_service = CustomerService()
+dashboard_service = DashboardService()
+logger = get_logger(__name__)
 
 
 # ===== Pydantic Models (Request/Response) =====
@@ -34,6 +41,12 @@ class CustomerUpdate(BaseModel):
     last_login: Optional[str] = None
 
 
+class LoginRequest(BaseModel):
+    """Request model untuk login"""
+    username: str
+    pin: str  # Plain text, diverifikasi terhadap hash di service layer
+
+
 class CustomerResponse(BaseModel):
     """Response model untuk customer"""
     id: int
@@ -49,6 +62,20 @@ class CustomerResponse(BaseModel):
     updated_at: Optional[str]
 
 
+class DashboardTransaction(TransactionResponse):
+    """Transaksi terbaru di dashboard (dengan nama rekening asal/tujuan)"""
+    from_account_name: Optional[str]
+    to_account_name: Optional[str]
+
+
+class DashboardResponse(BaseModel):
+    """Response model untuk dashboard customer"""
+    customer: CustomerResponse
+    accounts: List[AccountResponse]
+    total_balance: float
+    recent_transactions: List[DashboardTransaction]
+
+
 # ===== API Endpoints =====
 
 @router.post("", response_model=CustomerResponse, status_code=201)
@@ -71,43 +98,60 @@ def register_customer(customer: CustomerCreate, db: Session = Depends(get_db)):
     Returns:
         Customer object yang baru dibuat
     """
-    print(f"\n{'='*50}")
-    print(f"📝 NEW CUSTOMER REGISTRATION REQUEST")
-    print(f"   Username: {customer.customer_username}")
-    print(f"   Name: {customer.customer_name}")
-    print(f"   Email: {customer.customer_email}")
-    print(f"   CIF: {customer.cif_number}")
-    print(f"{'='*50}\n")
+    logger.info("customer registration request", extra={
+        "customer_username": customer.customer_username,
+        "cif_number": customer.cif_number
+    })
     
     customer_data = customer.dict()
-    result = customer_service.create_customer(db, customer_data)
+    result = run_write(db, lambda session: customer_service.create_customer(session, customer_data))
     
-    print(f"\n{'='*50}")
-    print(f"✅ REGISTRATION SUCCESSFUL")
-    print(f"   Customer ID: {result['id']}")
-    print(f"   Username: {result['customer_username']}")
-    print(f"{'='*50}\n")
+    logger.info("customer registration successful", extra={
+        "customer_id": result["id"],
+        "customer_username": result["customer_username"]
+    })
     
     return result
 
 
+@router.post("/login", response_model=CustomerResponse)
+def login(credentials: LoginRequest, db: Session = Depends(get_db)):
+    """
+    Login customer dalam satu panggilan
+    Cek lock, verifikasi PIN, dan pencatatan failed attempts / last_login
+    dilakukan di service layer (PIN hash tidak dikirim ke middleware)
+    
+    Endpoint: POST /service/customer/login
+    
+    Request Body:
+    {
+        "username": "budi01",
+        "pin": "123456"
+    }
+    
+    Returns:
+        Customer object (tanpa PIN); 401 jika username/PIN salah,
+        403 jika account locked
+    """
+    return customer_service.login(db, credentials.username, credentials.pin)
+
+
 @router.get("/username/{username}")
-def get_customer_by_username(username: str, db: Session = Depends(get_db)):
+def get_customer_by_username(username: str, db: Session = Depends(get_read_db)):
     """
     Get customer berdasarkan username
-    Digunakan untuk proses login di middleware
     
     Endpoint: GET /service/customer/username/{username}
     
     Returns:
-        Customer object (termasuk PIN untuk validasi)
+        Customer object (tanpa PIN; verifikasi PIN lewat POST /service/customer/login)
     """
     result = customer_service.get_customer_by_username(db, username)
     return result
 
 
 @router.get("/{customer_id}", response_model=CustomerResponse)
-def get_customer_by_id(customer_id: int, db: Session = Depends(get_db)):
+def get_customer_by_id(customer_id: int, db: Session = Depends(get_read_db)):
     """
     Get customer berdasarkan ID
     
@@ -120,8 +164,22 @@ def get_customer_by_id(customer_id: int, db: Session = Depends(get_db)):
     return result
 
 
+@router.get("/{customer_id}/dashboard", response_model=DashboardResponse)
+def get_customer_dashboard(customer_id: int, recent: int = 5, db: Session = Depends(get_read_db)):
+    """
+    Get dashboard customer dalam satu panggilan
+    Digunakan saat app dibuka (profil, account aktif, total saldo, transaksi terbaru)
+    
+    Endpoint: GET /service/customer/{customer_id}/dashboard?recent=5
+    
+    Returns:
+        Customer, account aktif, total available_balance, dan transaksi terbaru
+    """
+    return dashboard_service.get_dashboard(db, customer_id, recent)
+
+
 @router.get("", response_model=List[CustomerResponse])
-def get_all_customers(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_all_customers(skip: int = 0, limit: int = 100, db: Session = Depends(get_read_db)):
     """
     Get semua customer dengan pagination
     
@@ -153,7 +211,7 @@ def update_customer(customer_id: int, customer: CustomerUpdate, db: Session = De
     """
     # Filter hanya field yang diisi
     update_data = {k: v for k, v in customer.dict().items() if v is not None}
-    result = customer_service.update_customer(db, customer_id, update_data)
+    result = run_write(db, lambda session: customer_service.update_customer(session, customer_id, update_data))
     return result
 
 
@@ -172,7 +230,7 @@ def handle_failed_login(customer_id: int, db: Session = Depends(get_db)):
             "is_locked": false
         }
     """
-    result = customer_service.handle_failed_login(db, customer_id)
+    result = run_write(db, lambda session: customer_service.handle_failed_login(session, customer_id))
     return result
 
 
@@ -187,7 +245,7 @@ def handle_successful_login(customer_id: int, db: Session = Depends(get_db)):
     Returns:
         Customer object yang telah diupdate
     """
-    result = customer_service.handle_successful_login(db, customer_id)
+    result = run_write(db, lambda session: customer_service.handle_successful_login(session, customer_id))
     return result
 
 
@@ -201,12 +259,12 @@ def unlock_account(customer_id: int, db: Session = Depends(get_db)):
     Returns:
         Customer object yang telah diupdate
     """
-    result = customer_service.unlock_account(db, customer_id)
+    result = run_write(db, lambda session: customer_service.unlock_account(session, customer_id))
     return result
 
 
 @router.get("/{customer_id}/check-locked")
-def check_account_locked(customer_id: int, db: Session = Depends(get_db)):
+def check_account_locked(customer_id: int, db: Session = Depends(get_read_db)):
     """
     Check apakah account locked
     
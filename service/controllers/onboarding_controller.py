@@ -0,0 +1,106 @@
+"""
+Onboarding Controller - REST API Endpoint untuk bulk import customer + account
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import Optional, List
+from db.database import get_db
+from db.write_queue import run_write
+from services.onboarding_service import OnboardingService, IMPORT_CHUNK_SIZE, iter_file_records
+from utils.logger import get_logger
+import codecs
+import os
+import tempfile
+
+router = APIRouter(prefix="/service/onboarding", tags=["Onboarding Service"])
+onboarding_service = OnboardingService()
+logger = get_logger(__name__)
+
+# Body import di atas ukuran ini di-spool ke file sementara (bukan memory)
+IMPORT_SPOOL_MAX_BYTES = int(os.getenv("ONBOARDING_IMPORT_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+
+
+# ===== Pydantic Models (Request/Response) =====
+
+class RejectedRow(BaseModel):
+    """Row import yang ditolak"""
+    index: int
+    cif_number: Optional[str] = None
+    customer_username: Optional[str] = None
+    error: str
+
+
+class ImportResponse(BaseModel):
+    """Response model untuk bulk import"""
+    total: int
+    customers: int
+    accounts: int
+    rejected: int
+    rejected_rows: List[RejectedRow]
+
+
+# ===== Helpers =====
+
+def _import_body(db: Session, body, file_format: str, chunk_size: int) -> dict:
+    """
+    Parse body (sudah di-spool) dengan iter_file_records yang sama dengan CLI
+    lalu import per chunk; setiap chunk ditulis lewat run_write (single writer)
+
+    Returns:
+        Ringkasan import (total, customers, accounts, rejected, rejected_rows)
+    """
+    summary = {"total": 0, "customers": 0, "accounts": 0, "rejected": 0, "rejected_rows": []}
+    lines = codecs.iterdecode(body, "utf-8-sig")
+    for chunk, invalid in onboarding_service.iter_chunks(iter_file_records(lines, file_format), chunk_size):
+        result = run_write(db, lambda session: onboarding_service.import_chunk(session, chunk))
+        summary["total"] += len(chunk) + len(invalid)
+        summary["customers"] += result["customers"]
+        summary["accounts"] += result["accounts"]
+        summary["rejected_rows"].extend(invalid)
+        summary["rejected_rows"].extend(result["rejected"])
+    summary["rejected_rows"].sort(key=lambda row: row["index"])
+    summary["rejected"] = len(summary["rejected_rows"])
+    return summary
+
+
+# ===== API Endpoints =====
+
+@router.post("/import", response_model=ImportResponse)
+async def import_customers(request: Request,
+                           format: Optional[str] = None,
+                           chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=10000),
+                           db: Session = Depends(get_db)):
+    """
+    Bulk import customer + account (migrasi buku bank mitra)
+    Body di-spool (memory, lalu file sementara jika melebihi
+    IMPORT_SPOOL_MAX_BYTES) lalu di-parse dengan parser yang sama dengan CLI;
+    setiap chunk divalidasi, dicek keunikannya ke database dengan query batch,
+    lalu di-insert dengan bulk INSERT (satu commit per chunk)
+
+    Endpoint: POST /service/onboarding/import?format=csv&chunk_size=1000
+
+    Request Body (CSV dengan header, atau NDJSON satu record per baris):
+    customer_name,customer_username,customer_pin,customer_email,customer_phone,cif_number,account_number,account_type,available_balance
+    Budi,budi01,$2b$10$<hash bcrypt>,budi@gmail.com,08123,9001,1234567890,SAV,100000
+
+    format default dari Content-Type (text/csv = csv, selain itu ndjson)
+
+    Returns:
+        Ringkasan jumlah customer/account yang di-import dan row yang ditolak
+    """
+    file_format = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    if file_format not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Format harus csv atau ndjson")
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_MAX_BYTES) as body:
+        async for chunk in request.stream():
+            body.write(chunk)
+        body.seek(0)
+        summary = await run_in_threadpool(_import_body, db, body, file_format, chunk_size)
+
+    logger.info("onboarding import finished", extra={
+        key: summary[key] for key in ("total", "customers", "accounts", "rejected")
+    })
+    return summary
@@ -1,15 +1,23 @@
 """
 Transaction Controller - REST API Endpoints untuk Transaction operations
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from typing import Optional, List
-from db.database import get_db
-from services.transaction_service import TransactionService
+from datetime import datetime
+import json
+from db.write_queue import run_write
+from db.database import get_db, get_read_db, open_read_session, READ_CONSISTENCY_HEADER
+from services.transaction_service import TransactionService, BATCH_CHUNK_SIZE
+from utils.serialization import JSONBytesResponse
+from services.transfer_service import TransferService
 
 router = APIRouter(prefix="/service/transaction", tags=["Transaction Service"])
 transaction_service = TransactionService()
+transfer_service = TransferService()
 
 
 # ===== Pydantic Models (Request/Response) =====
@@ -25,6 +33,23 @@ class TransactionCreate(BaseModel):
     description: Optional[str] = None
 
 
+class TransferRequest(BaseModel):
+    """Request model untuk transfer atomik"""
+    m_customer_id: int
+    from_account_number: str
+    to_account_number: str
+    amount: float
+    description: Optional[str] = None
+
+
+class CashTransactionRequest(BaseModel):
+    """Request model untuk tarik/setor tunai"""
+    m_customer_id: int
+    account_number: str
+    amount: float
+    description: Optional[str] = None
+
+
 class TransactionStatusUpdate(BaseModel):
     """Request model untuk update status"""
     status: str  # PENDING, SUCCESS, FAILED
@@ -44,6 +69,42 @@ class TransactionResponse(BaseModel):
     created_at: Optional[str]
 
 
+class TransferAccountBalance(BaseModel):
+    """Saldo terbaru rekening setelah transfer"""
+    account_number: str
+    account_name: str
+    clear_balance: float
+    available_balance: float
+
+
+class TransferResponse(BaseModel):
+    """Response model untuk transfer atomik"""
+    transaction: TransactionResponse
+    from_account: TransferAccountBalance
+    to_account: TransferAccountBalance
+
+
+class CashTransactionResponse(BaseModel):
+    """Response model untuk tarik/setor tunai"""
+    transaction: TransactionResponse
+    account: TransferAccountBalance
+
+
+class BatchRowResult(BaseModel):
+    """Hasil insert per row pada batch ingestion"""
+    index: int
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchInsertResponse(BaseModel):
+    """Response model untuk batch ingestion"""
+    total: int
+    inserted: int
+    failed: int
+    results: List[BatchRowResult]
+
+
 # ===== API Endpoints =====
 
 @router.post("", response_model=TransactionResponse, status_code=201)
@@ -69,44 +130,304 @@ def insert_transaction(transaction: TransactionCreate, db: Session = Depends(get
         Transaction object yang baru dibuat
     """
     transaction_data = transaction.dict()
-    result = transaction_service.create_transaction(db, transaction_data)
+    result = run_write(db, lambda session: transaction_service.create_transaction(session, transaction_data))
+    return result
+
+
+async def _iter_batch_records(request: Request):
+    """
+    Iterasi record dari body batch request
+    Mendukung JSON array atau NDJSON (Content-Type: application/x-ndjson),
+    NDJSON dibaca secara streaming per baris
+    
+    Yields:
+        Tuple (index, record) dimana record adalah dict atau Exception jika
+        baris tidak bisa di-parse
+    """
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, _parse_ndjson_line(line)
+                    index += 1
+        if buffer.strip():
+            yield index, _parse_ndjson_line(buffer)
+        return
+    
+    try:
+        records = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body harus berupa JSON array atau NDJSON")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Body harus berupa JSON array atau NDJSON")
+    for index, record in enumerate(records):
+        yield index, record
+
+
+def _parse_ndjson_line(line: bytes):
+    """Parse satu baris NDJSON, kembalikan Exception jika tidak valid"""
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return exc
+
+
+def _validation_error_message(exc: ValidationError) -> str:
+    """Ringkas ValidationError menjadi satu baris "field: pesan; field: pesan" per row batch"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _write_batch_chunk(db: Session, chunk: List[tuple]) -> List[dict]:
+    """Insert satu chunk batch lewat run_write (single writer jika aktif)"""
+    return run_write(db, lambda session: transaction_service.create_transactions_batch(session, chunk))
+
+
+@router.post("/batch", response_model=BatchInsertResponse, status_code=201)
+async def insert_transactions_batch(request: Request,
+                                    chunk_size: int = Query(BATCH_CHUNK_SIZE, ge=1, le=50000),
+                                    db: Session = Depends(get_db)):
+    """
+    Insert banyak transaction sekaligus (settlement / migrasi)
+    Record divalidasi per row lalu di-insert dengan bulk INSERT per chunk
+    (satu commit per chunk)
+    
+    Endpoint: POST /service/transaction/batch?chunk_size=1000
+    
+    Request Body (JSON array atau NDJSON, satu TransactionCreate per baris):
+    [
+        {"m_customer_id": 1, "transaction_type": "DP", "transaction_amount": 100000,
+         "to_account_number": "123456", "status": "SUCCESS"},
+        ...
+    ]
+    
+    Returns:
+        Ringkasan jumlah row berhasil/gagal dan id/error per row (urut index)
+    """
+    results = []
+    chunk = []
+    
+    async for index, record in _iter_batch_records(request):
+        if isinstance(record, Exception):
+            results.append({"index": index, "id": None, "error": f"JSON tidak valid: {record}"})
+            continue
+        if not isinstance(record, dict):
+            results.append({"index": index, "id": None, "error": "Record harus berupa JSON object"})
+            continue
+        try:
+            transaction = TransactionCreate(**record)
+        except ValidationError as exc:
+            results.append({"index": index, "id": None, "error": _validation_error_message(exc)})
+            continue
+        
+        chunk.append((index, transaction.dict()))
+        if len(chunk) >= chunk_size:
+            results.extend(await run_in_threadpool(_write_batch_chunk, db, chunk))
+            chunk = []
+    
+    if chunk:
+        results.extend(await run_in_threadpool(_write_batch_chunk, db, chunk))
+    
+    results.sort(key=lambda r: r["index"])
+    failed = sum(1 for r in results if r["error"])
+    return {
+        "total": len(results),
+        "inserted": len(results) - failed,
+        "failed": failed,
+        "results": results
+    }
+
+
+@router.post("/transfer", response_model=TransferResponse, status_code=201)
+def transfer(transfer_request: TransferRequest, db: Session = Depends(get_db)):
+    """
+    Transfer antar rekening secara atomik
+    Lock kedua rekening, cek saldo, debit, credit dan insert transaction
+    dalam satu DB transaction (satu round trip dari middleware)
+    
+    Endpoint: POST /service/transaction/transfer
+    
+    Request Body:
+    {
+        "m_customer_id": 1,
+        "from_account_number": "123456",
+        "to_account_number": "987654",
+        "amount": 100000,
+        "description": "Transfer sesama bank"
+    }
+    
+    Returns:
+        Transaction yang dibuat beserta saldo terbaru kedua rekening
+    """
+    result = run_write(db, lambda session: transfer_service.transfer(
+        session,
+        transfer_request.m_customer_id,
+        transfer_request.from_account_number,
+        transfer_request.to_account_number,
+        transfer_request.amount,
+        transfer_request.description
+    ))
     return result
 
 
+@router.post("/withdraw", response_model=CashTransactionResponse, status_code=201)
+def withdraw(cash_request: CashTransactionRequest, db: Session = Depends(get_db)):
+    """
+    Tarik tunai: debit saldo + insert transaction WD dalam satu commit
+    (menggantikan panggilan terpisah /account/{n}/debit lalu POST /transaction)
+    
+    Endpoint: POST /service/transaction/withdraw
+    
+    Request Body:
+    {
+        "m_customer_id": 1,
+        "account_number": "123456",
+        "amount": 100000
+    }
+    
+    Returns:
+        Transaction yang dibuat beserta saldo terbaru rekening
+    """
+    return run_write(db, lambda session: transfer_service.withdraw(
+        session,
+        cash_request.m_customer_id,
+        cash_request.account_number,
+        cash_request.amount,
+        cash_request.description or "Tarik Tunai"
+    ))
+
+
+@router.post("/deposit", response_model=CashTransactionResponse, status_code=201)
+def deposit(cash_request: CashTransactionRequest, db: Session = Depends(get_db)):
+    """
+    Setor tunai: credit saldo + insert transaction DP dalam satu commit
+    
+    Endpoint: POST /service/transaction/deposit
+    
+    Request Body:
+    {
+        "m_customer_id": 1,
+        "account_number": "123456",
+        "amount": 100000
+    }
+    
+    Returns:
+        Transaction yang dibuat beserta saldo terbaru rekening
+    """
+    return run_write(db, lambda session: transfer_service.deposit(
+        session,
+        cash_request.m_customer_id,
+        cash_request.account_number,
+        cash_request.amount,
+        cash_request.description or "Setor Tunai"
+    ))
+
+
 @router.get("/customer/{customer_id}", response_model=List[TransactionResponse])
-def get_transactions_by_customer(customer_id: int, skip: int = 0, limit: int = 100, 
-                                 db: Session = Depends(get_db)):
+def get_transactions_by_customer(customer_id: int, skip: int = 0,
+                                 limit: int = 100, cursor: Optional[str] = None,
+                                 expand: Optional[str] = None,
+                                 db: Session = Depends(get_read_db)):
     """
     Get semua transaction milik customer
     Digunakan untuk riwayat transaksi
     
     Endpoint: GET /service/transaction/customer/{customer_id}?skip=0&limit=100
+              GET /service/transaction/customer/{customer_id}?limit=100&cursor=...
+              GET /service/transaction/customer/{customer_id}?expand=counterparty
+    
+    Halaman berikutnya diambil dengan cursor dari header X-Next-Cursor
+    (keyset pagination, latency tidak bergantung kedalaman halaman)
+    
+    expand=counterparty menambahkan from_account_name dan to_account_name
+    (di-join di query yang sama, tanpa lookup per row)
+    
+    Row di-encode langsung ke JSON (tanpa validasi ulang response_model);
+    response_model tetap dipakai untuk dokumentasi OpenAPI
     
     Returns:
         List of transaction objects (sorted by date desc)
     """
-    result = transaction_service.get_transactions_by_customer(db, customer_id, skip, limit)
-    return result
+    content, next_cursor = transaction_service.get_transaction_page_by_customer(
+        db, customer_id, skip, limit, cursor, transaction_service.parse_expand(expand)
+    )
+    return _page_response(content, next_cursor)
 
 
 @router.get("/account/{account_number}", response_model=List[TransactionResponse])
-def get_transactions_by_account(account_number: str, skip: int = 0, limit: int = 100,
-                                db: Session = Depends(get_db)):
+def get_transactions_by_account(account_number: str, skip: int = 0,
+                                limit: int = 100, cursor: Optional[str] = None,
+                                expand: Optional[str] = None,
+                                db: Session = Depends(get_read_db)):
     """
     Get semua transaction dari/ke account tertentu
     Digunakan untuk mutasi rekening
     
     Endpoint: GET /service/transaction/account/{account_number}?skip=0&limit=100
+              GET /service/transaction/account/{account_number}?limit=100&cursor=...
+              GET /service/transaction/account/{account_number}?expand=counterparty
+    
+    Halaman berikutnya diambil dengan cursor dari header X-Next-Cursor
     
     Returns:
         List of transaction objects (sorted by date desc)
     """
-    result = transaction_service.get_transactions_by_account(db, account_number, skip, limit)
-    return result
+    content, next_cursor = transaction_service.get_transaction_page_by_account(
+        db, account_number, skip, limit, cursor, transaction_service.parse_expand(expand)
+    )
+    return _page_response(content, next_cursor)
+
+
+def _page_response(content: bytes, next_cursor: Optional[str]) -> JSONBytesResponse:
+    """Response halaman riwayat (JSON bytes) + header X-Next-Cursor jika masih ada halaman berikutnya"""
+    response = JSONBytesResponse(content)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/account/{account_number}/export")
+def export_transactions_by_account(account_number: str, request: Request,
+                                   format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+                                   start: Optional[str] = None, end: Optional[str] = None):
+    """
+    Export mutasi rekening secara streaming (untuk rekening koran)
+    Row di-stream per batch sehingga memory datar dan byte pertama
+    langsung terkirim berapapun jumlah transaksi. Dibaca dengan session
+    read-only (read replica jika ada; X-Read-Consistency: primary untuk primary)
+    
+    Endpoint: GET /service/transaction/account/{account_number}/export?format=ndjson&start=2025-01-01T00:00:00&end=2025-12-31T23:59:59
+    
+    Returns:
+        NDJSON (satu transaction per baris) atau CSV dengan header
+    """
+    try:
+        start_dt = datetime.fromisoformat(start) if start else None
+        end_dt = datetime.fromisoformat(end) if end else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Format tanggal tidak valid (gunakan ISO format)")
+    
+    primary = request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary"
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"mutasi_{account_number}.{format}"
+    return StreamingResponse(
+        transaction_service.export_transactions_by_account(
+            lambda: open_read_session(primary), account_number, format, start_dt, end_dt
+        ),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
-def get_transaction_by_id(transaction_id: int, db: Session = Depends(get_db)):
+def get_transaction_by_id(transaction_id: int, db: Session = Depends(get_read_db)):
     """
     Get transaction berdasarkan ID
     
@@ -121,7 +442,7 @@ def get_transaction_by_id(transaction_id: int, db: Session = Depends(get_db)):
 
 @router.get("/customer/{customer_id}/by-date")
 def get_transactions_by_date_range(customer_id: int, start_date: str, end_date: str,
-                                   db: Session = Depends(get_db)):
+                                   db: Session = Depends(get_read_db)):
     """
     Get transactions dalam rentang tanggal
     
@@ -135,7 +456,7 @@ def get_transactions_by_date_range(customer_id: int, start_date: str, end_date:
 
 
 @router.get("/customer/{customer_id}/by-type/{transaction_type}")
-def get_transactions_by_type(customer_id: int, transaction_type: str, db: Session = Depends(get_db)):
+def get_transactions_by_type(customer_id: int, transaction_type: str, db: Session = Depends(get_read_db)):
     """
     Get transactions berdasarkan tipe
     
@@ -149,7 +470,7 @@ def get_transactions_by_type(customer_id: int, transaction_type: str, db: Sessio
 
 
 @router.get("/customer/{customer_id}/by-status/{status}")
-def get_transactions_by_status(customer_id: int, status: str, db: Session = Depends(get_db)):
+def get_transactions_by_status(customer_id: int, status: str, db: Session = Depends(get_read_db)):
     """
     Get transactions berdasarkan status
     
@@ -163,7 +484,7 @@ def get_transactions_by_status(customer_id: int, status: str, db: Session = Depe
 
 
 @router.get("/customer/{customer_id}/recent")
-def get_recent_transactions(customer_id: int, days: int = 30, db: Session = Depends(get_db)):
+def get_recent_transactions(customer_id: int, days: int = 30, db: Session = Depends(get_read_db)):
     """
     Get transactions N hari terakhir
     
@@ -193,5 +514,7 @@ def update_transaction_status(transaction_id: int, status_update: TransactionSta
     Returns:
         Transaction object yang telah diupdate
     """
-    result = transaction_service.update_transaction_status(db, transaction_id, status_update.status)
+    result = run_write(db, lambda session: transaction_service.update_transaction_status(
+        session, transaction_id, status_update.status
+    ))
     return result
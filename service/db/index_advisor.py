@@ -0,0 +1,173 @@
+"""
+Index Advisor - jalankan EXPLAIN untuk setiap query read repository dan
+laporkan apakah query tersebut index-backed (tanpa full table scan / sort)
+
+Jalankan: python -m db.index_advisor [--json]
+
+Query direkam dengan menjalankan method repository asli (dengan argumen
+contoh) lalu statement yang dikirim ke database di-EXPLAIN ulang.
+Catatan: pada tabel kecil PostgreSQL bisa memilih Seq Scan walaupun index
+tersedia; jalankan pada database dengan volume data realistis
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from typing import Callable, List, Tuple
+from datetime import datetime, timedelta
+import json
+import sys
+from .database import engine as default_engine, SessionLocal, init_db
+from repository.customer_repository import CustomerRepository
+from repository.account_repository import AccountRepository
+from repository.transaction_repository import TransactionRepository
+
+NOW = datetime.now()
+
+# (nama query, fungsi yang menjalankan method repository dengan argumen contoh)
+REPOSITORY_QUERIES: List[Tuple[str, Callable]] = [
+    ("CustomerRepository.get_by_id", lambda db: CustomerRepository.get_by_id(db, 1)),
+    ("CustomerRepository.get_by_username", lambda db: CustomerRepository.get_by_username(db, "budi01")),
+    ("CustomerRepository.get_by_email", lambda db: CustomerRepository.get_by_email(db, "budi@gmail.com")),
+    ("CustomerRepository.get_by_cif", lambda db: CustomerRepository.get_by_cif(db, "9001")),
+    ("CustomerRepository.get_row_by_username",
+     lambda db: CustomerRepository.get_row_by_username(db, "budi01")),
+    ("CustomerRepository.get_lock_status", lambda db: CustomerRepository.get_lock_status(db, 1)),
+    ("CustomerRepository.get_existing_unique_values",
+     lambda db: CustomerRepository.get_existing_unique_values(db, ["budi01"], ["budi@gmail.com"], ["9001"])),
+    ("CustomerRepository.get_ids_by_cif_numbers",
+     lambda db: CustomerRepository.get_ids_by_cif_numbers(db, ["9001", "9002"])),
+    ("CustomerRepository.get_with_active_accounts",
+     lambda db: CustomerRepository.get_with_active_accounts(db, 1)),
+    ("AccountRepository.get_by_id", lambda db: AccountRepository.get_by_id(db, 1)),
+    ("AccountRepository.get_by_account_number",
+     lambda db: AccountRepository.get_by_account_number(db, "1234567890")),
+    ("AccountRepository.get_by_customer_id", lambda db: AccountRepository.get_by_customer_id(db, 1)),
+    ("AccountRepository.get_active_accounts_by_customer",
+     lambda db: AccountRepository.get_active_accounts_by_customer(db, 1)),
+    ("AccountRepository.get_row_by_account_number",
+     lambda db: AccountRepository.get_row_by_account_number(db, "1234567890")),
+    ("AccountRepository.get_rows_by_customer_id",
+     lambda db: AccountRepository.get_rows_by_customer_id(db, 1, True)),
+    ("AccountRepository.get_rows_by_account_numbers",
+     lambda db: AccountRepository.get_rows_by_account_numbers(db, ["1234567890", "9876543210"])),
+    ("AccountRepository.get_existing_account_numbers",
+     lambda db: AccountRepository.get_existing_account_numbers(db, ["1234567890", "9876543210"])),
+    ("AccountRepository.get_balance", lambda db: AccountRepository.get_balance(db, "1234567890")),
+    ("TransactionRepository.get_by_id", lambda db: TransactionRepository.get_by_id(db, 1)),
+    ("TransactionRepository.get_by_customer_id",
+     lambda db: TransactionRepository.get_by_customer_id(db, 1, 0, 100)),
+    ("TransactionRepository.get_by_customer_id (cursor)",
+     lambda db: TransactionRepository.get_by_customer_id(db, 1, 0, 100, (NOW, 1000))),
+    ("TransactionRepository.get_rows_by_customer_id (counterparty)",
+     lambda db: TransactionRepository.get_rows_by_customer_id(db, 1, 0, 100, expand_counterparty=True)),
+    ("TransactionRepository.get_by_account_number",
+     lambda db: TransactionRepository.get_by_account_number(db, "1234567890", 0, 100)),
+    ("TransactionRepository.get_by_date_range",
+     lambda db: TransactionRepository.get_by_date_range(db, 1, NOW - timedelta(days=30), NOW)),
+    ("TransactionRepository.get_by_type", lambda db: TransactionRepository.get_by_type(db, 1, "TR")),
+    ("TransactionRepository.get_by_status",
+     lambda db: TransactionRepository.get_by_status(db, 1, "SUCCESS")),
+    ("TransactionRepository.get_recent_transactions",
+     lambda db: TransactionRepository.get_recent_transactions(db, 1, 30)),
+    ("TransactionRepository.stream_by_account_number",
+     lambda db: list(TransactionRepository.stream_by_account_number(db, "1234567890"))),
+]
+
+
+def capture_statements(engine: Engine, run: Callable) -> List[Tuple[str, object]]:
+    """
+    Jalankan query repository dan rekam statement SQL + parameter yang dikirim
+
+    Args:
+        engine: SQLAlchemy engine
+        run: Fungsi yang menerima session dan menjalankan query
+
+    Returns:
+        List of (statement, parameters)
+    """
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    db = SessionLocal(bind=engine)
+    try:
+        run(db)
+    finally:
+        db.rollback()
+        db.close()
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def explain(engine: Engine, statement: str, parameters) -> List[str]:
+    """
+    Jalankan EXPLAIN untuk sebuah statement
+
+    Returns:
+        List baris query plan
+    """
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            return [row[-1] for row in rows]
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+        return [row[0] for row in rows]
+
+
+def analyze_plan(dialect_name: str, plan: List[str]) -> dict:
+    """
+    Tentukan apakah plan index-backed
+
+    Returns:
+        Dict dengan keys: index_backed, full_scan, extra_sort
+    """
+    if dialect_name == "sqlite":
+        full_scan = any(
+            line.startswith("SCAN") and "INDEX" not in line for line in plan
+        )
+        extra_sort = any("USE TEMP B-TREE" in line for line in plan)
+    else:
+        full_scan = any("Seq Scan" in line for line in plan)
+        extra_sort = any(line.strip().lstrip("-> ").startswith("Sort") for line in plan)
+    return {
+        "index_backed": not full_scan and not extra_sort,
+        "full_scan": full_scan,
+        "extra_sort": extra_sort,
+    }
+
+
+def run_advisor(engine: Engine = default_engine) -> List[dict]:
+    """
+    Jalankan EXPLAIN untuk semua query repository
+
+    Returns:
+        List hasil per query: name, statement, plan, index_backed, full_scan, extra_sort
+    """
+    report = []
+    for name, run in REPOSITORY_QUERIES:
+        for statement, parameters in capture_statements(engine, run):
+            plan = explain(engine, statement, parameters)
+            result = {"name": name, "statement": " ".join(statement.split()), "plan": plan}
+            result.update(analyze_plan(engine.dialect.name, plan))
+            report.append(result)
+    return report
+
+
+if __name__ == "__main__":
+    init_db()
+    report = run_advisor()
+    if "--json" in sys.argv:
+        print(json.dumps(report, indent=2))
+    else:
+        for result in report:
+            status = "OK  " if result["index_backed"] else "WARN"
+            notes = []
+            if result["full_scan"]:
+                notes.append("full scan")
+            if result["extra_sort"]:
+                notes.append("sort")
+            print(f"[{status}] {result['name']}" + (f" ({', '.join(notes)})" if notes else ""))
+            for line in result["plan"]:
+                print(f"         {line}")
+    sys.exit(0 if all(r["index_backed"] for r in report) else 1)
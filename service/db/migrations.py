@@ -0,0 +1,97 @@
+"""
+Schema migrations - perubahan schema untuk database yang sudah ada
+create_all hanya membuat tabel/index untuk tabel baru, jadi index atau
+perubahan lain pada tabel yang sudah ada ditambahkan lewat migration di sini
+
+Jalankan manual: python -m db.migrations
+"""
+from sqlalchemy import MetaData, Table, Column, String, DateTime, select, insert
+from sqlalchemy.engine import Engine, Connection
+from typing import Callable, List, Tuple
+from datetime import datetime
+from .database import engine as default_engine
+from .models import Transaction
+
+# Tabel pencatat migration yang sudah dijalankan (terpisah dari Base.metadata)
+migration_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("id", String(100), primary_key=True),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+def _create_indexes(table, *index_names: str) -> Callable[[Connection], None]:
+    """
+    Buat migration step yang membuat index (didefinisikan di models) jika belum ada
+
+    Args:
+        table: SQLAlchemy Table pemilik index
+        index_names: Nama index pada table.indexes
+
+    Returns:
+        Fungsi migration yang menerima Connection
+    """
+    def migrate(conn: Connection) -> None:
+        indexes = {index.name: index for index in table.indexes}
+        for name in index_names:
+            indexes[name].create(bind=conn, checkfirst=True)
+    return migrate
+
+
+# Urutan migration; id tidak boleh diubah setelah dirilis
+MIGRATIONS: List[Tuple[str, str, Callable[[Connection], None]]] = [
+    (
+        "0001_t_transaction_customer_date_id",
+        "Index keyset pagination (m_customer_id, transaction_date, id)",
+        _create_indexes(Transaction.__table__, "ix_t_transaction_customer_date_id"),
+    ),
+    (
+        "0002_t_transaction_composite_indexes",
+        "Composite index customer+status/type+date dan account+date",
+        _create_indexes(
+            Transaction.__table__,
+            "ix_t_transaction_customer_status_date",
+            "ix_t_transaction_customer_type_date",
+            "ix_t_transaction_from_account_date",
+            "ix_t_transaction_to_account_date",
+        ),
+    ),
+]
+
+
+def run_migrations(engine: Engine = default_engine) -> List[str]:
+    """
+    Jalankan semua migration yang belum pernah dijalankan
+    Setiap migration dijalankan dalam transaction sendiri
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        List id migration yang baru dijalankan
+    """
+    migration_metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        applied = set(conn.execute(select(schema_migrations.c.id)).scalars())
+
+    newly_applied = []
+    for migration_id, description, migrate in MIGRATIONS:
+        if migration_id in applied:
+            continue
+        with engine.begin() as conn:
+            migrate(conn)
+            conn.execute(insert(schema_migrations).values(
+                id=migration_id, description=description, applied_at=datetime.now()
+            ))
+        newly_applied.append(migration_id)
+    return newly_applied
+
+
+if __name__ == "__main__":
+    from .database import Base
+    Base.metadata.create_all(bind=default_engine)
+    applied = run_migrations()
+    print(f"Applied migrations: {applied if applied else 'none (schema up to date)'}")
@@ -1,7 +1,7 @@
 """
 SQLAlchemy ORM Models untuk semua tabel database
 """
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Boolean, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -10,6 +10,8 @@ from .database import Base
 class Customer(Base):
     """Model untuk tabel m_customer"""
     __tablename__ = "m_customer"
+    # Nilai server default (id, created_at, ...) diambil lewat RETURNING saat INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     customer_name = Column(String(100), nullable=False)
@@ -32,6 +34,8 @@ class Customer(Base):
 class PortfolioAccount(Base):
     """Model untuk tabel m_portfolio_account"""
     __tablename__ = "m_portfolio_account"
+    # Nilai server default (id, created_at, ...) diambil lewat RETURNING saat INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     m_customer_id = Column(Integer, ForeignKey("m_customer.id"), nullable=False, index=True)
@@ -52,6 +56,8 @@ class PortfolioAccount(Base):
 class Transaction(Base):
     """Model untuk tabel t_transaction"""
     __tablename__ = "t_transaction"
+    # Nilai server default (id, created_at, ...) diambil lewat RETURNING saat INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     m_customer_id = Column(Integer, ForeignKey("m_customer.id"), nullable=False, index=True)
@@ -66,3 +72,14 @@ class Transaction(Base):
 
     # Relationship
     customer = relationship("Customer", back_populates="transactions")
+
+    __table_args__ = (
+        # Keyset pagination riwayat transaksi per customer (date desc, id desc)
+        Index("ix_t_transaction_customer_date_id", "m_customer_id", "transaction_date", "id"),
+        # Filter per customer + status/tipe, urut tanggal
+        Index("ix_t_transaction_customer_status_date", "m_customer_id", "status", "transaction_date"),
+        Index("ix_t_transaction_customer_type_date", "m_customer_id", "transaction_type", "transaction_date"),
+        # Mutasi rekening (dari/ke), urut tanggal
+        Index("ix_t_transaction_from_account_date", "from_account_number", "transaction_date"),
+        Index("ix_t_transaction_to_account_date", "to_account_number", "transaction_date"),
+    )
@@ -0,0 +1,63 @@
+"""
+Query logging - slow query log tersampel via SQLAlchemy event hooks
+Menggantikan echo=True (yang mencetak setiap statement) agar diagnostik query
+bisa tetap aktif di production dengan overhead kecil
+
+Environment:
+    SQL_ECHO: true untuk echo setiap statement (hanya untuk development)
+    QUERY_LOG_ENABLED: true untuk mengaktifkan slow query log (default false)
+    QUERY_LOG_SLOW_MS: threshold durasi query dalam ms (default 100)
+    QUERY_LOG_SAMPLE_RATE: porsi slow query yang di-log, 0.0 - 1.0 (default 1.0)
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import hashlib
+import os
+import random
+import time
+from utils.logger import get_logger
+
+logger = get_logger("db.query")
+
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+QUERY_LOG_ENABLED = os.getenv("QUERY_LOG_ENABLED", "false").lower() == "true"
+QUERY_LOG_SLOW_MS = float(os.getenv("QUERY_LOG_SLOW_MS", "100"))
+QUERY_LOG_SAMPLE_RATE = float(os.getenv("QUERY_LOG_SAMPLE_RATE", "1.0"))
+
+
+def fingerprint(value) -> str:
+    """Hash pendek untuk statement/parameter (nilai parameter tidak ikut di-log)"""
+    return hashlib.sha1(repr(value).encode()).hexdigest()[:12]
+
+
+def install_query_logging(engine: Engine, slow_ms: float = QUERY_LOG_SLOW_MS,
+                          sample_rate: float = QUERY_LOG_SAMPLE_RATE) -> None:
+    """
+    Pasang event hook slow query log pada engine
+    Untuk AsyncEngine, pasang pada engine.sync_engine
+
+    Args:
+        engine: SQLAlchemy (sync) engine
+        slow_ms: Threshold durasi query dalam ms
+        sample_rate: Porsi slow query yang di-log
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = getattr(context, "_query_started_at", None)
+        if started_at is None:
+            return
+        duration_ms = (time.perf_counter() - started_at) * 1000
+        if duration_ms < slow_ms or random.random() >= sample_rate:
+            return
+        logger.warning("slow query", extra={
+            "statement": " ".join(statement.split()),
+            "statement_fingerprint": fingerprint(statement),
+            "params_fingerprint": fingerprint(parameters),
+            "executemany": executemany,
+            "duration_ms": round(duration_ms, 3),
+            "row_count": cursor.rowcount,
+        })
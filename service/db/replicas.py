@@ -0,0 +1,105 @@
+"""
+Read replica routing - endpoint read-only dibaca dari replica secara
+round-robin, write dan read-your-writes tetap ke primary
+
+Replica yang gagal (connect error / koneksi putus) dikeluarkan dari rotasi
+selama REPLICA_EJECT_SECONDS lalu dicoba lagi otomatis. Jika tidak ada
+replica sehat, read jatuh ke primary
+
+Environment:
+    READ_REPLICA_URLS: URL replica dipisah koma (kosong = semua ke primary)
+    REPLICA_EJECT_SECONDS: lama replica dikeluarkan setelah gagal (default 30)
+"""
+from itertools import count
+from typing import Callable, List, Optional
+from sqlalchemy.engine import Engine
+import os
+import threading
+import time
+from utils.logger import get_logger
+
+logger = get_logger("db.replicas")
+
+READ_REPLICA_URLS = [url.strip() for url in os.getenv("READ_REPLICA_URLS", "").split(",") if url.strip()]
+REPLICA_EJECT_SECONDS = float(os.getenv("REPLICA_EJECT_SECONDS", "30"))
+
+# Header request untuk memaksa read dari primary
+READ_CONSISTENCY_HEADER = "x-read-consistency"
+# Key di Session.info yang menandai session terikat ke replica
+REPLICA_SESSION_KEY = "read_replica"
+
+
+def is_replica_session(db) -> bool:
+    """Cek apakah session membaca dari read replica (data bisa tertinggal)"""
+    return db.info.get(REPLICA_SESSION_KEY, False)
+
+
+class ReplicaRouter:
+    """Round-robin antar replica dengan ejection berbasis kegagalan"""
+
+    def __init__(self, engines: List[Engine], eject_seconds: float = REPLICA_EJECT_SECONDS):
+        self.engines = list(engines)
+        self.eject_seconds = eject_seconds
+        self._ejected_until = {}
+        self._counter = count()
+        self._lock = threading.Lock()
+
+    def candidates(self) -> List[Engine]:
+        """
+        Urutan replica yang dicoba untuk satu request
+        Dimulai dari replica giliran berikutnya (round-robin), replica yang
+        sedang di-eject dilewati
+
+        Returns:
+            List engine replica sehat
+        """
+        start = next(self._counter)
+        now = time.monotonic()
+        total = len(self.engines)
+        ordered = [self.engines[(start + offset) % total] for offset in range(total)]
+        return [replica for replica in ordered if self._ejected_until.get(replica, 0) <= now]
+
+    def eject(self, replica: Engine, error: Optional[Exception] = None) -> None:
+        """
+        Keluarkan replica dari rotasi selama eject_seconds
+
+        Args:
+            replica: Engine replica yang gagal
+            error: Exception penyebab (untuk log)
+        """
+        if replica not in self.engines:
+            return
+        with self._lock:
+            self._ejected_until[replica] = time.monotonic() + self.eject_seconds
+        logger.warning("read replica ejected", extra={
+            "replica": replica.url.render_as_string(hide_password=True),
+            "eject_seconds": self.eject_seconds,
+            "error": str(error) if error else None,
+        })
+
+    def status(self) -> List[dict]:
+        """Status setiap replica (untuk /health)"""
+        now = time.monotonic()
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "healthy": self._ejected_until.get(replica, 0) <= now,
+            }
+            for replica in self.engines
+        ]
+
+
+def build_replica_router(urls: List[str], engine_factory: Callable[[str], Engine]) -> Optional[ReplicaRouter]:
+    """
+    Buat router dari daftar URL replica
+
+    Args:
+        urls: URL replica
+        engine_factory: Fungsi pembuat engine (sama dengan primary)
+
+    Returns:
+        ReplicaRouter, atau None jika tidak ada replica
+    """
+    if not urls:
+        return None
+    return ReplicaRouter([engine_factory(url) for url in urls])
@@ -0,0 +1,60 @@
+"""
+SQLite performance profile - PRAGMA untuk deployment SQLite (branch edge)
+Opt-in lewat SQLITE_PERFORMANCE_PROFILE=true. Diterapkan di setiap koneksi
+baru (event "connect") pada engine sync dan async
+
+Environment:
+    SQLITE_PERFORMANCE_PROFILE: true untuk mengaktifkan profile (default false)
+    SQLITE_SYNCHRONOUS: NORMAL (default) / FULL / OFF
+    SQLITE_MMAP_SIZE: ukuran memory-mapped I/O dalam byte (default 256 MB)
+    SQLITE_CACHE_SIZE: page cache; negatif = KiB (default -65536 = 64 MB)
+    SQLITE_BUSY_TIMEOUT_MS: tunggu lock sebelum "database is locked" (default 5000)
+"""
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import os
+
+SQLITE_PERFORMANCE_PROFILE = os.getenv("SQLITE_PERFORMANCE_PROFILE", "false").lower() == "true"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+
+def sqlite_pragmas() -> list:
+    """
+    Daftar PRAGMA profile performa
+    WAL: reader tidak memblok writer (dan sebaliknya); synchronous=NORMAL
+    aman di WAL (fsync saat checkpoint, bukan setiap commit)
+
+    Returns:
+        List of statement PRAGMA
+    """
+    return [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={SQLITE_CACHE_SIZE}",
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def install_sqlite_pragmas(engine: Engine) -> None:
+    """
+    Pasang PRAGMA profile performa pada setiap koneksi baru engine SQLite
+    Untuk AsyncEngine, pasang pada engine.sync_engine
+
+    Args:
+        engine: SQLAlchemy (sync) engine
+    """
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(engine, "connect")
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
@@ -0,0 +1,134 @@
+"""
+Unit of Work - gabungkan beberapa operasi repository dalam satu commit
+Secara default setiap method write repository commit sendiri (satu
+fsync/WAL flush per operasi). Di dalam unit_of_work(), repository hanya
+flush dan commit dilakukan sekali saat blok selesai; rollback jika terjadi
+exception
+
+Contoh di service layer:
+    with unit_of_work(db):
+        account = self.account_repository.debit(db, account_number, amount)
+        transaction = self.transaction_repository.create(db, data)
+"""
+from contextlib import contextmanager
+from typing import Callable
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+
+# Key di Session.info yang menandai unit of work sedang aktif
+UNIT_OF_WORK_KEY = "unit_of_work"
+# Key di Session.info untuk callback yang dijalankan setelah commit
+AFTER_COMMIT_KEY = "after_commit"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    """Cek apakah session sedang berada di dalam unit of work"""
+    return db.info.get(UNIT_OF_WORK_KEY, False)
+
+
+def commit_or_flush(db: Session):
+    """
+    Dipanggil repository sebagai pengganti db.commit()
+    Di luar unit of work: commit (perilaku default); di dalam: hanya flush
+    agar ID/RETURNING tersedia, commit dilakukan oleh unit of work
+
+    Args:
+        db: Database session
+    """
+    if in_unit_of_work(db):
+        db.flush()
+    else:
+        db.commit()
+
+
+def after_commit(db: Session, callback: Callable[[], None]):
+    """
+    Jalankan callback setelah data ter-commit (mis. invalidasi cache)
+    Di luar unit of work callback langsung dijalankan (repository sudah
+    commit); di dalam unit of work ditunda sampai commit, dibuang jika rollback
+
+    Args:
+        db: Database session
+        callback: Fungsi tanpa argumen
+    """
+    if in_unit_of_work(db):
+        db.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+    else:
+        callback()
+
+
+def run_after_commit(db: Session):
+    """Jalankan dan kosongkan callback after_commit yang tertunda"""
+    for callback in db.info.pop(AFTER_COMMIT_KEY, []):
+        callback()
+
+
+@contextmanager
+def unit_of_work(db: Session):
+    """
+    Context manager unit of work
+    Nested unit_of_work() ikut ke unit terluar (commit hanya sekali di akhir)
+
+    Args:
+        db: Database session
+
+    Yields:
+        Session yang sama
+    """
+    if in_unit_of_work(db):
+        yield db
+        return
+
+    db.info[UNIT_OF_WORK_KEY] = True
+    try:
+        yield db
+        db.commit()
+    except BaseException:
+        db.rollback()
+        db.info.pop(AFTER_COMMIT_KEY, None)
+        raise
+    finally:
+        db.info.pop(UNIT_OF_WORK_KEY, None)
+    run_after_commit(db)
+
+
+@contextmanager
+def savepoint(db: Session):
+    """
+    Batas rollback untuk write yang boleh gagal lalu dicoba ulang (mis. bulk
+    INSERT yang di-retry per row). Di dalam unit of work (termasuk session
+    single writer) memakai SAVEPOINT sehingga hanya write ini yang di-rollback;
+    di luar unit of work session di-rollback seperti biasa
+
+    Args:
+        db: Database session
+
+    Yields:
+        Session yang sama
+    """
+    if in_unit_of_work(db):
+        with db.begin_nested():
+            yield db
+        return
+
+    try:
+        yield db
+    except BaseException:
+        db.rollback()
+        raise
+
+
+def get_unit_of_work_db():
+    """
+    Dependency session dengan unit of work selama satu request
+    Semua write di endpoint di-commit sekali setelah handler selesai
+    (sebelum response dikirim), rollback jika handler raise exception
+    Digunakan di FastAPI dengan Depends()
+    """
+    db = SessionLocal()
+    try:
+        with unit_of_work(db):
+            yield db
+    finally:
+        db.close()
@@ -0,0 +1,233 @@
+"""
+Single writer SQLite - satu thread writer yang menjalankan write dari semua
+request secara berurutan dan meng-commit-nya per batch (group commit)
+
+SQLite hanya mengizinkan satu writer; write paralel dari threadpool saling
+menunggu lock dan bisa gagal "database is locked". Dengan writer tunggal,
+write request di-antrikan, setiap write dijalankan dalam SAVEPOINT sendiri
+(gagal = rollback write itu saja) lalu satu batch di-commit sekali. Request
+baru menerima hasil setelah batch-nya ter-commit
+
+Environment:
+    SQLITE_WRITER_ENABLED: default mengikuti SQLITE_PERFORMANCE_PROFILE
+    SQLITE_WRITER_MAX_BATCH: jumlah maksimal write per commit (default 256)
+    SQLITE_WRITER_MAX_DELAY_MS: tunggu write tambahan sebelum commit (default 0,
+                                hanya write yang sudah antri yang digabung)
+"""
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+import contextvars
+import os
+import queue
+import threading
+import time
+
+from .database import engine as default_engine, DATABASE_URL
+from .query_logging import SQL_ECHO, QUERY_LOG_ENABLED, install_query_logging
+from .sqlite_profile import SQLITE_PERFORMANCE_PROFILE, install_sqlite_pragmas
+from .unit_of_work import UNIT_OF_WORK_KEY, AFTER_COMMIT_KEY, run_after_commit
+from utils.logger import get_logger
+from utils.metrics import install_db_timing
+
+logger = get_logger("db.write_queue")
+
+SQLITE_WRITER_ENABLED = os.getenv(
+    "SQLITE_WRITER_ENABLED", str(SQLITE_PERFORMANCE_PROFILE)
+).lower() == "true"
+SQLITE_WRITER_MAX_BATCH = int(os.getenv("SQLITE_WRITER_MAX_BATCH", "256"))
+SQLITE_WRITER_MAX_DELAY_MS = float(os.getenv("SQLITE_WRITER_MAX_DELAY_MS", "0"))
+
+Job = Tuple[Callable[[Session], object], Future]
+
+
+def create_writer_engine(url: str) -> Engine:
+    """
+    Engine khusus writer: satu koneksi, transaction dibuka dengan
+    BEGIN IMMEDIATE (lock write diambil di awal, tanpa upgrade lock) dan
+    SAVEPOINT berfungsi (pysqlite tidak lagi mengelola BEGIN sendiri)
+
+    Args:
+        url: Database URL SQLite
+
+    Returns:
+        SQLAlchemy engine
+    """
+    writer_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        pool_size=1,
+        max_overflow=0,
+        echo=SQL_ECHO
+    )
+    install_sqlite_pragmas(writer_engine)
+    # Waktu eksekusi write tercatat ke DbTiming request asal (lihat submit)
+    install_db_timing(writer_engine)
+    if QUERY_LOG_ENABLED:
+        install_query_logging(writer_engine)
+
+    @event.listens_for(writer_engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(writer_engine, "begin")
+    def begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    return writer_engine
+
+
+class SQLiteWriter:
+    """Thread writer tunggal dengan group commit"""
+
+    def __init__(self, engine: Engine, max_batch: int = SQLITE_WRITER_MAX_BATCH,
+                 max_delay_ms: float = SQLITE_WRITER_MAX_DELAY_MS):
+        self.session_factory = sessionmaker(bind=engine, autoflush=True, expire_on_commit=False)
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000
+        self._queue: "queue.SimpleQueue[Optional[Job]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, work: Callable[[Session], object]) -> Future:
+        """
+        Antrikan write
+        Work dijalankan di context milik caller (contextvars.copy_context)
+        sehingga waktu DB-nya tercatat di metrics/Server-Timing request asal
+
+        Args:
+            work: Fungsi yang menerima Session writer; repository di dalamnya
+                  hanya flush (unit of work), commit dilakukan writer
+
+        Returns:
+            Future yang selesai setelah batch write ter-commit
+        """
+        future = Future()
+        context = contextvars.copy_context()
+        self._queue.put((lambda db: context.run(work, db), future))
+        return future
+
+    def run(self, work: Callable[[Session], object]):
+        """Antrikan write lalu tunggu hasilnya (exception work diteruskan ke caller)"""
+        return self.submit(work).result()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Selesaikan write yang sudah antri lalu hentikan thread writer"""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch, stopping = self._collect([job])
+            self._commit_batch(batch)
+            if stopping:
+                return
+
+    def _collect(self, batch: List[Job]) -> Tuple[List[Job], bool]:
+        """Ambil write yang sudah antri (dan yang datang dalam max_delay) ke batch"""
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    def _commit_batch(self, batch: List[Job]) -> None:
+        """Jalankan setiap write dalam SAVEPOINT lalu commit satu kali"""
+        db = self.session_factory()
+        db.info[UNIT_OF_WORK_KEY] = True
+        outcomes = []
+        try:
+            for work, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                callbacks = db.info.setdefault(AFTER_COMMIT_KEY, [])
+                pending = len(callbacks)
+                try:
+                    # Context manager juga me-rollback SAVEPOINT yang sudah
+                    # dinonaktifkan oleh flush yang gagal (IntegrityError)
+                    with db.begin_nested():
+                        result = work(db)
+                except Exception as exc:
+                    del callbacks[pending:]
+                    outcomes.append((future, None, exc))
+                else:
+                    outcomes.append((future, result, None))
+            db.commit()
+        except Exception as exc:
+            logger.error("sqlite writer batch commit failed", extra={"error": str(exc), "batch_size": len(batch)})
+            db.rollback()
+            db.info.pop(AFTER_COMMIT_KEY, None)
+            db.close()
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        run_after_commit(db)
+        db.close()
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+_writer: Optional[SQLiteWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_sqlite_writer() -> Optional[SQLiteWriter]:
+    """
+    Get instance writer (singleton per proses, dibuat saat pertama dipakai)
+
+    Returns:
+        SQLiteWriter, atau None jika writer tidak aktif / database bukan SQLite file
+    """
+    global _writer
+    if not SQLITE_WRITER_ENABLED or default_engine.dialect.name != "sqlite" \
+            or default_engine.url.database in (None, "", ":memory:"):
+        return None
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = SQLiteWriter(create_writer_engine(DATABASE_URL))
+    return _writer
+
+
+def stop_sqlite_writer() -> None:
+    """Hentikan writer (dipanggil saat shutdown)"""
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.stop()
+            _writer = None
+
+
+def run_write(db: Session, work: Callable[[Session], object]):
+    """
+    Jalankan write dari controller
+    Jika single writer aktif, write dijalankan oleh thread writer (group
+    commit); jika tidak, langsung dengan session request (perilaku default)
+
+    Args:
+        db: Session request
+        work: Fungsi yang menerima Session, mis. lambda s: service.debit(s, ...)
+
+    Returns:
+        Hasil work
+    """
+    writer = get_sqlite_writer()
+    if writer is None:
+        return work(db)
+    return writer.run(work)
@@ -7,9 +7,18 @@ Date: 2025-12-12
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from db.database import init_db
-from controllers import customer_controller, account_controller, transaction_controller
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+from db.database import init_db, engine, DATABASE_MODE, replica_router
+from db.write_queue import stop_sqlite_writer
+from utils.pin_hash import stop_pin_pool
+from utils.logger import setup_logging, get_logger
+from utils.metrics import REGISTRY, MetricsMiddleware, register_pool_gauges
+import time
+from controllers import customer_controller, account_controller, transaction_controller, onboarding_controller
+
+setup_logging()
+logger = get_logger("main")
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -32,10 +41,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Metrics: latency per route + gauge connection pool (GET /metrics)
+app.add_middleware(MetricsMiddleware)
+register_pool_gauges(engine)
+if replica_router is not None:
+    for replica in replica_router.engines:
+        register_pool_gauges(replica, replica.url.render_as_string(hide_password=True))
+
 # Include routers
+# Mode async: endpoint read utama (balance, account lookup, riwayat transaksi)
+# dilayani router async; didaftarkan lebih dulu agar menggantikan versi sync
+if DATABASE_MODE == "async":
+    from controllers import async_account_controller, async_transaction_controller
+    app.include_router(async_account_controller.router)
+    app.include_router(async_transaction_controller.router)
+
 app.include_router(customer_controller.router)
 app.include_router(account_controller.router)
 app.include_router(transaction_controller.router)
+app.include_router(onboarding_controller.router)
 
 
 @app.on_event("startup")
@@ -44,11 +68,20 @@ def on_startup():
     Event yang dijalankan saat aplikasi start
     Initialize database tables
     """
-    print("🚀 Starting Mobile Banking Service Layer...")
-    print("📦 Initializing database...")
+    logger.info("starting service layer", extra={"database_mode": DATABASE_MODE})
     init_db()
-    print("✅ Database initialized successfully!")
-    print("🌐 Service Layer ready to accept requests")
+    logger.info("database initialized, service layer ready")
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """
+    Event yang dijalankan saat aplikasi berhenti
+    Selesaikan write yang masih antri di single writer SQLite dan hentikan
+    process pool verifikasi PIN
+    """
+    stop_sqlite_writer()
+    stop_pin_pool()
 
 
 @app.get("/")
@@ -78,12 +111,41 @@ def health_check():
     """
     Health check endpoint
     Digunakan oleh middleware untuk cek service availability
+    Melakukan ping ke database (SELECT 1) dan melaporkan latency-nya
     """
-    return {
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as exc:
+        logger.error("health check database ping failed", extra={"error": str(exc)})
+        return JSONResponse(
+            status_code=503,
+            content={
+                "status": "unhealthy",
+                "service": "Mobile Banking Service Layer",
+                "database": "unreachable"
+            }
+        )
+    
+    result = {
         "status": "healthy",
         "service": "Mobile Banking Service Layer",
-        "database": "connected"
+        "database": "connected",
+        "database_latency_ms": round((time.perf_counter() - started) * 1000, 3)
     }
+    if replica_router is not None:
+        result["read_replicas"] = replica_router.status()
+    return result
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Metrics endpoint (format text Prometheus)
+    Latency request per route, latency method repository dan gauge connection pool
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.exception_handler(Exception)
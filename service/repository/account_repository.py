@@ -1,13 +1,25 @@
 """
 Account Repository - Data Access Layer untuk m_portfolio_account
 """
+from sqlalchemy import insert, update, select, Row
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from db.models import PortfolioAccount
 from decimal import Decimal
 from datetime import datetime
+from db.unit_of_work import commit_or_flush
+from repository.update_returning import update_returning
+from utils.metrics import instrument_repository
 
+# Kolom yang diambil query read-only (Row, tanpa ORM entity), sama dengan field AccountResponse
+ACCOUNT_ROW_FIELDS = (
+    "id", "m_customer_id", "account_number", "account_name", "account_type", "currency_code",
+    "clear_balance", "available_balance", "is_active", "created_at", "updated_at"
+)
+ACCOUNT_ROW_COLUMNS = [getattr(PortfolioAccount, field) for field in ACCOUNT_ROW_FIELDS]
 
+
+@instrument_repository
 class AccountRepository:
     """Repository untuk operasi database m_portfolio_account"""
 
@@ -27,10 +39,42 @@ class AccountRepository:
         """
         new_account = PortfolioAccount(**account_data)
         db.add(new_account)
-        db.commit()
-        db.refresh(new_account)
+        commit_or_flush(db)
         return new_account
 
+    @staticmethod
+    def bulk_create(db: Session, accounts_data: List[dict],
+                    returning: bool = True) -> List[Optional[int]]:
+        """
+        Insert banyak account sekaligus dengan satu bulk INSERT
+        (executemany / multi-row VALUES), tanpa membuat ORM object per row
+        
+        Args:
+            db: Database session
+            accounts_data: List of dict dengan keys yang sama seperti create()
+            returning: Ambil ID lewat RETURNING; False = executemany biasa
+                       (lebih cepat di SQLite yang meng-insert RETURNING per row)
+        
+        Returns:
+            List ID account sesuai urutan input (None jika returning=False
+            atau dialect tidak mendukung RETURNING untuk executemany)
+        """
+        if not accounts_data:
+            return []
+        
+        dialect = db.get_bind().dialect
+        if returning and dialect.insert_executemany_returning_sort_by_parameter_order:
+            ids = db.execute(
+                insert(PortfolioAccount).returning(PortfolioAccount.id, sort_by_parameter_order=True),
+                accounts_data
+            ).scalars().all()
+        else:
+            db.execute(insert(PortfolioAccount), accounts_data)
+            ids = [None] * len(accounts_data)
+        
+        commit_or_flush(db)
+        return list(ids)
+
     @staticmethod
     def get_by_id(db: Session, account_id: int) -> Optional[PortfolioAccount]:
         """
@@ -94,6 +138,97 @@ class AccountRepository:
             PortfolioAccount.is_active == True
         ).all()
 
+    @staticmethod
+    def get_row_by_account_number(db: Session, account_number: str) -> Optional[Row]:
+        """
+        Read-only: get kolom account (ACCOUNT_ROW_FIELDS) berdasarkan account number
+        Mengembalikan Row, bukan ORM entity (tidak masuk identity map)
+        
+        Args:
+            db: Database session
+            account_number: Nomor rekening
+        
+        Returns:
+            Row atau None
+        """
+        return db.execute(
+            select(*ACCOUNT_ROW_COLUMNS).where(PortfolioAccount.account_number == account_number)
+        ).first()
+
+    @staticmethod
+    def get_rows_by_account_numbers(db: Session, account_numbers: List[str]) -> List[Row]:
+        """
+        Read-only: get kolom account (ACCOUNT_ROW_FIELDS) untuk banyak nomor
+        rekening sekaligus dengan satu query IN
+        
+        Args:
+            db: Database session
+            account_numbers: List nomor rekening
+        
+        Returns:
+            List of Row untuk nomor yang ditemukan (urutan tidak dijamin)
+        """
+        if not account_numbers:
+            return []
+        return db.execute(
+            select(*ACCOUNT_ROW_COLUMNS).where(PortfolioAccount.account_number.in_(account_numbers))
+        ).all()
+
+    @staticmethod
+    def get_existing_account_numbers(db: Session, account_numbers: List[str]) -> List[str]:
+        """
+        Read-only: nomor rekening yang sudah terdaftar dari daftar yang diberikan
+        (satu query IN, cukup dari index account_number)
+        
+        Args:
+            db: Database session
+            account_numbers: List nomor rekening
+        
+        Returns:
+            List nomor rekening yang sudah ada
+        """
+        if not account_numbers:
+            return []
+        return db.execute(
+            select(PortfolioAccount.account_number)
+            .where(PortfolioAccount.account_number.in_(account_numbers))
+        ).scalars().all()
+
+    @staticmethod
+    def get_rows_by_customer_id(db: Session, customer_id: int, active_only: bool = False) -> List[Row]:
+        """
+        Read-only: get kolom semua account milik customer sebagai Row
+        
+        Args:
+            db: Database session
+            customer_id: ID customer
+            active_only: Hanya account aktif
+        
+        Returns:
+            List of Row
+        """
+        statement = select(*ACCOUNT_ROW_COLUMNS).where(PortfolioAccount.m_customer_id == customer_id)
+        if active_only:
+            statement = statement.where(PortfolioAccount.is_active == True)
+        return db.execute(statement).all()
+
+    @staticmethod
+    def get_balance(db: Session, account_number: str) -> Optional[Row]:
+        """
+        Read-only: get saldo account saja (clear_balance, available_balance)
+        
+        Args:
+            db: Database session
+            account_number: Nomor rekening
+        
+        Returns:
+            Row (clear_balance, available_balance) atau None
+        """
+        return db.execute(
+            select(PortfolioAccount.clear_balance, PortfolioAccount.available_balance)
+            .where(PortfolioAccount.account_number == account_number)
+        ).first()
+
     @staticmethod
     def update_balance(db: Session, account_number: str, 
                       clear_balance: Decimal, available_balance: Decimal) -> Optional[PortfolioAccount]:
@@ -109,17 +244,88 @@ class AccountRepository:
         Returns:
             PortfolioAccount object yang telah diupdate atau None
         """
-        account = db.query(PortfolioAccount).filter(
+        account = update_returning(
+            db,
+            update(PortfolioAccount).where(
+                PortfolioAccount.account_number == account_number
+            ).values(
+                clear_balance=clear_balance,
+                available_balance=available_balance,
+                updated_at=datetime.now()
+            ),
+            PortfolioAccount,
             PortfolioAccount.account_number == account_number
-        ).first()
+        )
+        commit_or_flush(db)
+        return account
+
+    @staticmethod
+    def debit(db: Session, account_number: str, amount: Decimal) -> Optional[PortfolioAccount]:
+        """
+        Debit balance secara atomik dengan satu conditional UPDATE
+        (UPDATE ... SET available_balance = available_balance - :amount
+         WHERE account_number = :n AND available_balance >= :amount)
         
-        if account:
-            account.clear_balance = clear_balance
-            account.available_balance = available_balance
-            account.updated_at = datetime.now()
-            db.commit()
-            db.refresh(account)
+        Args:
+            db: Database session
+            account_number: Nomor rekening
+            amount: Jumlah yang akan didebit
         
+        Returns:
+            PortfolioAccount object yang telah diupdate, atau None jika
+            account tidak ditemukan / saldo tidak mencukupi
+        """
+        return AccountRepository._apply_balance_delta(
+            db, account_number, -amount,
+            PortfolioAccount.available_balance >= amount
+        )
+
+    @staticmethod
+    def credit(db: Session, account_number: str, amount: Decimal) -> Optional[PortfolioAccount]:
+        """
+        Credit balance secara atomik dengan satu UPDATE
+        
+        Args:
+            db: Database session
+            account_number: Nomor rekening
+            amount: Jumlah yang akan dikreditkan
+        
+        Returns:
+            PortfolioAccount object yang telah diupdate atau None
+        """
+        return AccountRepository._apply_balance_delta(db, account_number, amount, None)
+
+    @staticmethod
+    def _apply_balance_delta(db: Session, account_number: str, delta: Decimal,
+                             condition) -> Optional[PortfolioAccount]:
+        """
+        Tambahkan delta ke clear/available balance dalam satu statement.
+        Menggunakan RETURNING jika didukung dialect (PostgreSQL, SQLite >= 3.35),
+        fallback ke UPDATE + SELECT untuk dialect lain
+        
+        Args:
+            db: Database session
+            account_number: Nomor rekening
+            delta: Perubahan saldo (negatif untuk debit)
+            condition: Kondisi tambahan pada WHERE clause atau None
+        
+        Returns:
+            PortfolioAccount object yang telah diupdate atau None jika tidak ada row
+        """
+        stmt = update(PortfolioAccount).where(
+            PortfolioAccount.account_number == account_number
+        )
+        if condition is not None:
+            stmt = stmt.where(condition)
+        stmt = stmt.values(
+            clear_balance=PortfolioAccount.clear_balance + delta,
+            available_balance=PortfolioAccount.available_balance + delta,
+            updated_at=datetime.now()
+        )
+        account = update_returning(
+            db, stmt, PortfolioAccount, PortfolioAccount.account_number == account_number
+        )
+        commit_or_flush(db)
         return account
 
     @staticmethod
@@ -142,8 +348,7 @@ class AccountRepository:
                 if hasattr(account, key):
                     setattr(account, key, value)
             account.updated_at = datetime.now()
-            db.commit()
-            db.refresh(account)
+            commit_or_flush(db)
         
         return account
 
@@ -159,16 +364,15 @@ class AccountRepository:
         Returns:
             PortfolioAccount object yang telah diupdate atau None
         """
-        account = db.query(PortfolioAccount).filter(
+        account = update_returning(
+            db,
+            update(PortfolioAccount).where(
+                PortfolioAccount.account_number == account_number
+            ).values(is_active=False, updated_at=datetime.now()),
+            PortfolioAccount,
             PortfolioAccount.account_number == account_number
-        ).first()
-        
-        if account:
-            account.is_active = False
-            account.updated_at = datetime.now()
-            db.commit()
-            db.refresh(account)
-        
+        )
+        commit_or_flush(db)
         return account
 
     @staticmethod
@@ -187,7 +391,7 @@ class AccountRepository:
         
         if account:
             db.delete(account)
-            db.commit()
+            commit_or_flush(db)
             return True
         
         return False
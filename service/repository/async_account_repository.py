@@ -0,0 +1,86 @@
+"""
+Async Account Repository - Data Access Layer (AsyncSession) untuk m_portfolio_account
+Dipakai oleh endpoint read saat DATABASE_MODE=async
+"""
+from sqlalchemy import select, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+from db.models import PortfolioAccount
+from repository.account_repository import ACCOUNT_ROW_COLUMNS
+from utils.metrics import instrument_repository
+
+
+@instrument_repository
+class AsyncAccountRepository:
+    """Repository async untuk operasi read m_portfolio_account"""
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, account_id: int) -> Optional[PortfolioAccount]:
+        """
+        Get account berdasarkan ID
+        
+        Args:
+            db: Async database session
+            account_id: ID account
+        
+        Returns:
+            PortfolioAccount object atau None
+        """
+        result = await db.execute(
+            select(PortfolioAccount).where(PortfolioAccount.id == account_id)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_by_account_number(db: AsyncSession, account_number: str) -> Optional[PortfolioAccount]:
+        """
+        Get account berdasarkan account number
+        
+        Args:
+            db: Async database session
+            account_number: Nomor rekening
+        
+        Returns:
+            PortfolioAccount object atau None
+        """
+        result = await db.execute(
+            select(PortfolioAccount).where(PortfolioAccount.account_number == account_number)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_row_by_account_number(db: AsyncSession, account_number: str) -> Optional[Row]:
+        """
+        Read-only: get kolom account (ACCOUNT_ROW_FIELDS) sebagai Row
+        
+        Args:
+            db: Async database session
+            account_number: Nomor rekening
+        
+        Returns:
+            Row atau None
+        """
+        result = await db.execute(
+            select(*ACCOUNT_ROW_COLUMNS).where(PortfolioAccount.account_number == account_number)
+        )
+        return result.first()
+
+    @staticmethod
+    async def get_by_customer_id(db: AsyncSession, customer_id: int,
+                                 active_only: bool = False) -> List[PortfolioAccount]:
+        """
+        Get semua account milik customer tertentu
+        
+        Args:
+            db: Async database session
+            customer_id: ID customer
+            active_only: Hanya account aktif
+        
+        Returns:
+            List of PortfolioAccount objects
+        """
+        statement = select(PortfolioAccount).where(PortfolioAccount.m_customer_id == customer_id)
+        if active_only:
+            statement = statement.where(PortfolioAccount.is_active == True)
+        result = await db.execute(statement)
+        return result.scalars().all()
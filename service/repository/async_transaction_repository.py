@@ -0,0 +1,120 @@
+"""
+Async Transaction Repository - Data Access Layer (AsyncSession) untuk t_transaction
+Dipakai oleh endpoint read saat DATABASE_MODE=async. Query halaman riwayat
+dibangun oleh TransactionRepository sehingga sama persis dengan mode sync
+"""
+from sqlalchemy import select, Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List, Tuple
+from datetime import datetime
+from db.models import Transaction
+from repository.transaction_repository import TransactionRepository
+from utils.metrics import instrument_repository
+
+
+@instrument_repository
+class AsyncTransactionRepository:
+    """Repository async untuk operasi read t_transaction"""
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, transaction_id: int) -> Optional[Transaction]:
+        """
+        Get transaction berdasarkan ID
+        
+        Args:
+            db: Async database session
+            transaction_id: ID transaction
+        
+        Returns:
+            Transaction object atau None
+        """
+        result = await db.execute(select(Transaction).where(Transaction.id == transaction_id))
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_by_customer_id(db: AsyncSession, customer_id: int,
+                                 skip: int = 0, limit: int = 100,
+                                 cursor: Optional[Tuple[datetime, int]] = None) -> List[Transaction]:
+        """
+        Get semua transaction milik customer tertentu
+        
+        Args:
+            db: Async database session
+            customer_id: ID customer
+            skip: Offset untuk pagination (diabaikan jika cursor diisi)
+            limit: Jumlah maksimal data
+            cursor: (transaction_date, id) untuk keyset pagination
+        
+        Returns:
+            List of Transaction objects
+        """
+        statement = TransactionRepository.customer_page_statement(
+            db.bind.dialect.name, customer_id, skip, limit, cursor
+        )
+        result = await db.execute(statement)
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_by_account_number(db: AsyncSession, account_number: str,
+                                    skip: int = 0, limit: int = 100,
+                                    cursor: Optional[Tuple[datetime, int]] = None) -> List[Transaction]:
+        """
+        Get semua transaction dari/ke account tertentu
+        
+        Args:
+            db: Async database session
+            account_number: Nomor rekening
+            skip: Offset untuk pagination (diabaikan jika cursor diisi)
+            limit: Jumlah maksimal data
+            cursor: (transaction_date, id) untuk keyset pagination
+        
+        Returns:
+            List of Transaction objects
+        """
+        statement = TransactionRepository.account_page_statement(
+            db.bind.dialect.name, account_number, skip, limit, cursor
+        )
+        result = await db.execute(statement)
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_rows_by_customer_id(db: AsyncSession, customer_id: int,
+                                      skip: int = 0, limit: int = 100,
+                                      cursor: Optional[Tuple[datetime, int]] = None,
+                                      expand_counterparty: bool = False) -> List[Row]:
+        """
+        Sama dengan get_by_customer_id, tetapi hanya mengambil kolom
+        TRANSACTION_ROW_FIELDS sebagai tuple (tanpa hydrate ORM entity)
+        (lihat TransactionRepository.get_rows_by_customer_id untuk expand_counterparty)
+        
+        Returns:
+            List of Row
+        """
+        statement = TransactionRepository.customer_page_statement(
+            db.bind.dialect.name, customer_id, skip, limit, cursor, columns_only=True
+        )
+        if expand_counterparty:
+            statement = TransactionRepository.with_account_names(statement)
+        result = await db.execute(statement)
+        return result.all()
+
+    @staticmethod
+    async def get_rows_by_account_number(db: AsyncSession, account_number: str,
+                                         skip: int = 0, limit: int = 100,
+                                         cursor: Optional[Tuple[datetime, int]] = None,
+                                         expand_counterparty: bool = False) -> List[Row]:
+        """
+        Sama dengan get_by_account_number, tetapi hanya mengambil kolom
+        TRANSACTION_ROW_FIELDS sebagai tuple (tanpa hydrate ORM entity)
+        (lihat TransactionRepository.get_rows_by_customer_id untuk expand_counterparty)
+        
+        Returns:
+            List of Row
+        """
+        statement = TransactionRepository.account_page_statement(
+            db.bind.dialect.name, account_number, skip, limit, cursor, columns_only=True
+        )
+        if expand_counterparty:
+            statement = TransactionRepository.with_account_names(statement)
+        result = await db.execute(statement)
+        return result.all()
@@ -1,12 +1,28 @@
 """
 Customer Repository - Data Access Layer untuk m_customer
 """
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update, func, case, or_, Row
+from sqlalchemy.orm import Session, selectinload
 from typing import Optional, List
-from db.models import Customer
+from db.models import Customer, PortfolioAccount
 from datetime import datetime
+from db.unit_of_work import commit_or_flush
+from repository.update_returning import update_returning
+from utils.metrics import instrument_repository
 
+# Kolom yang diambil query read-only (Row, tanpa ORM entity)
+CUSTOMER_ROW_FIELDS = (
+    "id", "customer_name", "customer_username", "customer_pin", "customer_email",
+    "customer_phone", "cif_number", "failed_login_attempts", "is_locked", "last_login",
+    "created_at", "updated_at"
+)
+CUSTOMER_ROW_COLUMNS = [getattr(Customer, field) for field in CUSTOMER_ROW_FIELDS]
 
+# Account di-lock setelah gagal login sebanyak ini
+MAX_FAILED_LOGIN_ATTEMPTS = 3
+
+
+@instrument_repository
 class CustomerRepository:
     """Repository untuk operasi database m_customer"""
 
@@ -25,12 +41,42 @@ class CustomerRepository:
         """
         new_customer = Customer(**customer_data)
         db.add(new_customer)
-        db.flush()  # Flush to get ID before commit
-        db.commit()  # Commit to database immediately
-        db.refresh(new_customer)  # Refresh to get updated data
-        print(f"✅ Customer created in DB: ID={new_customer.id}, Username={new_customer.customer_username}")
+        commit_or_flush(db)  # ID dan server default diambil lewat RETURNING saat INSERT
         return new_customer
 
+    @staticmethod
+    def bulk_create(db: Session, customers_data: List[dict],
+                    returning: bool = True) -> List[Optional[int]]:
+        """
+        Insert banyak customer sekaligus dengan satu bulk INSERT
+        (executemany / multi-row VALUES), tanpa membuat ORM object per row
+        
+        Args:
+            db: Database session
+            customers_data: List of dict dengan keys yang sama seperti create()
+            returning: Ambil ID lewat RETURNING; False = executemany biasa
+                       (lebih cepat di SQLite yang meng-insert RETURNING per row)
+        
+        Returns:
+            List ID customer sesuai urutan input (None jika returning=False
+            atau dialect tidak mendukung RETURNING untuk executemany)
+        """
+        if not customers_data:
+            return []
+        
+        dialect = db.get_bind().dialect
+        if returning and dialect.insert_executemany_returning_sort_by_parameter_order:
+            ids = db.execute(
+                insert(Customer).returning(Customer.id, sort_by_parameter_order=True),
+                customers_data
+            ).scalars().all()
+        else:
+            db.execute(insert(Customer), customers_data)
+            ids = [None] * len(customers_data)
+        
+        commit_or_flush(db)
+        return list(ids)
+
     @staticmethod
     def get_by_id(db: Session, customer_id: int) -> Optional[Customer]:
         """
@@ -87,6 +133,122 @@ class CustomerRepository:
         """
         return db.query(Customer).filter(Customer.cif_number == cif_number).first()
 
+    @staticmethod
+    def get_row_by_id(db: Session, customer_id: int) -> Optional[Row]:
+        """
+        Read-only: get kolom customer (CUSTOMER_ROW_FIELDS) berdasarkan ID
+        Mengembalikan Row, bukan ORM entity (tidak masuk identity map)
+        
+        Args:
+            db: Database session
+            customer_id: ID customer
+        
+        Returns:
+            Row atau None
+        """
+        return db.execute(select(*CUSTOMER_ROW_COLUMNS).where(Customer.id == customer_id)).first()
+
+    @staticmethod
+    def get_row_by_username(db: Session, username: str) -> Optional[Row]:
+        """
+        Read-only: get kolom customer (CUSTOMER_ROW_FIELDS) berdasarkan username
+        
+        Args:
+            db: Database session
+            username: Username customer
+        
+        Returns:
+            Row atau None
+        """
+        return db.execute(
+            select(*CUSTOMER_ROW_COLUMNS).where(Customer.customer_username == username)
+        ).first()
+
+    @staticmethod
+    def get_existing_unique_values(db: Session, usernames: List[str], emails: List[str],
+                                   cif_numbers: List[str]) -> List[Row]:
+        """
+        Read-only: customer yang memakai salah satu username/email/CIF yang
+        diberikan (satu query, masing-masing kondisi IN dilayani index unique)
+        
+        Args:
+            db: Database session
+            usernames: List username
+            emails: List email
+            cif_numbers: List CIF number
+        
+        Returns:
+            List of Row (id, customer_username, customer_email, cif_number)
+        """
+        if not (usernames or emails or cif_numbers):
+            return []
+        return db.execute(
+            select(Customer.id, Customer.customer_username, Customer.customer_email, Customer.cif_number)
+            .where(or_(
+                Customer.customer_username.in_(usernames),
+                Customer.customer_email.in_(emails),
+                Customer.cif_number.in_(cif_numbers)
+            ))
+        ).all()
+
+    @staticmethod
+    def get_ids_by_cif_numbers(db: Session, cif_numbers: List[str]) -> dict:
+        """
+        Read-only: mapping CIF number -> ID customer (satu query IN)
+        
+        Args:
+            db: Database session
+            cif_numbers: List CIF number
+        
+        Returns:
+            Dict {cif_number: id} untuk CIF yang ditemukan
+        """
+        if not cif_numbers:
+            return {}
+        return dict(db.execute(
+            select(Customer.cif_number, Customer.id).where(Customer.cif_number.in_(cif_numbers))
+        ).all())
+
+    @staticmethod
+    def get_lock_status(db: Session, customer_id: int) -> Optional[bool]:
+        """
+        Read-only: get status lock customer saja
+        
+        Args:
+            db: Database session
+            customer_id: ID customer
+        
+        Returns:
+            True/False, atau None jika customer tidak ditemukan
+        """
+        return db.execute(select(Customer.is_locked).where(Customer.id == customer_id)).scalar()
+
+    @staticmethod
+    def get_with_active_accounts(db: Session, customer_id: int) -> Optional[Row]:
+        """
+        Get customer beserta account aktif (selectinload, satu query tambahan)
+        dan total available_balance account aktif yang dihitung di SQL
+        
+        Args:
+            db: Database session
+            customer_id: ID customer
+        
+        Returns:
+            Row (Customer, total_balance) atau None jika customer tidak ditemukan
+        """
+        total_balance = select(
+            func.coalesce(func.sum(PortfolioAccount.available_balance), 0)
+        ).where(
+            PortfolioAccount.m_customer_id == Customer.id,
+            PortfolioAccount.is_active == True
+        ).correlate(Customer).scalar_subquery()
+        
+        return db.execute(
+            select(Customer, total_balance.label("total_balance"))
+            .where(Customer.id == customer_id)
+            .options(selectinload(Customer.accounts.and_(PortfolioAccount.is_active == True)))
+        ).first()
+
     @staticmethod
     def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Customer]:
         """
@@ -121,50 +283,72 @@ class CustomerRepository:
                 if hasattr(customer, key):
                     setattr(customer, key, value)
             customer.updated_at = datetime.now()
-            db.commit()
-            db.refresh(customer)
+            commit_or_flush(db)
         return customer
 
     @staticmethod
-    def increment_failed_login(db: Session, customer_id: int) -> Optional[Customer]:
+    def increment_failed_login(db: Session, customer_id: int,
+                               unlocked_only: bool = False) -> Optional[Customer]:
         """
-        Increment failed login attempts
+        Increment failed login attempts dan lock jika mencapai batas
+        Satu UPDATE atomik (counter dihitung di database), sehingga percobaan
+        login paralel tidak saling menimpa increment
         
         Args:
             db: Database session
             customer_id: ID customer
+            unlocked_only: Hanya update jika account belum locked
         
         Returns:
-            Customer object yang telah diupdate
+            Customer object yang telah diupdate, atau None jika tidak ditemukan
+            (atau sudah locked saat unlocked_only)
         """
-        customer = db.query(Customer).filter(Customer.id == customer_id).first()
-        if customer:
-            customer.failed_login_attempts += 1
-            # Lock account jika sudah 3 kali gagal
-            if customer.failed_login_attempts >= 3:
-                customer.is_locked = True
-            db.commit()
-            db.refresh(customer)
+        criteria = [Customer.id == customer_id]
+        if unlocked_only:
+            criteria.append(Customer.is_locked == False)
+        customer = update_returning(
+            db,
+            update(Customer).where(*criteria).values(
+                failed_login_attempts=Customer.failed_login_attempts + 1,
+                # Lock account jika sudah MAX_FAILED_LOGIN_ATTEMPTS kali gagal
+                is_locked=case(
+                    (Customer.failed_login_attempts + 1 >= MAX_FAILED_LOGIN_ATTEMPTS, True),
+                    else_=Customer.is_locked
+                )
+            ),
+            Customer,
+            Customer.id == customer_id
+        )
+        commit_or_flush(db)
         return customer
 
     @staticmethod
-    def reset_failed_login(db: Session, customer_id: int) -> Optional[Customer]:
+    def reset_failed_login(db: Session, customer_id: int,
+                           unlocked_only: bool = False) -> Optional[Customer]:
         """
         Reset failed login attempts (setelah login berhasil)
         
         Args:
             db: Database session
             customer_id: ID customer
+            unlocked_only: Hanya update jika account belum locked
         
         Returns:
-            Customer object yang telah diupdate
+            Customer object yang telah diupdate, atau None jika tidak ditemukan
+            (atau sudah locked saat unlocked_only)
         """
-        customer = db.query(Customer).filter(Customer.id == customer_id).first()
-        if customer:
-            customer.failed_login_attempts = 0
-            customer.last_login = datetime.now()
-            db.commit()
-            db.refresh(customer)
+        criteria = [Customer.id == customer_id]
+        if unlocked_only:
+            criteria.append(Customer.is_locked == False)
+        customer = update_returning(
+            db,
+            update(Customer).where(*criteria).values(
+                failed_login_attempts=0, last_login=datetime.now()
+            ),
+            Customer,
+            Customer.id == customer_id
+        )
+        commit_or_flush(db)
         return customer
 
     @staticmethod
@@ -182,6 +366,6 @@ class CustomerRepository:
         customer = db.query(Customer).filter(Customer.id == customer_id).first()
         if customer:
             db.delete(customer)
-            db.commit()
+            commit_or_flush(db)
             return True
         return False
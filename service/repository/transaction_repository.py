@@ -1,12 +1,27 @@
 """
 Transaction Repository - Data Access Layer untuk t_transaction
 """
-from sqlalchemy.orm import Session
-from typing import Optional, List
-from db.models import Transaction
+from sqlalchemy import insert, select, update, union_all, and_, or_, tuple_, literal, String, Row
+from sqlalchemy.orm import Session, aliased
+from typing import Optional, List, Tuple, Iterator
+from db.models import Transaction, PortfolioAccount
 from datetime import datetime, timedelta
+from db.unit_of_work import commit_or_flush
+from repository.update_returning import update_returning
+from utils.metrics import instrument_repository
 
+# Kolom yang diambil oleh query halaman riwayat versi row (tanpa ORM entity),
+# urutan sama dengan field TransactionResponse
+TRANSACTION_ROW_FIELDS = (
+    "id", "m_customer_id", "transaction_type", "transaction_amount", "from_account_number",
+    "to_account_number", "status", "description", "transaction_date", "created_at"
+)
 
+# Kolom tambahan untuk expand=counterparty (nama pemilik rekening asal/tujuan)
+TRANSACTION_COUNTERPARTY_FIELDS = TRANSACTION_ROW_FIELDS + ("from_account_name", "to_account_name")
+
+
+@instrument_repository
 class TransactionRepository:
     """Repository untuk operasi database t_transaction"""
 
@@ -26,10 +41,39 @@ class TransactionRepository:
         """
         new_transaction = Transaction(**transaction_data)
         db.add(new_transaction)
-        db.commit()
-        db.refresh(new_transaction)
+        commit_or_flush(db)
         return new_transaction
 
+    @staticmethod
+    def bulk_create(db: Session, transactions_data: List[dict]) -> List[Optional[int]]:
+        """
+        Insert banyak transaction sekaligus dengan satu bulk INSERT
+        (executemany / multi-row VALUES), tanpa membuat ORM object per row
+        
+        Args:
+            db: Database session
+            transactions_data: List of dict dengan keys yang sama seperti create()
+        
+        Returns:
+            List ID transaction sesuai urutan input (None jika dialect
+            tidak mendukung RETURNING untuk executemany)
+        """
+        if not transactions_data:
+            return []
+        
+        dialect = db.get_bind().dialect
+        if dialect.insert_executemany_returning_sort_by_parameter_order:
+            ids = db.execute(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                transactions_data
+            ).scalars().all()
+        else:
+            db.execute(insert(Transaction), transactions_data)
+            ids = [None] * len(transactions_data)
+        
+        commit_or_flush(db)
+        return list(ids)
+
     @staticmethod
     def get_by_id(db: Session, transaction_id: int) -> Optional[Transaction]:
         """
@@ -46,42 +90,291 @@ class TransactionRepository:
 
     @staticmethod
     def get_by_customer_id(db: Session, customer_id: int, 
-                          skip: int = 0, limit: int = 100) -> List[Transaction]:
+                          skip: int = 0, limit: int = 100,
+                          cursor: Optional[Tuple[datetime, int]] = None) -> List[Transaction]:
         """
         Get semua transaction milik customer tertentu
         
         Args:
             db: Database session
             customer_id: ID customer
-            skip: Offset untuk pagination
+            skip: Offset untuk pagination (diabaikan jika cursor diisi)
             limit: Jumlah maksimal data
+            cursor: (transaction_date, id) row terakhir halaman sebelumnya
+                    untuk keyset pagination
         
         Returns:
             List of Transaction objects
         """
-        return db.query(Transaction).filter(
-            Transaction.m_customer_id == customer_id
-        ).order_by(Transaction.transaction_date.desc()).offset(skip).limit(limit).all()
+        statement = TransactionRepository.customer_page_statement(
+            db.get_bind().dialect.name, customer_id, skip, limit, cursor
+        )
+        return db.execute(statement).scalars().all()
 
     @staticmethod
     def get_by_account_number(db: Session, account_number: str, 
-                             skip: int = 0, limit: int = 100) -> List[Transaction]:
+                             skip: int = 0, limit: int = 100,
+                             cursor: Optional[Tuple[datetime, int]] = None) -> List[Transaction]:
         """
         Get semua transaction dari/ke account tertentu
         
         Args:
             db: Database session
             account_number: Nomor rekening
-            skip: Offset untuk pagination
+            skip: Offset untuk pagination (diabaikan jika cursor diisi)
             limit: Jumlah maksimal data
+            cursor: (transaction_date, id) row terakhir halaman sebelumnya
+                    untuk keyset pagination
         
         Returns:
             List of Transaction objects
         """
-        return db.query(Transaction).filter(
+        statement = TransactionRepository.account_page_statement(
+            db.get_bind().dialect.name, account_number, skip, limit, cursor
+        )
+        return db.execute(statement).scalars().all()
+
+    @staticmethod
+    def get_rows_by_customer_id(db: Session, customer_id: int,
+                                skip: int = 0, limit: int = 100,
+                                cursor: Optional[Tuple[datetime, int]] = None,
+                                expand_counterparty: bool = False) -> List[Row]:
+        """
+        Sama dengan get_by_customer_id, tetapi hanya mengambil kolom
+        TRANSACTION_ROW_FIELDS sebagai tuple (tanpa hydrate ORM entity)
+        
+        Args:
+            expand_counterparty: Sertakan nama rekening asal/tujuan (LEFT JOIN
+                                 m_portfolio_account dalam query yang sama)
+        
+        Returns:
+            List of Row (urutan kolom TRANSACTION_ROW_FIELDS, atau
+            TRANSACTION_COUNTERPARTY_FIELDS jika expand_counterparty)
+        """
+        statement = TransactionRepository.customer_page_statement(
+            db.get_bind().dialect.name, customer_id, skip, limit, cursor, columns_only=True
+        )
+        if expand_counterparty:
+            statement = TransactionRepository.with_account_names(statement)
+        return db.execute(statement).all()
+
+    @staticmethod
+    def get_rows_by_account_number(db: Session, account_number: str,
+                                   skip: int = 0, limit: int = 100,
+                                   cursor: Optional[Tuple[datetime, int]] = None,
+                                   expand_counterparty: bool = False) -> List[Row]:
+        """
+        Sama dengan get_by_account_number, tetapi hanya mengambil kolom
+        TRANSACTION_ROW_FIELDS sebagai tuple (tanpa hydrate ORM entity)
+        
+        Args:
+            expand_counterparty: Sertakan nama rekening asal/tujuan (LEFT JOIN
+                                 m_portfolio_account dalam query yang sama)
+        
+        Returns:
+            List of Row (urutan kolom TRANSACTION_ROW_FIELDS, atau
+            TRANSACTION_COUNTERPARTY_FIELDS jika expand_counterparty)
+        """
+        statement = TransactionRepository.account_page_statement(
+            db.get_bind().dialect.name, account_number, skip, limit, cursor, columns_only=True
+        )
+        if expand_counterparty:
+            statement = TransactionRepository.with_account_names(statement)
+        return db.execute(statement).all()
+
+    @staticmethod
+    def customer_page_statement(dialect_name: str, customer_id: int, skip: int, limit: int,
+                                cursor: Optional[Tuple[datetime, int]] = None,
+                                columns_only: bool = False):
+        """
+        Bangun SELECT satu halaman riwayat transaksi customer
+        Dipakai bersama oleh repository sync dan async
+        
+        Args:
+            dialect_name: Nama dialect database (sqlite, postgresql, ...)
+            customer_id: ID customer
+            skip: Offset (diabaikan jika cursor diisi)
+            limit: Jumlah maksimal data
+            cursor: (transaction_date, id) atau None
+            columns_only: Select kolom TRANSACTION_ROW_FIELDS, bukan entity
+        
+        Returns:
+            SQLAlchemy Select yang menghasilkan Transaction entities (atau row)
+        """
+        statement = select(
+            *TransactionRepository._row_columns(Transaction) if columns_only else [Transaction]
+        ).where(Transaction.m_customer_id == customer_id)
+        return TransactionRepository._paginate(statement, dialect_name, skip, limit, cursor)
+
+    @staticmethod
+    def account_page_statement(dialect_name: str, account_number: str, skip: int, limit: int,
+                               cursor: Optional[Tuple[datetime, int]] = None,
+                               columns_only: bool = False):
+        """
+        Bangun SELECT satu halaman mutasi rekening (dari/ke account tertentu)
+        Dipakai bersama oleh repository sync dan async
+        
+        Query dijalankan sebagai UNION ALL dua range scan yang sudah terurut
+        (index from_account_number+date dan to_account_number+date), masing-
+        masing dibatasi skip+limit row, lalu digabung. Ini menghindari OR yang
+        memaksa database menggabung dan meng-sort seluruh mutasi rekening
+        
+        Args:
+            dialect_name: Nama dialect database (sqlite, postgresql, ...)
+            account_number: Nomor rekening
+            skip: Offset (diabaikan jika cursor diisi)
+            limit: Jumlah maksimal data
+            cursor: (transaction_date, id) atau None
+            columns_only: Select kolom TRANSACTION_ROW_FIELDS, bukan entity
+        
+        Returns:
+            SQLAlchemy Select yang menghasilkan Transaction entities (atau row)
+        """
+        fetch = limit if cursor is not None else skip + limit
+        
+        def leg(condition):
+            statement = select(Transaction).where(condition)
+            if cursor is not None:
+                statement = statement.where(
+                    tuple_(Transaction.transaction_date, Transaction.id) <
+                    tuple_(TransactionRepository._datetime_param(dialect_name, cursor[0]), cursor[1])
+                )
+            statement = statement.order_by(
+                Transaction.transaction_date.desc(), Transaction.id.desc()
+            ).limit(fetch).subquery()
+            return select(statement)
+        
+        legs = union_all(
+            leg(Transaction.from_account_number == account_number),
+            # Transaksi dengan from == to == account_number sudah diambil leg pertama
+            leg(and_(
+                Transaction.to_account_number == account_number,
+                or_(Transaction.from_account_number.is_(None),
+                    Transaction.from_account_number != account_number)
+            ))
+        ).subquery()
+        merged = aliased(Transaction, legs)
+        
+        statement = select(
+            *TransactionRepository._row_columns(merged) if columns_only else [merged]
+        ).order_by(merged.transaction_date.desc(), merged.id.desc())
+        if cursor is None:
+            statement = statement.offset(skip)
+        return statement.limit(limit)
+
+    @staticmethod
+    def with_account_names(page_statement):
+        """
+        Bungkus statement halaman (columns_only) dengan LEFT JOIN ke
+        m_portfolio_account untuk nama rekening asal dan tujuan
+        Join dilakukan setelah limit, sehingga hanya row halaman yang di-join
+        (lookup unique index account_number)
+        
+        Args:
+            page_statement: Hasil customer_page_statement/account_page_statement
+                            dengan columns_only=True
+        
+        Returns:
+            Select dengan kolom TRANSACTION_COUNTERPARTY_FIELDS
+        """
+        page = page_statement.subquery()
+        source = aliased(PortfolioAccount)
+        destination = aliased(PortfolioAccount)
+        return select(
+            *[page.c[field] for field in TRANSACTION_ROW_FIELDS],
+            source.account_name.label("from_account_name"),
+            destination.account_name.label("to_account_name")
+        ).select_from(page).outerjoin(
+            source, source.account_number == page.c.from_account_number
+        ).outerjoin(
+            destination, destination.account_number == page.c.to_account_number
+        ).order_by(page.c.transaction_date.desc(), page.c.id.desc())
+
+    @staticmethod
+    def stream_by_account_number(db: Session, account_number: str,
+                                 start_date: Optional[datetime] = None,
+                                 end_date: Optional[datetime] = None,
+                                 batch_size: int = 1000) -> Iterator[Transaction]:
+        """
+        Stream semua transaction dari/ke account tertentu (untuk export mutasi)
+        Row diambil bertahap per batch_size (server-side cursor / yield_per),
+        sehingga memory tetap datar berapapun jumlah row
+        
+        Args:
+            db: Database session
+            account_number: Nomor rekening
+            start_date: Tanggal mulai (opsional)
+            end_date: Tanggal akhir (opsional)
+            batch_size: Jumlah row per fetch
+        
+        Yields:
+            Transaction objects (urut transaction_date asc)
+        """
+        query = db.query(Transaction).filter(
             (Transaction.from_account_number == account_number) | 
             (Transaction.to_account_number == account_number)
-        ).order_by(Transaction.transaction_date.desc()).offset(skip).limit(limit).all()
+        )
+        dialect_name = db.get_bind().dialect.name
+        if start_date is not None:
+            query = query.filter(
+                Transaction.transaction_date >= TransactionRepository._datetime_param(dialect_name, start_date)
+            )
+        if end_date is not None:
+            query = query.filter(
+                Transaction.transaction_date <= TransactionRepository._datetime_param(dialect_name, end_date)
+            )
+        # Generator: query baru dieksekusi saat iterasi, sehingga tidak diukur
+        # instrument_repository (waktu fetch tercatat di metrics DB execute)
+        yield from query.order_by(
+            Transaction.transaction_date.asc(), Transaction.id.asc()
+        ).yield_per(batch_size)
+
+    @staticmethod
+    def _paginate(statement, dialect_name: str, skip: int, limit: int,
+                  cursor: Optional[Tuple[datetime, int]]):
+        """
+        Terapkan urutan (transaction_date desc, id desc) dan pagination
+        Dengan cursor: keyset pagination (index range scan, latency konstan
+        berapapun kedalaman halaman). Tanpa cursor: offset/limit biasa
+        
+        Args:
+            statement: Select Transaction yang sudah difilter
+            dialect_name: Nama dialect database
+            skip: Offset
+            limit: Jumlah maksimal data
+            cursor: (transaction_date, id) atau None
+        
+        Returns:
+            Select yang sudah diurutkan dan dibatasi
+        """
+        statement = statement.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+        if cursor is not None:
+            cursor_date, cursor_id = cursor
+            statement = statement.where(
+                tuple_(Transaction.transaction_date, Transaction.id) <
+                tuple_(TransactionRepository._datetime_param(dialect_name, cursor_date), cursor_id)
+            )
+        else:
+            statement = statement.offset(skip)
+        return statement.limit(limit)
+
+    @staticmethod
+    def _row_columns(entity) -> List:
+        """Kolom TRANSACTION_ROW_FIELDS dari Transaction atau alias-nya"""
+        return [getattr(entity, field) for field in TRANSACTION_ROW_FIELDS]
+
+    @staticmethod
+    def _datetime_param(dialect_name: str, value: datetime):
+        """
+        Bind parameter datetime untuk perbandingan dengan transaction_date
+        SQLite menyimpan DateTime sebagai text; server_default CURRENT_TIMESTAMP
+        tanpa microsecond sedangkan bind param DateTime selalu ".ffffff", jadi
+        nilai dibandingkan dalam format yang sama dengan yang tersimpan
+        """
+        if dialect_name != "sqlite":
+            return value
+        timespec = "seconds" if value.microsecond == 0 else "microseconds"
+        return literal(value.isoformat(sep=" ", timespec=timespec), String)
 
     @staticmethod
     def get_by_date_range(db: Session, customer_id: int, 
@@ -172,13 +465,13 @@ class TransactionRepository:
         Returns:
             Transaction object yang telah diupdate atau None
         """
-        transaction = db.query(Transaction).filter(Transaction.id == transaction_id).first()
-        
-        if transaction:
-            transaction.status = status
-            db.commit()
-            db.refresh(transaction)
-        
+        transaction = update_returning(
+            db,
+            update(Transaction).where(Transaction.id == transaction_id).values(status=status),
+            Transaction,
+            Transaction.id == transaction_id
+        )
+        commit_or_flush(db)
         return transaction
 
     @staticmethod
@@ -200,7 +493,6 @@ class TransactionRepository:
             for key, value in update_data.items():
                 if hasattr(transaction, key):
                     setattr(transaction, key, value)
-            db.commit()
-            db.refresh(transaction)
+            commit_or_flush(db)
         
         return transaction
@@ -0,0 +1,36 @@
+"""
+Helper UPDATE ... RETURNING untuk repository
+Row yang diupdate dikembalikan oleh statement yang sama (PostgreSQL,
+SQLite >= 3.35), sehingga tidak perlu SELECT sebelum update atau refresh
+setelah commit
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def update_returning(db: Session, statement, model, *criteria):
+    """
+    Jalankan UPDATE dan kembalikan entity yang diupdate
+
+    Args:
+        db: Database session
+        statement: update(model).where(...).values(...)
+        model: Class ORM yang diupdate
+        criteria: Kondisi untuk SELECT ulang jika dialect tidak mendukung RETURNING
+
+    Returns:
+        Entity yang telah diupdate, atau None jika tidak ada row yang terkena
+    """
+    statement = statement.execution_options(synchronize_session=False)
+    if db.get_bind().dialect.update_returning:
+        return db.execute(
+            statement.returning(model),
+            execution_options={"populate_existing": True}
+        ).scalar_one_or_none()
+
+    result = db.execute(statement)
+    if not result.rowcount:
+        return None
+    return db.execute(
+        select(model).where(*criteria).execution_options(populate_existing=True)
+    ).scalar_one_or_none()
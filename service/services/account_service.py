@@ -3,9 +3,16 @@ Account Service - Business Logic Layer untuk Account operations
 """
 from sqlalchemy.orm import Session
 from repository.account_repository import AccountRepository
+from cache.account_cache import get_account_cache
+from db.unit_of_work import after_commit
+from db.replicas import is_replica_session
 from typing import Optional, List
 from decimal import Decimal
 from fastapi import HTTPException
+import os
+
+# Jumlah maksimal nomor rekening per bulk lookup
+LOOKUP_MAX_ACCOUNTS = int(os.getenv("ACCOUNT_LOOKUP_MAX", "500"))
 
 
 class AccountService:
@@ -13,6 +20,7 @@ class AccountService:
 
     def __init__(self):
         self.repository = AccountRepository()
+        self.cache = get_account_cache()
 
     def create_account(self, db: Session, account_data: dict) -> dict:
         """
@@ -72,11 +80,94 @@ class AccountService:
         Raises:
             HTTPException: Jika account tidak ditemukan
         """
-        account = self.repository.get_by_account_number(db, account_number)
+        account = self.cache.get_or_load(
+            account_number, lambda: self._load_account_by_number(db, account_number),
+            store=not is_replica_session(db)
+        )
         if not account:
             raise HTTPException(status_code=404, detail="Account tidak ditemukan")
         
-        return self._account_to_dict(account)
+        return account
+
+    def lookup_accounts(self, db: Session, account_numbers: List[str]) -> List[dict]:
+        """
+        Bulk lookup account berdasarkan banyak account number
+        Entry yang ada di cache dipakai langsung, sisanya diambil dengan satu
+        query IN lalu disimpan ke cache
+        
+        Args:
+            db: Database session
+            account_numbers: List nomor rekening (duplikat diabaikan)
+        
+        Returns:
+            List dict account yang ditemukan, urut sesuai input pertama kali muncul
+        
+        Raises:
+            HTTPException: Jika jumlah nomor rekening melebihi LOOKUP_MAX_ACCOUNTS
+        """
+        unique_numbers = list(dict.fromkeys(account_numbers))
+        if len(unique_numbers) > LOOKUP_MAX_ACCOUNTS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Maksimal {LOOKUP_MAX_ACCOUNTS} nomor rekening per lookup"
+            )
+        
+        found = {}
+        missing = []
+        for account_number in unique_numbers:
+            cached = self.cache.get(account_number)
+            if cached is not None:
+                found[account_number] = cached
+            else:
+                missing.append(account_number)
+        
+        if missing:
+            generations = {n: self.cache.generation(n) for n in missing}
+            store = not is_replica_session(db)
+            for row in self.repository.get_rows_by_account_numbers(db, missing):
+                account = self._account_to_dict(row)
+                found[row.account_number] = account
+                if store:
+                    self.cache.set(row.account_number, account, generations[row.account_number])
+        
+        return [found[n] for n in unique_numbers if n in found]
+
+    def _load_account_by_number(self, db: Session, account_number: str) -> Optional[dict]:
+        """Baca account dari database (loader untuk read-through cache, query kolom read-only)"""
+        account = self.repository.get_row_by_account_number(db, account_number)
+        return self._account_to_dict(account) if account else None
+
+    def get_balance(self, db: Session, account_number: str) -> dict:
+        """
+        Get saldo account (balance inquiry)
+        Jika cache aktif, dibaca lewat read-through cache; jika tidak, hanya
+        kolom saldo yang di-query
+        
+        Args:
+            db: Database session
+            account_number: Nomor rekening
+        
+        Returns:
+            Dict berisi clear_balance dan available_balance
+        
+        Raises:
+            HTTPException: Jika account tidak ditemukan
+        """
+        if self.cache.enabled:
+            account = self.get_account_by_number(db, account_number)
+            return {
+                "clear_balance": account["clear_balance"],
+                "available_balance": account["available_balance"]
+            }
+        
+        balance = self.repository.get_balance(db, account_number)
+        if not balance:
+            raise HTTPException(status_code=404, detail="Account tidak ditemukan")
+        
+        return {
+            "clear_balance": float(balance.clear_balance),
+            "available_balance": float(balance.available_balance)
+        }
 
     def get_accounts_by_customer(self, db: Session, customer_id: int, active_only: bool = True) -> List[dict]:
         """
@@ -91,11 +182,7 @@ class AccountService:
         Returns:
             List of account dicts
         """
-        if active_only:
-            accounts = self.repository.get_active_accounts_by_customer(db, customer_id)
-        else:
-            accounts = self.repository.get_by_customer_id(db, customer_id)
-        
+        accounts = self.repository.get_rows_by_customer_id(db, customer_id, active_only)
         return [self._account_to_dict(a) for a in accounts]
 
     def update_balance(self, db: Session, account_number: str, 
@@ -121,6 +208,7 @@ class AccountService:
         available_decimal = Decimal(str(available_balance))
         
         account = self.repository.update_balance(db, account_number, clear_decimal, available_decimal)
+        after_commit(db, lambda: self.cache.invalidate(account_number))
         if not account:
             raise HTTPException(status_code=404, detail="Account tidak ditemukan")
         
@@ -141,19 +229,15 @@ class AccountService:
         Raises:
             HTTPException: Jika saldo tidak cukup atau account tidak ditemukan
         """
-        account = self.repository.get_by_account_number(db, account_number)
+        account = self.repository.debit(db, account_number, Decimal(str(amount)))
+        after_commit(db, lambda: self.cache.invalidate(account_number))
         if not account:
-            raise HTTPException(status_code=404, detail="Account tidak ditemukan")
-        
-        # Validasi saldo cukup
-        if account.available_balance < Decimal(str(amount)):
+            # Conditional UPDATE tidak mengenai row: bedakan not found vs saldo kurang
+            if not self.repository.get_by_account_number(db, account_number):
+                raise HTTPException(status_code=404, detail="Account tidak ditemukan")
             raise HTTPException(status_code=400, detail="Saldo tidak mencukupi")
         
-        # Update balance
-        new_clear = account.clear_balance - Decimal(str(amount))
-        new_available = account.available_balance - Decimal(str(amount))
-        
-        return self.update_balance(db, account_number, float(new_clear), float(new_available))
+        return self._account_to_dict(account)
 
     def credit_account(self, db: Session, account_number: str, amount: float) -> dict:
         """
@@ -170,15 +254,12 @@ class AccountService:
         Raises:
             HTTPException: Jika account tidak ditemukan
         """
-        account = self.repository.get_by_account_number(db, account_number)
+        account = self.repository.credit(db, account_number, Decimal(str(amount)))
+        after_commit(db, lambda: self.cache.invalidate(account_number))
         if not account:
             raise HTTPException(status_code=404, detail="Account tidak ditemukan")
         
-        # Update balance
-        new_clear = account.clear_balance + Decimal(str(amount))
-        new_available = account.available_balance + Decimal(str(amount))
-        
-        return self.update_balance(db, account_number, float(new_clear), float(new_available))
+        return self._account_to_dict(account)
 
     def check_balance_sufficient(self, db: Session, account_number: str, amount: float) -> bool:
         """
@@ -192,11 +273,18 @@ class AccountService:
         Returns:
             True jika cukup, False jika tidak
         """
-        account = self.repository.get_by_account_number(db, account_number)
+        if not self.cache.enabled:
+            balance = self.repository.get_balance(db, account_number)
+            return bool(balance) and balance.available_balance >= Decimal(str(amount))
+        
+        account = self.cache.get_or_load(
+            account_number, lambda: self._load_account_by_number(db, account_number),
+            store=not is_replica_session(db)
+        )
         if not account:
             return False
         
-        return account.available_balance >= Decimal(str(amount))
+        return Decimal(str(account["available_balance"])) >= Decimal(str(amount))
 
     def update_account(self, db: Session, account_id: int, update_data: dict) -> dict:
         """
@@ -217,6 +305,9 @@ class AccountService:
         if not account:
             raise HTTPException(status_code=404, detail="Account tidak ditemukan")
         
+        account_number = account.account_number
+        after_commit(db, lambda: self.cache.invalidate(account_number))
+        
         return self._account_to_dict(account)
 
     def deactivate_account(self, db: Session, account_number: str) -> dict:
@@ -234,6 +325,7 @@ class AccountService:
             HTTPException: Jika account tidak ditemukan
         """
         account = self.repository.deactivate_account(db, account_number)
+        after_commit(db, lambda: self.cache.invalidate(account_number))
         if not account:
             raise HTTPException(status_code=404, detail="Account tidak ditemukan")
         
@@ -244,7 +336,7 @@ class AccountService:
         Convert PortfolioAccount object to dict
         
         Args:
-            account: PortfolioAccount object
+            account: PortfolioAccount object atau Row (ACCOUNT_ROW_FIELDS)
         
         Returns:
             Dict representasi account
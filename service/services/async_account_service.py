@@ -0,0 +1,109 @@
+"""
+Async Account Service - Business Logic Layer (async) untuk Account read operations
+Dipakai saat DATABASE_MODE=async; memakai cache dan format response yang sama
+dengan AccountService
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from repository.async_account_repository import AsyncAccountRepository
+from services.account_service import AccountService
+from typing import Optional, List
+from decimal import Decimal
+from fastapi import HTTPException
+
+
+class AsyncAccountService(AccountService):
+    """Service layer async untuk read account"""
+
+    def __init__(self):
+        super().__init__()
+        self.async_repository = AsyncAccountRepository()
+
+    async def get_account_by_id_async(self, db: AsyncSession, account_id: int) -> dict:
+        """
+        Get account berdasarkan ID
+        
+        Args:
+            db: Async database session
+            account_id: ID account
+        
+        Returns:
+            Dict representasi account
+        
+        Raises:
+            HTTPException: Jika account tidak ditemukan
+        """
+        account = await self.async_repository.get_by_id(db, account_id)
+        if not account:
+            raise HTTPException(status_code=404, detail="Account tidak ditemukan")
+        
+        return self._account_to_dict(account)
+
+    async def get_account_by_number_async(self, db: AsyncSession, account_number: str) -> dict:
+        """
+        Get account berdasarkan account number (read-through cache)
+        
+        Args:
+            db: Async database session
+            account_number: Nomor rekening
+        
+        Returns:
+            Dict representasi account
+        
+        Raises:
+            HTTPException: Jika account tidak ditemukan
+        """
+        account = await self._get_cached_account(db, account_number)
+        if not account:
+            raise HTTPException(status_code=404, detail="Account tidak ditemukan")
+        
+        return account
+
+    async def get_accounts_by_customer_async(self, db: AsyncSession, customer_id: int,
+                                             active_only: bool = True) -> List[dict]:
+        """
+        Get semua account milik customer
+        
+        Args:
+            db: Async database session
+            customer_id: ID customer
+            active_only: Hanya account aktif
+        
+        Returns:
+            List of account dicts
+        """
+        accounts = await self.async_repository.get_by_customer_id(db, customer_id, active_only)
+        return [self._account_to_dict(a) for a in accounts]
+
+    async def check_balance_sufficient_async(self, db: AsyncSession, account_number: str,
+                                             amount: float) -> bool:
+        """
+        Check apakah balance mencukupi untuk transaksi
+        
+        Args:
+            db: Async database session
+            account_number: Nomor rekening
+            amount: Jumlah yang akan di-check
+        
+        Returns:
+            True jika cukup, False jika tidak
+        """
+        account = await self._get_cached_account(db, account_number)
+        if not account:
+            return False
+        
+        return Decimal(str(account["available_balance"])) >= Decimal(str(amount))
+
+    async def _get_cached_account(self, db: AsyncSession, account_number: str) -> Optional[dict]:
+        """Read-through cache versi async (lihat AccountCache.get_or_load)"""
+        account = self.cache.get(account_number)
+        if account is not None:
+            return account
+        
+        generation = self.cache.generation(account_number)
+        row = await self.async_repository.get_row_by_account_number(db, account_number)
+        if not row:
+            return None
+        
+        account = self._account_to_dict(row)
+        self.cache.set(account_number, account, generation)
+        return account
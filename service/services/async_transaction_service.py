@@ -0,0 +1,68 @@
+"""
+Async Transaction Service - Business Logic Layer (async) untuk Transaction read operations
+Dipakai saat DATABASE_MODE=async; format response dan cursor sama dengan
+TransactionService
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from repository.async_transaction_repository import AsyncTransactionRepository
+from services.transaction_service import TransactionService
+from typing import Optional, Tuple
+from fastapi import HTTPException
+
+
+class AsyncTransactionService(TransactionService):
+    """Service layer async untuk read transaction"""
+
+    def __init__(self):
+        super().__init__()
+        self.async_repository = AsyncTransactionRepository()
+
+    async def get_transaction_by_id_async(self, db: AsyncSession, transaction_id: int) -> dict:
+        """
+        Get transaction berdasarkan ID
+        
+        Args:
+            db: Async database session
+            transaction_id: ID transaction
+        
+        Returns:
+            Dict representasi transaction
+        
+        Raises:
+            HTTPException: Jika transaction tidak ditemukan
+        """
+        transaction = await self.async_repository.get_by_id(db, transaction_id)
+        if not transaction:
+            raise HTTPException(status_code=404, detail="Transaction tidak ditemukan")
+        
+        return self._transaction_to_dict(transaction)
+
+    async def get_transaction_page_by_customer_async(self, db: AsyncSession, customer_id: int,
+                                                     skip: int = 0, limit: int = 100,
+                                                     cursor: Optional[str] = None,
+                                                     expand_counterparty: bool = False) -> Tuple[bytes, Optional[str]]:
+        """
+        Halaman riwayat transaksi customer sebagai JSON bytes (tanpa ORM entity)
+        
+        Returns:
+            Tuple (JSON bytes, cursor halaman berikutnya atau None)
+        """
+        rows = await self.async_repository.get_rows_by_customer_id(
+            db, customer_id, skip, limit, self.decode_cursor(cursor), expand_counterparty
+        )
+        return self.rows_page(rows, limit, expand_counterparty)
+
+    async def get_transaction_page_by_account_async(self, db: AsyncSession, account_number: str,
+                                                    skip: int = 0, limit: int = 100,
+                                                    cursor: Optional[str] = None,
+                                                    expand_counterparty: bool = False) -> Tuple[bytes, Optional[str]]:
+        """
+        Halaman mutasi rekening sebagai JSON bytes (tanpa ORM entity)
+        
+        Returns:
+            Tuple (JSON bytes, cursor halaman berikutnya atau None)
+        """
+        rows = await self.async_repository.get_rows_by_account_number(
+            db, account_number, skip, limit, self.decode_cursor(cursor), expand_counterparty
+        )
+        return self.rows_page(rows, limit, expand_counterparty)
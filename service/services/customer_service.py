@@ -1,10 +1,24 @@
 """
 Customer Service - Business Logic Layer untuk Customer operations
 """
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from repository.customer_repository import CustomerRepository
+from db.unit_of_work import in_unit_of_work
+from db.write_queue import run_write
 from typing import Optional, List
 from fastapi import HTTPException
+from utils.logger import get_logger
+from utils.pin_hash import verify_pin
+
+logger = get_logger(__name__)
+
+# Kolom unique m_customer dan pesan error jika sudah terdaftar
+UNIQUE_CUSTOMER_COLUMNS = (
+    ("customer_username", "Username sudah terdaftar"),
+    ("customer_email", "Email sudah terdaftar"),
+    ("cif_number", "CIF Number sudah terdaftar"),
+)
 
 
 class CustomerService:
@@ -16,6 +30,9 @@ class CustomerService:
     def create_customer(self, db: Session, customer_data: dict) -> dict:
         """
         Create customer baru dengan validasi
+        Keunikan username/email/cif dijamin unique constraint m_customer:
+        insert langsung dijalankan (tanpa SELECT pengecekan), pelanggaran
+        constraint diterjemahkan ke pesan 400 per kolom
         
         Args:
             db: Database session
@@ -27,34 +44,39 @@ class CustomerService:
         Raises:
             HTTPException: Jika username/email/cif sudah terdaftar
         """
-        print(f"🔍 Checking for existing username: {customer_data['customer_username']}")
-        
-        # Validasi username belum dipakai
-        existing_username = self.repository.get_by_username(db, customer_data["customer_username"])
-        if existing_username:
-            print(f"❌ Username {customer_data['customer_username']} already exists")
-            raise HTTPException(status_code=400, detail="Username sudah terdaftar")
-        
-        # Validasi email belum dipakai
-        existing_email = self.repository.get_by_email(db, customer_data["customer_email"])
-        if existing_email:
-            print(f"❌ Email {customer_data['customer_email']} already exists")
-            raise HTTPException(status_code=400, detail="Email sudah terdaftar")
+        try:
+            customer = self.repository.create(db, customer_data)
+        except IntegrityError as exc:
+            # Di dalam unit of work rollback dilakukan oleh unit of work
+            if not in_unit_of_work(db):
+                db.rollback()
+            raise self._duplicate_customer_error(exc, customer_data) from None
         
-        # Validasi CIF belum dipakai
-        existing_cif = self.repository.get_by_cif(db, customer_data["cif_number"])
-        if existing_cif:
-            print(f"❌ CIF {customer_data['cif_number']} already exists")
-            raise HTTPException(status_code=400, detail="CIF Number sudah terdaftar")
-        
-        print(f"✅ Validations passed, creating customer...")
-        
-        # Create customer
-        customer = self.repository.create(db, customer_data)
+        return self._customer_to_dict(customer)
+
+    def _duplicate_customer_error(self, exc: IntegrityError, customer_data: dict) -> Exception:
+        """
+        Terjemahkan IntegrityError insert customer ke HTTPException
+        Kolom yang melanggar dicari dari nama constraint (PostgreSQL) atau
+        pesan error database (SQLite: "UNIQUE constraint failed: m_customer.<kolom>")
         
-        print(f"✅ Customer created successfully: {customer.customer_username}")
+        Args:
+            exc: IntegrityError dari insert
+            customer_data: Data customer yang gagal di-insert
         
-        return self._customer_to_dict(customer)
+        Returns:
+            HTTPException 400, atau exc jika bukan pelanggaran unique yang dikenal
+        """
+        diag = getattr(exc.orig, "diag", None)
+        message = getattr(diag, "constraint_name", None) or str(exc.orig)
+        for column, detail in UNIQUE_CUSTOMER_COLUMNS:
+            if column in message:
+                logger.info("registration rejected: duplicate value", extra={
+                    "column": column,
+                    "customer_username": customer_data.get("customer_username")
+                })
+                return HTTPException(status_code=400, detail=detail)
+        return exc
 
     def get_customer_by_id(self, db: Session, customer_id: int) -> dict:
         """
@@ -70,32 +92,31 @@ class CustomerService:
         Raises:
             HTTPException: Jika customer tidak ditemukan
         """
-        customer = self.repository.get_by_id(db, customer_id)
+        customer = self.repository.get_row_by_id(db, customer_id)
         if not customer:
             raise HTTPException(status_code=404, detail="Customer tidak ditemukan")
         
-        return self._customer_to_dict(customer, include_pin=True)
+        return self._customer_to_dict(customer)
 
     def get_customer_by_username(self, db: Session, username: str) -> dict:
         """
         Get customer berdasarkan username
-        Digunakan untuk proses login di middleware
         
         Args:
             db: Database session
             username: Username customer
         
         Returns:
-            Dict representasi customer (termasuk PIN untuk validasi login)
+            Dict representasi customer (tanpa PIN; verifikasi PIN lewat login())
         
         Raises:
             HTTPException: Jika customer tidak ditemukan
         """
-        customer = self.repository.get_by_username(db, username)
+        customer = self.repository.get_row_by_username(db, username)
         if not customer:
             raise HTTPException(status_code=404, detail="Customer tidak ditemukan")
         
-        return self._customer_to_dict(customer, include_pin=True)
+        return self._customer_to_dict(customer)
 
     def get_all_customers(self, db: Session, skip: int = 0, limit: int = 100) -> List[dict]:
         """
@@ -133,6 +154,53 @@ class CustomerService:
         
         return self._customer_to_dict(customer)
 
+    def login(self, db: Session, username: str, pin: str) -> dict:
+        """
+        Verifikasi login dalam satu panggilan
+        PIN diverifikasi di service (process pool bcrypt), lalu hasilnya dicatat
+        dengan satu UPDATE bersyarat (hanya jika account belum locked):
+        gagal -> increment counter + lock saat mencapai batas,
+        berhasil -> reset counter + update last_login
+        
+        Args:
+            db: Database session (primary)
+            username: Username customer
+            pin: PIN plain text
+        
+        Returns:
+            Dict representasi customer (tanpa PIN)
+        
+        Raises:
+            HTTPException: 401 jika username/PIN salah, 403 jika account locked
+        """
+        customer = self.repository.get_row_by_username(db, username)
+        if not customer:
+            raise HTTPException(status_code=401, detail="Username atau PIN salah")
+        if customer.is_locked:
+            raise HTTPException(status_code=403, detail="Account terkunci")
+        
+        if not verify_pin(pin, customer.customer_pin):
+            result = run_write(db, lambda session: self.repository.increment_failed_login(
+                session, customer.id, unlocked_only=True
+            ))
+            # None: account sudah di-lock oleh percobaan paralel lain
+            if result is None or result.is_locked:
+                logger.warning("login failed: account locked", extra={"customer_id": customer.id})
+                raise HTTPException(status_code=403, detail="Account terkunci")
+            logger.info("login failed: invalid pin", extra={
+                "customer_id": customer.id,
+                "failed_login_attempts": result.failed_login_attempts
+            })
+            raise HTTPException(status_code=401, detail="Username atau PIN salah")
+        
+        result = run_write(db, lambda session: self.repository.reset_failed_login(
+            session, customer.id, unlocked_only=True
+        ))
+        if result is None:
+            raise HTTPException(status_code=403, detail="Account terkunci")
+        
+        return self._customer_to_dict(result)
+
     def handle_failed_login(self, db: Session, customer_id: int) -> dict:
         """
         Handle failed login attempt - increment counter
@@ -182,11 +250,7 @@ class CustomerService:
         Returns:
             True jika locked, False jika tidak
         """
-        customer = self.repository.get_by_id(db, customer_id)
-        if not customer:
-            return False
-        
-        return customer.is_locked
+        return bool(self.repository.get_lock_status(db, customer_id))
 
     def unlock_account(self, db: Session, customer_id: int) -> dict:
         """
@@ -205,18 +269,17 @@ class CustomerService:
         }
         return self.update_customer(db, customer_id, update_data)
 
-    def _customer_to_dict(self, customer, include_pin: bool = False) -> dict:
+    def _customer_to_dict(self, customer) -> dict:
         """
         Convert Customer object to dict
         
         Args:
-            customer: Customer object
-            include_pin: Include PIN dalam response (untuk login validation)
+            customer: Customer object atau Row (CUSTOMER_ROW_FIELDS)
         
         Returns:
             Dict representasi customer
         """
-        data = {
+        return {
             "id": customer.id,
             "customer_name": customer.customer_name,
             "customer_username": customer.customer_username,
@@ -229,9 +292,3 @@ class CustomerService:
             "created_at": customer.created_at.isoformat() if customer.created_at else None,
             "updated_at": customer.updated_at.isoformat() if customer.updated_at else None
         }
-        
-        # Include PIN hanya jika diminta (untuk validasi login)
-        if include_pin:
-            data["customer_pin"] = customer.customer_pin
-        
-        return data
@@ -0,0 +1,75 @@
+"""
+Dashboard Service - Business Logic Layer untuk ringkasan customer saat app
+dibuka: profil, account aktif + total saldo, dan transaksi terbaru dalam
+satu response (menggantikan tiga panggilan service terpisah)
+"""
+from sqlalchemy.orm import Session
+from repository.customer_repository import CustomerRepository
+from repository.transaction_repository import TransactionRepository
+from services.customer_service import CustomerService
+from services.account_service import AccountService
+from services.transaction_service import TransactionService
+from fastapi import HTTPException
+import os
+
+# Jumlah maksimal transaksi terbaru di dashboard
+DASHBOARD_RECENT_MAX = int(os.getenv("DASHBOARD_RECENT_MAX", "50"))
+
+
+class DashboardService:
+    """Service layer untuk agregat dashboard customer"""
+
+    def __init__(self):
+        self.customer_repository = CustomerRepository()
+        self.transaction_repository = TransactionRepository()
+        self.customer_service = CustomerService()
+        self.account_service = AccountService()
+        self.transaction_service = TransactionService()
+
+    def get_dashboard(self, db: Session, customer_id: int, recent_limit: int = 5) -> dict:
+        """
+        Get dashboard customer
+        Customer + account aktif di-load dengan selectinload, total saldo
+        dihitung dengan SUM di SQL, transaksi terbaru dibatasi recent_limit
+        (sudah termasuk nama rekening asal/tujuan)
+
+        Args:
+            db: Database session
+            customer_id: ID customer
+            recent_limit: Jumlah transaksi terbaru (1..DASHBOARD_RECENT_MAX)
+
+        Returns:
+            Dict berisi customer, accounts, total_balance, recent_transactions
+
+        Raises:
+            HTTPException: Jika recent_limit tidak valid atau customer tidak ditemukan
+        """
+        if recent_limit < 1 or recent_limit > DASHBOARD_RECENT_MAX:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Jumlah transaksi terbaru harus antara 1 dan {DASHBOARD_RECENT_MAX}"
+            )
+
+        result = self.customer_repository.get_with_active_accounts(db, customer_id)
+        if not result:
+            raise HTTPException(status_code=404, detail="Customer tidak ditemukan")
+        customer, total_balance = result
+
+        transactions = self.transaction_repository.get_rows_by_customer_id(
+            db, customer_id, 0, recent_limit, expand_counterparty=True
+        )
+
+        accounts = sorted(customer.accounts, key=lambda account: account.id)
+        return {
+            "customer": self.customer_service._customer_to_dict(customer),
+            "accounts": [self.account_service._account_to_dict(account) for account in accounts],
+            "total_balance": float(total_balance),
+            "recent_transactions": [self._recent_to_dict(transaction) for transaction in transactions]
+        }
+
+    def _recent_to_dict(self, transaction) -> dict:
+        """Convert Row transaksi (TRANSACTION_COUNTERPARTY_FIELDS) to dict"""
+        data = self.transaction_service._transaction_to_dict(transaction)
+        data["from_account_name"] = transaction.from_account_name
+        data["to_account_name"] = transaction.to_account_name
+        return data
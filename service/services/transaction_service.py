@@ -2,10 +2,32 @@
 Transaction Service - Business Logic Layer untuk Transaction operations
 """
 from sqlalchemy.orm import Session
-from repository.transaction_repository import TransactionRepository
-from typing import Optional, List
+from sqlalchemy.exc import SQLAlchemyError
+from db.unit_of_work import savepoint
+from repository.transaction_repository import (
+    TransactionRepository, TRANSACTION_ROW_FIELDS, TRANSACTION_COUNTERPARTY_FIELDS
+)
+from utils.serialization import rows_to_json
+from typing import Optional, List, Tuple, Iterator, Callable
 from datetime import datetime
 from fastapi import HTTPException
+import base64
+import csv
+import io
+import json
+import os
+
+# Jumlah row per bulk INSERT untuk batch ingestion
+BATCH_CHUNK_SIZE = int(os.getenv("TRANSACTION_BATCH_CHUNK_SIZE", "1000"))
+
+# Jumlah row per fetch saat streaming export mutasi
+EXPORT_BATCH_SIZE = int(os.getenv("TRANSACTION_EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_COLUMNS = [
+    "id", "m_customer_id", "transaction_type", "transaction_amount",
+    "from_account_number", "to_account_number", "status", "description",
+    "transaction_date", "created_at"
+]
 
 
 class TransactionService:
@@ -29,6 +51,42 @@ class TransactionService:
         transaction = self.repository.create(db, transaction_data)
         return self._transaction_to_dict(transaction)
 
+    def create_transactions_batch(self, db: Session,
+                                  indexed_rows: List[Tuple[int, dict]]) -> List[dict]:
+        """
+        Insert satu chunk transaction dengan bulk INSERT dan satu commit
+        Jika chunk gagal (mis. constraint violation), chunk di-rollback lalu
+        di-insert ulang per row agar error bisa dilaporkan per row (SAVEPOINT
+        jika dijalankan di dalam unit of work / single writer)
+        
+        Args:
+            db: Database session
+            indexed_rows: List of (index di request, data transaction)
+        
+        Returns:
+            List of dict {"index", "id", "error"} per row
+        """
+        rows = [data for _, data in indexed_rows]
+        try:
+            with savepoint(db):
+                ids = self.repository.bulk_create(db, rows)
+            return [
+                {"index": index, "id": new_id, "error": None}
+                for (index, _), new_id in zip(indexed_rows, ids)
+            ]
+        except SQLAlchemyError:
+            pass
+        
+        results = []
+        for index, data in indexed_rows:
+            try:
+                with savepoint(db):
+                    ids = self.repository.bulk_create(db, [data])
+                results.append({"index": index, "id": ids[0], "error": None})
+            except SQLAlchemyError as exc:
+                results.append({"index": index, "id": None, "error": str(getattr(exc, "orig", None) or exc)})
+        return results
+
     def get_transaction_by_id(self, db: Session, transaction_id: int) -> dict:
         """
         Get transaction berdasarkan ID
@@ -49,41 +107,111 @@ class TransactionService:
         
         return self._transaction_to_dict(transaction)
 
-    def get_transactions_by_customer(self, db: Session, customer_id: int, 
-                                     skip: int = 0, limit: int = 100) -> List[dict]:
+    def get_transaction_page_by_customer(self, db: Session, customer_id: int,
+                                         skip: int = 0, limit: int = 100,
+                                         cursor: Optional[str] = None,
+                                         expand_counterparty: bool = False) -> Tuple[bytes, Optional[str]]:
         """
-        Get semua transaction milik customer
-        Digunakan untuk riwayat transaksi
+        Halaman riwayat transaksi customer untuk endpoint list:
+        kolom diambil sebagai tuple lalu langsung di-encode ke JSON bytes
+        (format sama dengan _transaction_to_dict)
         
         Args:
             db: Database session
             customer_id: ID customer
             skip: Offset pagination
             limit: Limit pagination
+            cursor: Opaque cursor dari halaman sebelumnya (keyset pagination)
+            expand_counterparty: Tambahkan from_account_name/to_account_name
         
         Returns:
-            List of transaction dicts
+            Tuple (JSON bytes, cursor halaman berikutnya atau None)
         """
-        transactions = self.repository.get_by_customer_id(db, customer_id, skip, limit)
-        return [self._transaction_to_dict(t) for t in transactions]
+        rows = self.repository.get_rows_by_customer_id(
+            db, customer_id, skip, limit, self.decode_cursor(cursor), expand_counterparty
+        )
+        return self.rows_page(rows, limit, expand_counterparty)
 
-    def get_transactions_by_account(self, db: Session, account_number: str, 
-                                    skip: int = 0, limit: int = 100) -> List[dict]:
+    def get_transaction_page_by_account(self, db: Session, account_number: str,
+                                        skip: int = 0, limit: int = 100,
+                                        cursor: Optional[str] = None,
+                                        expand_counterparty: bool = False) -> Tuple[bytes, Optional[str]]:
         """
-        Get semua transaction dari/ke account tertentu
-        Digunakan untuk mutasi rekening
+        Halaman mutasi rekening (dari/ke account) untuk endpoint list
+        (lihat get_transaction_page_by_customer)
+        
+        Returns:
+            Tuple (JSON bytes, cursor halaman berikutnya atau None)
+        """
+        rows = self.repository.get_rows_by_account_number(
+            db, account_number, skip, limit, self.decode_cursor(cursor), expand_counterparty
+        )
+        return self.rows_page(rows, limit, expand_counterparty)
+
+    def rows_page(self, rows: List, limit: int,
+                  expand_counterparty: bool = False) -> Tuple[bytes, Optional[str]]:
+        """
+        Encode satu halaman row (TRANSACTION_ROW_FIELDS) dan buat cursor berikutnya
         
         Args:
-            db: Database session
-            account_number: Nomor rekening
-            skip: Offset pagination
-            limit: Limit pagination
+            rows: Row hasil query (urut transaction_date desc, id desc)
+            limit: Limit pagination yang dipakai
+            expand_counterparty: Row berisi TRANSACTION_COUNTERPARTY_FIELDS
         
         Returns:
-            List of transaction dicts
+            Tuple (JSON bytes, cursor halaman berikutnya atau None)
         """
-        transactions = self.repository.get_by_account_number(db, account_number, skip, limit)
-        return [self._transaction_to_dict(t) for t in transactions]
+        next_cursor = None
+        if rows and len(rows) >= limit and rows[-1].transaction_date:
+            next_cursor = self._encode_cursor(rows[-1].transaction_date.isoformat(), rows[-1].id)
+        fields = TRANSACTION_COUNTERPARTY_FIELDS if expand_counterparty else TRANSACTION_ROW_FIELDS
+        return rows_to_json(fields, rows), next_cursor
+
+    def parse_expand(self, expand: Optional[str]) -> bool:
+        """
+        Parse query parameter expand endpoint riwayat transaksi
+        
+        Args:
+            expand: None atau "counterparty"
+        
+        Returns:
+            True jika nama rekening counterparty perlu disertakan
+        
+        Raises:
+            HTTPException: Jika nilai expand tidak didukung
+        """
+        if not expand:
+            return False
+        if expand != "counterparty":
+            raise HTTPException(status_code=400, detail="Nilai expand tidak didukung (gunakan expand=counterparty)")
+        return True
+
+    def _encode_cursor(self, transaction_date: str, transaction_id: int) -> str:
+        """Encode (transaction_date isoformat, id) menjadi opaque cursor"""
+        raw = json.dumps([transaction_date, transaction_id]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+        """
+        Decode opaque cursor menjadi (transaction_date, id)
+        
+        Args:
+            cursor: Cursor string dari rows_page() atau None
+        
+        Returns:
+            Tuple (transaction_date, id) atau None
+        
+        Raises:
+            HTTPException: Jika cursor tidak valid
+        """
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            transaction_date, transaction_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(transaction_date), int(transaction_id)
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Cursor tidak valid")
 
     def get_transactions_by_date_range(self, db: Session, customer_id: int,
                                        start_date: str, end_date: str) -> List[dict]:
@@ -106,6 +234,59 @@ class TransactionService:
         transactions = self.repository.get_by_date_range(db, customer_id, start_dt, end_dt)
         return [self._transaction_to_dict(t) for t in transactions]
 
+    def export_transactions_by_account(self, session_factory: Callable[[], Session],
+                                       account_number: str, export_format: str = "ndjson",
+                                       start_date: Optional[datetime] = None,
+                                       end_date: Optional[datetime] = None) -> Iterator[str]:
+        """
+        Generator export mutasi rekening dalam format NDJSON atau CSV
+        Session dibuat sendiri oleh generator karena hidup selama response
+        di-stream (lebih lama dari request dependency)
+        
+        Args:
+            session_factory: Factory database session (mis. open_read_session)
+            account_number: Nomor rekening
+            export_format: "ndjson" atau "csv"
+            start_date: Tanggal mulai (opsional)
+            end_date: Tanggal akhir (opsional)
+        
+        Yields:
+            Potongan output: header CSV, row pertama, lalu satu potong per batch row
+        """
+        db = session_factory()
+        try:
+            transactions = self.repository.stream_by_account_number(
+                db, account_number, start_date, end_date, EXPORT_BATCH_SIZE
+            )
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+            if export_format == "csv":
+                # Header langsung dikirim sebelum row pertama di-fetch
+                writer.writeheader()
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+            
+            count = 0
+            for transaction in transactions:
+                data = self._transaction_to_dict(transaction)
+                if export_format == "csv":
+                    writer.writerow(data)
+                else:
+                    buffer.write(json.dumps(data))
+                    buffer.write("\n")
+                count += 1
+                # Row pertama di-flush sendiri agar byte pertama tidak menunggu satu batch penuh
+                if count == 1 or count % EXPORT_BATCH_SIZE == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate(0)
+            
+            if buffer.tell():
+                yield buffer.getvalue()
+        finally:
+            db.close()
+
     def get_transactions_by_type(self, db: Session, customer_id: int, 
                                  transaction_type: str) -> List[dict]:
         """
@@ -0,0 +1,211 @@
+"""
+Transfer Service - Business Logic Layer untuk transfer antar rekening dan
+tarik/setor tunai. Perubahan saldo dan pencatatan transaksi dilakukan dalam
+satu unit of work (satu commit)
+"""
+from sqlalchemy.orm import Session
+from db.unit_of_work import unit_of_work, after_commit
+from repository.account_repository import AccountRepository
+from repository.transaction_repository import TransactionRepository
+from services.transaction_service import TransactionService
+from cache.account_cache import get_account_cache
+from decimal import Decimal
+from fastapi import HTTPException
+
+
+class TransferService:
+    """Service layer untuk transfer atomik antar rekening"""
+
+    def __init__(self):
+        self.account_repository = AccountRepository()
+        self.transaction_repository = TransactionRepository()
+        self.transaction_service = TransactionService()
+        self.cache = get_account_cache()
+
+    def transfer(self, db: Session, m_customer_id: int, from_account_number: str,
+                 to_account_number: str, amount: float, description: str = None) -> dict:
+        """
+        Transfer saldo dari satu rekening ke rekening lain secara atomik
+        Debit (conditional UPDATE, saldo divalidasi di WHERE clause) + credit
+        + insert transaksi dilakukan dalam satu unit of work lalu di-commit
+        sekali; rollback jika validasi gagal
+        
+        Args:
+            db: Database session
+            m_customer_id: ID customer pemilik rekening sumber
+            from_account_number: Nomor rekening sumber
+            to_account_number: Nomor rekening tujuan
+            amount: Jumlah transfer
+            description: Keterangan transfer
+        
+        Returns:
+            Dict berisi transaction dan saldo terbaru kedua rekening
+        
+        Raises:
+            HTTPException: Jika input tidak valid, account tidak ditemukan,
+                          bukan milik customer, atau saldo tidak cukup
+        """
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Jumlah transfer harus lebih dari 0")
+        if from_account_number == to_account_number:
+            raise HTTPException(status_code=400, detail="Rekening sumber dan tujuan tidak boleh sama")
+        
+        amount_decimal = Decimal(str(amount))
+        
+        with unit_of_work(db):
+            after_commit(db, lambda: self.cache.invalidate(from_account_number))
+            after_commit(db, lambda: self.cache.invalidate(to_account_number))
+            # Conditional UPDATE per rekening, urut account number agar
+            # lock row selalu diambil dengan urutan yang sama (tidak deadlock)
+            accounts = {}
+            for account_number in sorted([from_account_number, to_account_number]):
+                if account_number == from_account_number:
+                    accounts[account_number] = self.account_repository.debit(
+                        db, account_number, amount_decimal
+                    )
+                else:
+                    accounts[account_number] = self.account_repository.credit(
+                        db, account_number, amount_decimal
+                    )
+            source = accounts[from_account_number]
+            destination = accounts[to_account_number]
+        
+            if not destination:
+                raise HTTPException(status_code=404, detail="Account tidak ditemukan")
+            if not source:
+                # Conditional UPDATE tidak mengenai row: bedakan not found,
+                # bukan milik customer, dan saldo kurang
+                source = self.account_repository.get_by_account_number(db, from_account_number)
+                if not source:
+                    raise HTTPException(status_code=404, detail="Account tidak ditemukan")
+                if source.m_customer_id != m_customer_id:
+                    raise HTTPException(status_code=403, detail="Rekening sumber bukan milik customer")
+                raise HTTPException(status_code=400, detail="Saldo tidak mencukupi")
+            if source.m_customer_id != m_customer_id:
+                raise HTTPException(status_code=403, detail="Rekening sumber bukan milik customer")
+        
+            transaction = self.transaction_repository.create(db, {
+                "m_customer_id": m_customer_id,
+                "transaction_type": "TR",
+                "transaction_amount": amount_decimal,
+                "from_account_number": from_account_number,
+                "to_account_number": to_account_number,
+                "status": "SUCCESS",
+                "description": description
+            })
+        
+        return {
+            "transaction": self.transaction_service._transaction_to_dict(transaction),
+            "from_account": self._balance_to_dict(source),
+            "to_account": self._balance_to_dict(destination)
+        }
+
+    def withdraw(self, db: Session, m_customer_id: int, account_number: str,
+                 amount: float, description: str = "Tarik Tunai") -> dict:
+        """
+        Tarik tunai: debit saldo dan catat transaksi WD dalam satu commit
+        
+        Args:
+            db: Database session
+            m_customer_id: ID customer pemilik rekening
+            account_number: Nomor rekening
+            amount: Jumlah penarikan
+            description: Keterangan transaksi
+        
+        Returns:
+            Dict berisi transaction dan saldo terbaru rekening
+        
+        Raises:
+            HTTPException: Jika jumlah tidak valid, account tidak ditemukan,
+                          bukan milik customer, atau saldo tidak cukup
+        """
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Jumlah penarikan harus lebih dari 0")
+        
+        amount_decimal = Decimal(str(amount))
+        with unit_of_work(db):
+            after_commit(db, lambda: self.cache.invalidate(account_number))
+            account = self.account_repository.debit(db, account_number, amount_decimal)
+            if not account:
+                # Conditional UPDATE tidak mengenai row: bedakan not found vs saldo kurang
+                if not self.account_repository.get_by_account_number(db, account_number):
+                    raise HTTPException(status_code=404, detail="Account tidak ditemukan")
+                raise HTTPException(status_code=400, detail="Saldo tidak mencukupi")
+            if account.m_customer_id != m_customer_id:
+                raise HTTPException(status_code=403, detail="Rekening bukan milik customer")
+        
+            transaction = self.transaction_repository.create(db, {
+                "m_customer_id": m_customer_id,
+                "transaction_type": "WD",
+                "transaction_amount": amount_decimal,
+                "from_account_number": account_number,
+                "status": "SUCCESS",
+                "description": description
+            })
+        
+        return {
+            "transaction": self.transaction_service._transaction_to_dict(transaction),
+            "account": self._balance_to_dict(account)
+        }
+
+    def deposit(self, db: Session, m_customer_id: int, account_number: str,
+                amount: float, description: str = "Setor Tunai") -> dict:
+        """
+        Setor tunai: credit saldo dan catat transaksi DP dalam satu commit
+        
+        Args:
+            db: Database session
+            m_customer_id: ID customer pemilik rekening
+            account_number: Nomor rekening
+            amount: Jumlah setoran
+            description: Keterangan transaksi
+        
+        Returns:
+            Dict berisi transaction dan saldo terbaru rekening
+        
+        Raises:
+            HTTPException: Jika jumlah tidak valid, account tidak ditemukan
+                          atau bukan milik customer
+        """
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Jumlah setoran harus lebih dari 0")
+        
+        amount_decimal = Decimal(str(amount))
+        with unit_of_work(db):
+            after_commit(db, lambda: self.cache.invalidate(account_number))
+            account = self.account_repository.credit(db, account_number, amount_decimal)
+            if not account:
+                raise HTTPException(status_code=404, detail="Account tidak ditemukan")
+            if account.m_customer_id != m_customer_id:
+                raise HTTPException(status_code=403, detail="Rekening bukan milik customer")
+        
+            transaction = self.transaction_repository.create(db, {
+                "m_customer_id": m_customer_id,
+                "transaction_type": "DP",
+                "transaction_amount": amount_decimal,
+                "to_account_number": account_number,
+                "status": "SUCCESS",
+                "description": description
+            })
+        
+        return {
+            "transaction": self.transaction_service._transaction_to_dict(transaction),
+            "account": self._balance_to_dict(account)
+        }
+
+    def _balance_to_dict(self, account) -> dict:
+        """
+        Convert PortfolioAccount object to dict saldo ringkas
+        
+        Args:
+            account: PortfolioAccount object
+        
+        Returns:
+            Dict berisi account number, nama dan saldo
+        """
+        return {
+            "account_number": account.account_number,
+            "account_name": account.account_name,
+            "clear_balance": float(account.clear_balance),
+            "available_balance": float(account.available_balance)
+        }
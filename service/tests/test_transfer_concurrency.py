@@ -0,0 +1,90 @@
+"""
+Test concurrency TransferService.transfer: transfer paralel dari satu
+rekening tidak boleh overdraft dan saldo harus cocok dengan ledger transaksi
+
+Jalankan dari folder service: python -m pytest -q tests
+"""
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+import os
+import sys
+import tempfile
+
+# Database sementara; harus di-set sebelum modul db di-import
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/transfer_test.db"
+os.environ.setdefault("SQLITE_WRITER_ENABLED", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from db.database import SessionLocal, init_db
+from db.models import Customer, PortfolioAccount, Transaction
+from services.transfer_service import TransferService
+
+INITIAL_BALANCE = Decimal("100.00")
+AMOUNT = Decimal("10.00")
+TRANSFERS = 25
+
+
+def _seed(db):
+    owner = Customer(customer_name="Owner", customer_username="owner", customer_pin="x",
+                     customer_email="owner@example.com", customer_phone="1", cif_number="CIF1")
+    other = Customer(customer_name="Other", customer_username="other", customer_pin="x",
+                     customer_email="other@example.com", customer_phone="2", cif_number="CIF2")
+    db.add_all([owner, other])
+    db.flush()
+    db.add_all([
+        PortfolioAccount(m_customer_id=owner.id, account_number="1001", account_name="Owner",
+                         account_type="SAV", clear_balance=INITIAL_BALANCE,
+                         available_balance=INITIAL_BALANCE),
+        PortfolioAccount(m_customer_id=other.id, account_number="2002", account_name="Other",
+                         account_type="SAV", clear_balance=0, available_balance=0),
+    ])
+    db.commit()
+    return owner.id
+
+
+def test_concurrent_transfers_do_not_overdraw():
+    init_db()
+    db = SessionLocal()
+    try:
+        owner_id = _seed(db)
+    finally:
+        db.close()
+
+    transfer_service = TransferService()
+
+    def transfer(_):
+        session = SessionLocal()
+        try:
+            transfer_service.transfer(session, owner_id, "1001", "2002", float(AMOUNT))
+            return "SUCCESS"
+        except HTTPException as exc:
+            assert exc.status_code == 400, exc.detail
+            return "REJECTED"
+        finally:
+            session.close()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(transfer, range(TRANSFERS)))
+
+    db = SessionLocal()
+    try:
+        source = db.query(PortfolioAccount).filter_by(account_number="1001").one()
+        destination = db.query(PortfolioAccount).filter_by(account_number="2002").one()
+        ledger_count, ledger_total = db.query(
+            func.count(Transaction.id), func.coalesce(func.sum(Transaction.transaction_amount), 0)
+        ).filter(Transaction.transaction_type == "TR",
+                 Transaction.from_account_number == "1001").one()
+    finally:
+        db.close()
+
+    successes = results.count("SUCCESS")
+    assert successes == int(INITIAL_BALANCE / AMOUNT)
+    assert source.available_balance >= 0
+    assert source.clear_balance == source.available_balance
+    assert ledger_count == successes
+    assert Decimal(ledger_total) == successes * AMOUNT
+    assert source.available_balance == INITIAL_BALANCE - Decimal(ledger_total)
+    assert destination.available_balance == Decimal(ledger_total)
@@ -0,0 +1,73 @@
+"""
+Logging configuration - structured (JSON) logging untuk service layer
+Menggantikan print() agar log bisa diproses oleh log collector dan
+level-nya bisa diatur lewat environment
+
+Environment:
+    LOG_LEVEL: debug, info (default), warning, error
+    LOG_FORMAT: json (default) atau text
+"""
+import json
+import logging
+import os
+import sys
+from datetime import datetime, timezone
+
+# Atribut bawaan LogRecord; atribut lain dianggap field tambahan (extra=...)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log record sebagai satu baris JSON (termasuk field dari extra=...)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+_configured = False
+
+
+def setup_logging() -> None:
+    """
+    Konfigurasi root logger sekali per proses
+    Dipanggil saat aplikasi start (main.py)
+    """
+    global _configured
+    if _configured:
+        return
+
+    level = os.getenv("LOG_LEVEL", "info").upper()
+    handler = logging.StreamHandler(sys.stdout)
+    if os.getenv("LOG_FORMAT", "json").lower() == "text":
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+    _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get logger untuk module tertentu
+
+    Args:
+        name: Nama logger (biasanya __name__)
+
+    Returns:
+        logging.Logger
+    """
+    return logging.getLogger(name)
@@ -0,0 +1,364 @@
+"""
+Metrics - registry metrics in-process dengan format text Prometheus
+Berisi histogram latency request per route, latency query per method
+repository, waktu tunggu koneksi vs eksekusi query per request, dan gauge
+connection pool (dibaca saat /metrics di-scrape)
+"""
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import functools
+import inspect
+import os
+import threading
+import time
+
+# Tambahkan header Server-Timing (db-wait, db-exec) di setiap response
+SERVER_TIMING_ENABLED = os.getenv("METRICS_SERVER_TIMING", "true").lower() == "true"
+
+# Bucket latency dalam detik (mengikuti default prometheus_client + 10s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    """Format label Prometheus: {a="x",b="y"}"""
+    parts = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(labelnames, labelvalues)
+    ]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """Histogram dengan label (thread-safe)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labelvalues: Tuple[str, ...], value: float) -> None:
+        """
+        Catat satu observasi
+
+        Args:
+            labelvalues: Nilai label sesuai urutan labelnames
+            value: Nilai observasi (detik untuk latency)
+        """
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # [count per bucket (+Inf di akhir), sum]
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        for labelvalues, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, labelvalues, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += counts[-1]
+            labels = _format_labels(self.labelnames, labelvalues, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Gauge yang nilainya dibaca dari callback saat render
+    Gauge berlabel bisa punya beberapa series (satu callback per series)
+    """
+
+    def __init__(self, name: str, documentation: str,
+                 read: Optional[Callable[[], Optional[float]]] = None,
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: List[Tuple[Tuple[str, ...], Callable[[], Optional[float]]]] = []
+        if read is not None:
+            self.add((), read)
+
+    def add(self, labelvalues: Tuple[str, ...], read: Callable[[], Optional[float]]) -> None:
+        """
+        Tambahkan series
+
+        Args:
+            labelvalues: Nilai label sesuai urutan labelnames
+            read: Callback nilai (None = series tidak di-render)
+        """
+        self._series.append((labelvalues, read))
+
+    def render(self) -> List[str]:
+        samples = []
+        for labelvalues, read in self._series:
+            value = read()
+            if value is not None:
+                labels = _format_labels(self.labelnames, labelvalues)
+                samples.append(f"{self.name}{labels} {_format_value(value)}")
+        if not samples:
+            return []
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} gauge",
+            *samples,
+        ]
+
+
+class MetricsRegistry:
+    """Kumpulan metric yang di-render oleh endpoint /metrics"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_LATENCY = REGISTRY.register(Histogram(
+    "service_http_request_duration_seconds",
+    "Latency request HTTP per route",
+    ("method", "route", "status"),
+))
+
+REPOSITORY_LATENCY = REGISTRY.register(Histogram(
+    "service_db_repository_duration_seconds",
+    "Latency method repository (termasuk round trip database)",
+    ("repository", "method", "outcome"),
+))
+
+
+DB_CONNECTION_WAIT = REGISTRY.register(Histogram(
+    "service_db_connection_wait_seconds",
+    "Total waktu checkout koneksi dari pool per request (antri pool + connect + pre-ping)",
+    ("route",),
+))
+
+DB_EXECUTE = REGISTRY.register(Histogram(
+    "service_db_execute_seconds",
+    "Total waktu eksekusi statement di database per request",
+    ("route",),
+))
+
+
+class DbTiming:
+    """Akumulasi waktu database selama satu request"""
+    __slots__ = ("wait", "execute", "checkouts", "statements")
+
+    def __init__(self):
+        self.wait = 0.0
+        self.execute = 0.0
+        self.checkouts = 0
+        self.statements = 0
+
+
+# Di-set oleh MetricsMiddleware; object yang sama terlihat di threadpool
+# endpoint sync karena context di-copy (bukan object-nya)
+_db_timing: ContextVar[Optional[DbTiming]] = ContextVar("db_timing", default=None)
+
+
+def install_db_timing(engine) -> None:
+    """
+    Ukur waktu checkout koneksi (Engine.raw_connection) dan eksekusi
+    statement (before/after_cursor_execute) untuk request yang sedang berjalan.
+    Untuk AsyncEngine, pasang pada engine.sync_engine
+
+    Args:
+        engine: SQLAlchemy (sync) engine
+    """
+    raw_connection = engine.raw_connection
+
+    @functools.wraps(raw_connection)
+    def timed_raw_connection():
+        timing = _db_timing.get()
+        if timing is None:
+            return raw_connection()
+        started = time.perf_counter()
+        try:
+            return raw_connection()
+        finally:
+            timing.wait += time.perf_counter() - started
+            timing.checkouts += 1
+
+    engine.raw_connection = timed_raw_connection
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _db_timing.get() is not None:
+            conn.info["db_timing_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        timing = _db_timing.get()
+        started = conn.info.pop("db_timing_started", None)
+        if timing is not None and started is not None:
+            timing.execute += time.perf_counter() - started
+            timing.statements += 1
+
+
+# Gauge connection pool per nama metric (satu series per engine)
+_pool_gauges: Dict[str, Gauge] = {}
+
+
+def register_pool_gauges(engine, database: str = "primary", prefix: str = "service_db_pool") -> None:
+    """
+    Daftarkan gauge connection pool dari engine (QueuePool) dengan label
+    database (primary atau URL read replica)
+    Pool tanpa ukuran tetap (mis. SQLite in-memory) tidak menghasilkan gauge
+
+    Args:
+        engine: SQLAlchemy engine
+        database: Nilai label database
+        prefix: Prefix nama metric
+    """
+    pool = engine.pool
+
+    def read(method: str, transform: Callable[[float], float] = lambda value: value) -> Callable[[], Optional[float]]:
+        def _read():
+            reader = getattr(pool, method, None)
+            return transform(reader()) if reader else None
+        return _read
+
+    gauges = (
+        ("size", "Ukuran pool (pool_size)", read("size")),
+        ("checked_out", "Koneksi yang sedang dipakai", read("checkedout")),
+        ("checked_in", "Koneksi idle di pool", read("checkedin")),
+        # QueuePool.overflow() negatif selama koneksi yang dibuat < pool_size
+        ("overflow", "Koneksi overflow di atas pool_size", read("overflow", lambda value: max(0, value))),
+    )
+    for suffix, documentation, reader in gauges:
+        name = f"{prefix}_{suffix}"
+        gauge = _pool_gauges.get(name)
+        if gauge is None:
+            gauge = _pool_gauges[name] = REGISTRY.register(Gauge(name, documentation, labelnames=("database",)))
+        gauge.add((database,), reader)
+
+
+def _timed(repository: str, name: str, func: Callable) -> Callable:
+    """Bungkus method repository (sync atau async) dengan pencatatan latency"""
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                REPOSITORY_LATENCY.observe((repository, name, outcome), time.perf_counter() - started)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = func(*args, **kwargs)
+            outcome = "ok"
+            return result
+        finally:
+            REPOSITORY_LATENCY.observe((repository, name, outcome), time.perf_counter() - started)
+    return wrapper
+
+
+def instrument_repository(cls):
+    """
+    Class decorator: catat latency setiap public staticmethod repository
+    yang menerima `db` sebagai parameter pertama. Statement builder dan
+    generator (streaming) tidak diukur
+
+    Args:
+        cls: Class repository
+
+    Returns:
+        Class yang sama dengan method terinstrumentasi
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not isinstance(attribute, staticmethod):
+            continue
+        func = attribute.__func__
+        if inspect.isgeneratorfunction(func):
+            continue
+        parameters = list(inspect.signature(func).parameters)
+        if not parameters or parameters[0] != "db":
+            continue
+        setattr(cls, name, staticmethod(_timed(cls.__name__, name, func)))
+    return cls
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware pencatat latency request per route template
+    (mis. /service/account/number/{account_number}) agar cardinality label terbatas
+    """
+
+    def __init__(self, app, excluded_paths: Sequence[str] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = set(excluded_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+        timing = DbTiming()
+        token = _db_timing.set(timing)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if SERVER_TIMING_ENABLED:
+                    message["headers"] = list(message.get("headers", [])) + [(
+                        b"server-timing",
+                        "db-wait;dur={:.3f}, db-exec;dur={:.3f};desc=\"{} stmt\"".format(
+                            timing.wait * 1000, timing.execute * 1000, timing.statements
+                        ).encode()
+                    )]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _db_timing.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUEST_LATENCY.observe(
+                (scope["method"], route_path, str(status["code"])),
+                time.perf_counter() - started
+            )
+            if timing.checkouts:
+                DB_CONNECTION_WAIT.observe((route_path,), timing.wait)
+                DB_EXECUTE.observe((route_path,), timing.execute)
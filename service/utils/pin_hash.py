@@ -0,0 +1,111 @@
+"""
+PIN hash - verifikasi PIN (bcrypt, hash dibuat middleware dengan bcryptjs)
+di process pool terpisah
+
+bcrypt sengaja lambat (~50-100 ms per verifikasi); dijalankan di process
+pool agar tidak memakai CPU worker API dan tidak memblok request lain
+
+Environment:
+    PIN_HASH_WORKERS: jumlah process verifikasi (default min(4, jumlah CPU);
+                      0 = verifikasi langsung di thread request)
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import multiprocessing
+import os
+import re
+import threading
+
+try:
+    import bcrypt
+except ImportError:  # pragma: no cover - hanya dibutuhkan endpoint login
+    bcrypt = None
+
+PIN_HASH_WORKERS = int(os.getenv("PIN_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Format hash bcrypt ($2a$/$2b$/$2y$, cost 2 digit, salt + hash 53 karakter)
+BCRYPT_HASH = re.compile(r"\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def check_pin(pin: str, pin_hash: str) -> bool:
+    """
+    Bandingkan PIN dengan hash bcrypt ($2a$/$2b$)
+
+    Args:
+        pin: PIN plain text
+        pin_hash: Hash bcrypt yang tersimpan
+
+    Returns:
+        True jika cocok; False jika tidak cocok atau hash tidak valid
+    """
+    if bcrypt is None:
+        raise RuntimeError("bcrypt belum terinstall (pip install bcrypt)")
+    try:
+        return bcrypt.checkpw(pin.encode("utf-8"), pin_hash.encode("utf-8"))
+    except ValueError:
+        return False
+
+
+def is_pin_hash(value: str) -> bool:
+    """
+    Cek apakah nilai berformat hash bcrypt (satu-satunya format yang bisa
+    diverifikasi login)
+
+    Args:
+        value: Nilai customer_pin
+
+    Returns:
+        True jika berformat hash bcrypt
+    """
+    return BCRYPT_HASH.fullmatch(value) is not None
+
+
+def get_pin_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Get process pool verifikasi PIN (dibuat saat pertama dipakai)
+    Process dibuat dengan start method spawn (aman untuk proses API yang
+    multi-thread)
+
+    Returns:
+        ProcessPoolExecutor, atau None jika PIN_HASH_WORKERS=0
+    """
+    global _pool
+    if PIN_HASH_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=PIN_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+    return _pool
+
+
+def verify_pin(pin: str, pin_hash: str) -> bool:
+    """
+    Verifikasi PIN di process pool (blocking sampai hasil tersedia)
+
+    Args:
+        pin: PIN plain text
+        pin_hash: Hash bcrypt yang tersimpan
+
+    Returns:
+        True jika PIN cocok
+    """
+    pool = get_pin_pool()
+    if pool is None:
+        return check_pin(pin, pin_hash)
+    return pool.submit(check_pin, pin, pin_hash).result()
+
+
+def stop_pin_pool() -> None:
+    """Hentikan process pool (dipanggil saat shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,60 @@
+"""
+Serialization - encode hasil query langsung ke JSON bytes
+Dipakai endpoint list (riwayat transaksi) agar row tidak dikonversi dua kali
+(ORM -> dict -> validasi response_model -> json). Memakai orjson jika
+terinstall, fallback ke json standar dengan output yang sama
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Sequence
+from fastapi import Response
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson opsional
+    orjson = None
+
+
+def _default(value):
+    """Konversi tipe yang tidak didukung encoder (sama dengan format _*_to_dict)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data) -> bytes:
+    """
+    Encode data ke JSON bytes
+    Decimal -> float, datetime -> isoformat (naive, tanpa timezone)
+
+    Args:
+        data: Object yang akan di-encode
+
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default)
+    return json.dumps(data, default=_default, separators=(",", ":")).encode()
+
+
+def rows_to_json(fields: Sequence[str], rows: Iterable[Sequence]) -> bytes:
+    """
+    Encode row hasil query kolom (tuple) menjadi JSON array of objects
+
+    Args:
+        fields: Nama field sesuai urutan kolom
+        rows: Row/tuple hasil query
+
+    Returns:
+        JSON bytes
+    """
+    return dumps([dict(zip(fields, row)) for row in rows])
+
+
+class JSONBytesResponse(Response):
+    """Response untuk body JSON yang sudah di-encode (tanpa validasi response_model ulang)"""
+    media_type = "application/json"